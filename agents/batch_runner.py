@@ -0,0 +1,164 @@
+"""Answers a file of questions through the orchestrator agent, several at a time.
+
+``read_questions`` reads a text file (one question per line, ``#`` comments)
+or a ``.jsonl`` file (a ``question`` field per line). ``run_batch`` screens
+every question with the guardrails, answers the rest through one shared
+agent and writes one JSON record per question, in input order.
+
+The module takes the agent session and guardrails as arguments, so it
+imports without the Azure SDK or a ``.env`` file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, AsyncContextManager, Callable, List, Optional
+
+if __package__:
+    from .mcp_bridge import TOOL_LISTENER
+else:  # run as a script: python agents/orchestrator.py
+    from mcp_bridge import TOOL_LISTENER
+
+BATCH_CONCURRENCY_ENV = "COPILOT_BATCH_CONCURRENCY"
+
+
+class QuestionFileError(ValueError):
+    """A line of the questions file could not be read as a question."""
+
+
+def batch_concurrency() -> int:
+    """Questions answered at once when no ``--concurrency`` is given."""
+    try:
+        return int(os.getenv(BATCH_CONCURRENCY_ENV) or 4)
+    except ValueError as exc:
+        raise RuntimeError(f"{BATCH_CONCURRENCY_ENV} must be numeric") from exc
+
+
+def read_questions(path: Path) -> List[str]:
+    """Questions from a JSONL file (a ``question`` field per line) or a text file (one per line, ``#`` comments)."""
+    lines = [line.strip() for line in path.read_text(encoding="utf-8").splitlines()]
+    if path.suffix != ".jsonl":
+        return [line for line in lines if line and not line.startswith("#")]
+    questions = []
+    for number, line in enumerate(lines, start=1):
+        if not line:
+            continue
+        try:
+            question = json.loads(line).get("question")
+        except (json.JSONDecodeError, AttributeError) as exc:
+            raise QuestionFileError(f"{path}:{number}: expected a JSON object") from exc
+        if not isinstance(question, str) or not question.strip():
+            raise QuestionFileError(f'{path}:{number}: expected a non-empty "question" field')
+        questions.append(question.strip())
+    return questions
+
+
+class _ToolCounter:
+    """Counts the tool calls made while answering one question."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def tool_started(self, tool: str) -> None:
+        self.calls += 1
+
+    def tool_finished(self, tool: str) -> None:
+        pass
+
+
+async def _answer_question(agent: Any, question: str, slots: asyncio.Semaphore) -> dict:
+    # Runs as its own task, so the counter set here only sees this question's tool calls.
+    async with slots:
+        counter = _ToolCounter()
+        TOOL_LISTENER.set(counter)
+        started = time.perf_counter()
+        answer, error = None, None
+        try:
+            answer = str(await agent.run(question, store=True))
+        except Exception as exc:  # recorded against the question; the rest of the batch continues
+            error = f"{type(exc).__name__}: {exc}"
+        latency = time.perf_counter() - started
+    return _batch_record(question, answer, error, latency, counter.calls)
+
+
+def _batch_record(question: str, answer: Optional[str], error: Optional[str], latency: float, tool_calls: int) -> dict:
+    return {
+        "question": question,
+        "answer": answer,
+        "error": error,
+        "latency_seconds": round(latency, 3),
+        "tool_calls": tool_calls,
+    }
+
+
+async def answer_questions(
+    questions: List[str],
+    agent_session: Callable[[], AsyncContextManager[Any]],
+    guardrails: Callable[[str], Optional[str]],
+    concurrency: int,
+) -> List[dict]:
+    """One record per question, in input order.
+
+    Questions the guardrails block are recorded without reaching the agent.
+    The rest run ``concurrency`` at a time through the agent ``agent_session``
+    yields, which is only opened when at least one question passes.
+    """
+    records: List[Optional[dict]] = [None] * len(questions)
+    pending = []
+    for position, question in enumerate(questions):
+        guidance = guardrails(question)
+        if guidance:
+            records[position] = _batch_record(question, None, f"Governance: {guidance}", 0.0, 0)
+        else:
+            pending.append(position)
+    if pending:
+        async with agent_session() as agent:
+            slots = asyncio.Semaphore(max(1, concurrency))
+            tasks = {
+                asyncio.create_task(_answer_question(agent, questions[position], slots)): position
+                for position in pending
+            }
+            for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+                record = await task
+                progress = f"[{done}/{len(pending)}] {record['latency_seconds']:.1f}s {record['question'][:60]}"
+                print(progress, file=sys.stderr)
+            for task, position in tasks.items():
+                records[position] = task.result()
+    return records
+
+
+async def run_batch(
+    questions_path: Path,
+    output_path: Path,
+    agent_session: Callable[[], AsyncContextManager[Any]],
+    guardrails: Callable[[str], Optional[str]],
+    concurrency: Optional[int] = None,
+) -> List[dict]:
+    """Answer every question in ``questions_path`` and write one JSON record per question to ``output_path``."""
+    questions = read_questions(questions_path)
+    started = time.perf_counter()
+    records = await answer_questions(
+        questions, agent_session, guardrails, concurrency if concurrency is not None else batch_concurrency()
+    )
+    with output_path.open("w", encoding="utf-8") as handle:
+        for record in records:
+            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+    answered = sum(1 for record in records if record["answer"] is not None)
+    elapsed = time.perf_counter() - started
+    print(f"Answered {answered} of {len(records)} questions in {elapsed:.1f}s; wrote {output_path}")
+    return records
+
+
+__all__ = [
+    "BATCH_CONCURRENCY_ENV",
+    "QuestionFileError",
+    "answer_questions",
+    "batch_concurrency",
+    "read_questions",
+    "run_batch",
+]
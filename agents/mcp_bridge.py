@@ -0,0 +1,302 @@
+"""Async HTTP bridge from the orchestrator agent to the MCP analytics server.
+
+``McpBridge`` sends tool calls over one pooled, keep-alive ``httpx.AsyncClient``.
+It caps how many calls are in flight, gives each call a deadline and can
+coalesce calls made together into one ``/mcp/execute_batch`` request.
+``ToolResultCache`` keeps results keyed on tool name and arguments,
+validated against the server's ETags.
+
+The module only needs ``httpx``, so it imports without the Azure SDK or a
+``.env`` file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Protocol
+
+import httpx
+
+_MCP_TIMEOUT_ENV = "COPILOT_MCP_TIMEOUT_SECONDS"
+_MCP_CONNECTIONS_ENV = "COPILOT_MCP_MAX_CONNECTIONS"
+_MCP_CONCURRENCY_ENV = "COPILOT_MCP_MAX_CONCURRENCY"
+_MCP_DEADLINE_ENV = "COPILOT_MCP_CALL_DEADLINE_SECONDS"
+_MCP_COALESCE_ENV = "COPILOT_MCP_COALESCE_MS"
+_CLIENT_CACHE_SIZE_ENV = "COPILOT_MCP_CLIENT_CACHE_SIZE"
+_CLIENT_CACHE_TTL_ENV = "COPILOT_MCP_CLIENT_CACHE_TTL_SECONDS"
+
+# Largest batch the server's /mcp/execute_batch accepts.
+_MAX_BATCH_SIZE = 32
+
+
+def _env_number(name: str, default: float, kind: type = float):
+    value = os.getenv(name)
+    try:
+        return kind(value) if value else kind(default)
+    except ValueError as exc:
+        raise RuntimeError(f"{name} must be numeric") from exc
+
+
+class McpToolError(Exception):
+    """A tool call inside a coalesced batch failed on the server."""
+
+
+class ToolListener(Protocol):
+    """Told when a tool call made on the listener's behalf starts and finishes."""
+
+    def tool_started(self, tool: str) -> None: ...
+
+    def tool_finished(self, tool: str) -> None: ...
+
+
+# Set per answer; tasks the agent framework spawns for tool calls inherit it.
+TOOL_LISTENER: ContextVar[Optional[ToolListener]] = ContextVar("tool_listener", default=None)
+
+
+@dataclass
+class _CachedResult:
+    result: str
+    etag: str
+    data_version: str
+    checked_at: float
+
+
+class ToolResultCache:
+    """Bounded LRU of tool results keyed on tool name and canonical arguments.
+
+    Each entry keeps the server's ETag and dataset version and is revalidated
+    with ``If-None-Match`` on every call, so a reload on the server is seen at
+    once. A positive ``ttl_seconds`` serves entries checked within that window
+    without a request, unless a later response reported a newer version of
+    their dataset; results can then lag a reload by up to the TTL.
+    ``max_entries`` of 0 disables caching.
+    """
+
+    def __init__(
+        self, max_entries: int = 128, ttl_seconds: float = 0.0, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], _CachedResult] = OrderedDict()
+        self._versions: dict[str, str] = {}
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "ToolResultCache":
+        return cls(
+            max_entries=_env_number(_CLIENT_CACHE_SIZE_ENV, 128, int),
+            ttl_seconds=_env_number(_CLIENT_CACHE_TTL_ENV, 0),
+        )
+
+    @staticmethod
+    def key(tool_name: str, arguments: dict) -> tuple[str, str]:
+        return tool_name, json.dumps(arguments, sort_keys=True, default=str)
+
+    def fresh(self, key: tuple[str, str]) -> Optional[str]:
+        """The cached result when it can be served without asking the server."""
+        entry = self._entries.get(key)
+        if entry is None or self._clock() - entry.checked_at >= self.ttl_seconds:
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.result
+
+    def validator(self, key: tuple[str, str]) -> Optional[str]:
+        """ETag to send as ``If-None-Match`` for an entry that needs revalidating."""
+        entry = self._entries.get(key)
+        return entry.etag if entry is not None else None
+
+    def revalidated(self, key: tuple[str, str]) -> Optional[str]:
+        """Mark an entry current after a ``304 Not Modified``."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.checked_at = self._clock()
+        self._entries.move_to_end(key)
+        self.revalidations += 1
+        return entry.result
+
+    def store(self, key: tuple[str, str], payload: dict) -> None:
+        """Keep a ``ToolResult`` from the server; servers without validators are not cached."""
+        self.misses += 1
+        etag, data_version = payload.get("etag"), payload.get("data_version")
+        if self.max_entries == 0 or not etag or not data_version or payload.get("error"):
+            return
+        self._observe(data_version)
+        self._entries[key] = _CachedResult(payload.get("result", ""), etag, data_version, self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _observe(self, data_version: str) -> None:
+        # Versions look like "premium:<hash>"; a new one retires every entry of the old one.
+        dataset = data_version.split(":", 1)[0]
+        if self._versions.get(dataset) == data_version:
+            return
+        self._versions[dataset] = data_version
+        for key in [key for key, entry in self._entries.items() if entry.data_version.split(":", 1)[0] == dataset]:
+            del self._entries[key]
+
+
+class McpBridge:
+    """Async HTTP bridge to the MCP analytics server over one pooled, keep-alive client.
+
+    Tool calls made together (e.g. parallel tool calls from one model turn) run
+    concurrently, at most ``max_concurrency`` at a time, and each gives up
+    after ``deadline`` seconds including the wait for a slot. With
+    ``coalesce_ms`` set, calls arriving within that window are sent as one
+    ``/mcp/execute_batch`` request instead. Results are kept in a
+    ``ToolResultCache`` validated against the server's ETags.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        deadline: Optional[float] = None,
+        coalesce_ms: Optional[float] = None,
+        cache: Optional[ToolResultCache] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self._base_url = base_url.rstrip("/")
+        self._timeout = timeout if timeout is not None else _env_number(_MCP_TIMEOUT_ENV, 30)
+        self._max_connections = (
+            max_connections if max_connections is not None else _env_number(_MCP_CONNECTIONS_ENV, 10, int)
+        )
+        self.deadline = deadline if deadline is not None else _env_number(_MCP_DEADLINE_ENV, 60)
+        self._coalesce_ms = coalesce_ms if coalesce_ms is not None else _env_number(_MCP_COALESCE_ENV, 0)
+        self._slots = asyncio.Semaphore(
+            max_concurrency if max_concurrency is not None else _env_number(_MCP_CONCURRENCY_ENV, 8, int)
+        )
+        self.cache = cache if cache is not None else ToolResultCache.from_env()
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._pending: List[tuple[dict, asyncio.Future]] = []
+        self._flush: Optional[asyncio.TimerHandle] = None
+        self._batches: set[asyncio.Task] = set()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared client, created on first use so it binds to the running event loop."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                timeout=httpx.Timeout(self._timeout, connect=min(self._timeout, 5.0)),
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def __aenter__(self) -> "McpBridge":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._pending:
+            self._send_pending()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def call(self, tool_name: str, **arguments) -> str:
+        """Run one tool, telling the current ``TOOL_LISTENER``; raises ``TimeoutError`` once the deadline passes."""
+        listener = TOOL_LISTENER.get()
+        if listener is not None:
+            listener.tool_started(tool_name)
+        try:
+            return await self._call(tool_name, arguments)
+        finally:
+            if listener is not None:
+                listener.tool_finished(tool_name)
+
+    async def _call(self, tool_name: str, arguments: dict) -> str:
+        key = self.cache.key(tool_name, arguments)
+        cached = self.cache.fresh(key)
+        if cached is not None:
+            return cached
+        invocation = {"tool_name": tool_name, "arguments": arguments}
+        async with asyncio.timeout(self.deadline):
+            if self._coalesce_ms > 0:
+                return await self._coalesced(invocation)
+            return await self._execute(invocation, key, self.cache.validator(key))
+
+    async def _execute(self, invocation: dict, key: tuple[str, str], etag: Optional[str]) -> str:
+        headers = {"If-None-Match": etag} if etag else None
+        async with self._slots:
+            response = await self.client.post("/mcp/execute", json=invocation, headers=headers)
+        if response.status_code == 304:
+            cached = self.cache.revalidated(key)
+            # The entry may have been evicted while the request was in flight.
+            return cached if cached is not None else await self._execute(invocation, key, None)
+        response.raise_for_status()
+        data = response.json()
+        self.cache.store(key, data)
+        return data.get("result", "No result returned by MCP server.")
+
+    async def _coalesced(self, invocation: dict) -> str:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((invocation, future))
+        if len(self._pending) >= _MAX_BATCH_SIZE:
+            self._send_pending()
+        elif self._flush is None:
+            self._flush = asyncio.get_running_loop().call_later(self._coalesce_ms / 1000, self._send_pending)
+        return await future
+
+    def _send_pending(self) -> None:
+        if self._flush is not None:
+            self._flush.cancel()
+            self._flush = None
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._send_batch(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _send_batch(self, batch: List[tuple[dict, asyncio.Future]]) -> None:
+        try:
+            async with self._slots:
+                results = await self.call_batch([invocation for invocation, _ in batch])
+        except Exception as exc:  # every call in the batch sees the failure
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (invocation, future), result in zip(batch, results):
+            if future.done():
+                continue  # the caller's deadline already passed
+            if result.get("error"):
+                future.set_exception(McpToolError(result["error"]))
+            else:
+                self.cache.store(self.cache.key(invocation["tool_name"], invocation["arguments"]), result)
+                future.set_result(result.get("result", "No result returned by MCP server."))
+
+    async def call_batch(self, invocations: List[dict]) -> List[dict]:
+        """Execute several ``{"tool_name", "arguments"}`` calls in one round trip."""
+        response = await self.client.post("/mcp/execute_batch", json=invocations, timeout=self._timeout * 2)
+        response.raise_for_status()
+        return response.json()
+
+    async def available_tools(self) -> str:
+        response = await self.client.get("/mcp/tools")
+        response.raise_for_status()
+        return response.text
+
+
+__all__ = ["TOOL_LISTENER", "McpBridge", "McpToolError", "ToolListener", "ToolResultCache"]
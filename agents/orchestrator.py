@@ -1,5 +1,8 @@
+import argparse
 import asyncio
 import re
+import sys
+from contextlib import asynccontextmanager
 from typing import Annotated, Optional, List
 
 import httpx
@@ -11,6 +14,13 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 
+if __package__:
+    from . import batch_runner
+    from .mcp_bridge import TOOL_LISTENER, McpBridge, McpToolError
+else:  # run as a script: python agents/orchestrator.py
+    import batch_runner
+    from mcp_bridge import TOOL_LISTENER, McpBridge, McpToolError
+
 def ensure_env_loaded() -> None:
     here = Path(__file__).resolve().parent
     for folder in [here, *here.parents]:
@@ -45,54 +55,40 @@ def _run_guardrails(message: str) -> Optional[str]:
     return None
 
 
-class McpBridge:
-    """Simple HTTP bridge to the MCP analytics server."""
-
-    def __init__(self, base_url: str) -> None:
-        self._base_url = base_url.rstrip("/")
-
-    def call(self, tool_name: str, **arguments) -> str:
-        payload = {"tool_name": tool_name, "arguments": arguments}
-        response = httpx.post(f"{self._base_url}/mcp/execute", json=payload, timeout=30.0)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("result", "No result returned by MCP server.")
-
-    def available_tools(self) -> str:
-        response = httpx.get(f"{self._base_url}/mcp/tools", timeout=10.0)
-        response.raise_for_status()
-        return response.text
-
-
 _BRIDGE = McpBridge(base_url="http://127.0.0.1:8000")
 
 
-def _call_bridge(tool: str, **kwargs) -> str:
+async def _call_bridge(tool: str, **kwargs) -> str:
     try:
-        return _BRIDGE.call(tool, **kwargs)
+        return await _BRIDGE.call(tool, **kwargs)
     except httpx.HTTPStatusError as exc:
         status = exc.response.status_code
         detail = exc.response.text
         return f"MCP server returned {status}: {detail}"
     except httpx.RequestError as exc:
         return f"Unable to reach MCP server: {exc}"
+    except McpToolError as exc:
+        return f"MCP tool {tool} failed: {exc}"
+    except TimeoutError:
+        return f"MCP tool {tool} did not answer within {_BRIDGE.deadline:g} seconds."
+
 
-def list_segments_tool() -> str:
-    return _call_bridge("segment_adoption_segments")
+async def list_segments_tool() -> str:
+    return await _call_bridge("segment_adoption_segments")
 
 
-def describe_metrics_tool(
+async def describe_metrics_tool(
     metric_ids: Annotated[Optional[List[str]], Field(description="Specific metric identifiers.")] = None,
 ) -> str:
-    return _call_bridge("describe_metrics", metric_ids=metric_ids)
+    return await _call_bridge("describe_metrics", metric_ids=metric_ids)
 
 
-def segment_adoption_summary_tool(
+async def segment_adoption_summary_tool(
     segment: Annotated[Optional[str], Field(description="Optional segment filter.")] = None,
     start_month: Annotated[Optional[str], Field(description="Earliest month (YYYY-MM).")] = None,
     end_month: Annotated[Optional[str], Field(description="Latest month (YYYY-MM).")] = None,
 ) -> str:
-    return _call_bridge(
+    return await _call_bridge(
         "segment_adoption_summary",
         segment=segment,
         start_month=start_month,
@@ -100,14 +96,14 @@ def segment_adoption_summary_tool(
     )
 
 
-def segment_adoption_trend_tool(
+async def segment_adoption_trend_tool(
     segment: Annotated[Optional[str], Field(description="Optional segment filter.")] = None,
     metric: Annotated[str, Field(description="fte_adoption | non_fte_adoption | fte_active | non_fte_active")] = "fte_adoption",
     start_month: Annotated[Optional[str], Field(description="Start month (YYYY-MM).")] = None,
     end_month: Annotated[Optional[str], Field(description="End month (YYYY-MM).")] = None,
     limit: Annotated[int, Field(description="Number of points to include.")] = 6,
 ) -> str:
-    return _call_bridge(
+    return await _call_bridge(
         "segment_adoption_trend",
         segment=segment,
         metric=metric,
@@ -117,12 +113,12 @@ def segment_adoption_trend_tool(
     )
 
 
-def segment_adoption_leaders_tool(
+async def segment_adoption_leaders_tool(
     month: Annotated[Optional[str], Field(description="Optional month (YYYY-MM).")] = None,
     metric: Annotated[str, Field(description="fte_adoption | non_fte_adoption | fte_active | non_fte_active")] = "fte_adoption",
     limit: Annotated[int, Field(description="Number of segments to list.")] = 5,
 ) -> str:
-    return _call_bridge(
+    return await _call_bridge(
         "segment_adoption_leaders",
         month=month,
         metric=metric,
@@ -130,32 +126,35 @@ def segment_adoption_leaders_tool(
     )
 
 
-def premium_requests_summary_tool(
+async def premium_requests_summary_tool(
     segment: Annotated[Optional[str], Field(description="Optional segment filter.")] = None,
     user_type: Annotated[str, Field(description="fte | contractor | all")] = "all",
     start_month: Annotated[Optional[str], Field(description="Start month (YYYY-MM).")] = None,
     end_month: Annotated[Optional[str], Field(description="End month (YYYY-MM).")] = None,
+    approximate: Annotated[bool, Field(description="Estimate unique users (HyperLogLog) for broad dashboard scans.")] = False,
 ) -> str:
     """Summarise premium request usage, costs, and user counts across both GitHub enterprises."""
-    return _call_bridge(
+    return await _call_bridge(
         "premium_requests_summary",
         segment=segment,
         user_type=user_type,
         start_month=start_month,
         end_month=end_month,
+        approximate=approximate,
     )
 
 
-def premium_requests_trend_tool(
+async def premium_requests_trend_tool(
     segment: Annotated[Optional[str], Field(description="Optional segment filter.")] = None,
     user_type: Annotated[str, Field(description="fte | contractor | all")] = "all",
     metric: Annotated[str, Field(description="requests | cost | users")] = "requests",
     start_month: Annotated[Optional[str], Field(description="Start month (YYYY-MM).")] = None,
     end_month: Annotated[Optional[str], Field(description="End month (YYYY-MM).")] = None,
     limit: Annotated[int, Field(description="Number of months to include.")] = 6,
+    approximate: Annotated[bool, Field(description="Estimate unique users (HyperLogLog) for broad dashboard scans.")] = False,
 ) -> str:
     """Show month-by-month trend of premium requests, cost, or unique users."""
-    return _call_bridge(
+    return await _call_bridge(
         "premium_requests_trend",
         segment=segment,
         user_type=user_type,
@@ -163,28 +162,31 @@ def premium_requests_trend_tool(
         start_month=start_month,
         end_month=end_month,
         limit=limit,
+        approximate=approximate,
     )
 
 
-def premium_requests_top_segments_tool(
+async def premium_requests_top_segments_tool(
     user_type: Annotated[str, Field(description="fte | contractor | all")] = "all",
     metric: Annotated[str, Field(description="requests | cost | users")] = "cost",
     start_month: Annotated[Optional[str], Field(description="Start month (YYYY-MM).")] = None,
     end_month: Annotated[Optional[str], Field(description="End month (YYYY-MM).")] = None,
     limit: Annotated[int, Field(description="Top N segments.")] = 5,
+    approximate: Annotated[bool, Field(description="Estimate unique users (HyperLogLog) for broad dashboard scans.")] = False,
 ) -> str:
     """Rank segments by premium request volume, cost, or user count."""
-    return _call_bridge(
+    return await _call_bridge(
         "premium_requests_top_segments",
         user_type=user_type,
         metric=metric,
         start_month=start_month,
         end_month=end_month,
         limit=limit,
+        approximate=approximate,
     )
 
 
-def premium_requests_top_models_tool(
+async def premium_requests_top_models_tool(
     segment: Annotated[Optional[str], Field(description="Optional segment filter.")] = None,
     user_type: Annotated[str, Field(description="fte | contractor | all")] = "all",
     start_month: Annotated[Optional[str], Field(description="Start month (YYYY-MM).")] = None,
@@ -192,7 +194,7 @@ def premium_requests_top_models_tool(
     limit: Annotated[int, Field(description="Top N models.")] = 5,
 ) -> str:
     """Rank AI models by premium request volume and cost."""
-    return _call_bridge(
+    return await _call_bridge(
         "premium_requests_top_models",
         segment=segment,
         user_type=user_type,
@@ -202,14 +204,14 @@ def premium_requests_top_models_tool(
     )
 
 
-def premium_requests_enterprise_breakdown_tool(
+async def premium_requests_enterprise_breakdown_tool(
     segment: Annotated[Optional[str], Field(description="Optional segment filter.")] = None,
     user_type: Annotated[str, Field(description="fte | contractor | all")] = "all",
     start_month: Annotated[Optional[str], Field(description="Start month (YYYY-MM).")] = None,
     end_month: Annotated[Optional[str], Field(description="End month (YYYY-MM).")] = None,
 ) -> str:
     """Compare usage between manulife (EMU) and manulife-financial (legacy) enterprises."""
-    return _call_bridge(
+    return await _call_bridge(
         "premium_requests_enterprise_breakdown",
         segment=segment,
         user_type=user_type,
@@ -218,7 +220,65 @@ def premium_requests_enterprise_breakdown_tool(
     )
 
 
-async def run_console_agent(mcp_url: str = "http://127.0.0.1:8000") -> None:
+class _StreamPrinter:
+    """Prints a streamed answer, with a status line naming the tools in flight until text arrives."""
+
+    def __init__(self, prefix: str = "Analytics: ") -> None:
+        self._prefix = prefix
+        self._running: List[str] = []
+        self._streaming = False
+        # Only a terminal can redraw the status line in place.
+        self._live = sys.stdout.isatty()
+
+    def tool_started(self, tool: str) -> None:
+        self._running.append(tool)
+        self._render()
+
+    def tool_finished(self, tool: str) -> None:
+        self._running.remove(tool)
+        self._render()
+
+    def begin(self) -> None:
+        print(self._prefix, end="", flush=True)
+
+    def write(self, text: str) -> None:
+        if not self._streaming:
+            self._streaming = True
+            self._redraw("")
+        print(text, end="", flush=True)
+
+    def end(self) -> None:
+        if not self._streaming:
+            self._redraw("")
+        print("\n")
+
+    def _render(self) -> None:
+        if self._streaming:
+            return
+        self._redraw(f"(running {', '.join(self._running)}...)" if self._running else "(thinking...)")
+
+    def _redraw(self, status: str) -> None:
+        if self._live:
+            print(f"\r\x1b[2K{self._prefix}{status}", end="", flush=True)
+
+
+async def _stream_answer(agent, query: str) -> None:
+    """Print the agent's answer token by token as it is generated."""
+    printer = _StreamPrinter()
+    token = TOOL_LISTENER.set(printer)
+    printer.begin()
+    try:
+        async for update in agent.run_stream(query, store=True):
+            if update.text:
+                printer.write(update.text)
+    finally:
+        TOOL_LISTENER.reset(token)
+        printer.end()
+
+
+@asynccontextmanager
+async def _agent_session(mcp_url: str):
+    """The orchestrator agent, with its MCP bridge, credential and client open until the block exits."""
     global _BRIDGE
     _BRIDGE = McpBridge(base_url=mcp_url)
 
@@ -239,7 +299,8 @@ async def run_console_agent(mcp_url: str = "http://127.0.0.1:8000") -> None:
     if "AZURE_AI_PROJECT_ENDPOINT" not in os.environ:
         raise RuntimeError("AZURE_AI_PROJECT_ENDPOINT is missing from environment")
 
-    async with AzureCliCredential() as credential:
+    # One pooled client serves every tool call of the session and is closed on exit
+    async with _BRIDGE, AzureCliCredential() as credential:
         # Create the AzureAIAgentClient directly - it will create the AgentsClient internally
         async with AzureAIAgentClient(async_credential=credential) as client:
             analytics_instructions = (
@@ -267,22 +328,63 @@ async def run_console_agent(mcp_url: str = "http://127.0.0.1:8000") -> None:
                 instructions=analytics_instructions,
                 tools=tools,
             )
-            
-            print("Copilot Usage Orchestrator online. Type 'exit' to quit.\n")
-            while True:
-                user_query = input("Management: ").strip()
-                if not user_query:
-                    continue
-                if user_query.lower() in {"exit", "quit"}:
-                    print("Session ended.")
-                    break
-                guard_message = _run_guardrails(user_query)
-                if guard_message:
-                    print(f"Governance: {guard_message}\n")
-                    continue
-                response = await agent.run(user_query, store=True)
-                print(f"Analytics: {response}\n")
+            yield agent
+
+
+async def run_console_agent(mcp_url: str = "http://127.0.0.1:8000", stream: bool = False) -> None:
+    async with _agent_session(mcp_url) as agent:
+        print("Copilot Usage Orchestrator online. Type 'exit' to quit.\n")
+        while True:
+            # Read the prompt off the event loop so in-flight requests keep progressing
+            user_query = (await asyncio.to_thread(input, "Management: ")).strip()
+            if not user_query:
+                continue
+            if user_query.lower() in {"exit", "quit"}:
+                print("Session ended.")
+                break
+            guard_message = _run_guardrails(user_query)
+            if guard_message:
+                print(f"Governance: {guard_message}\n")
+                continue
+            if stream:
+                await _stream_answer(agent, user_query)
+                continue
+            response = await agent.run(user_query, store=True)
+            print(f"Analytics: {response}\n")
+
+
+async def run_batch(
+    questions_path: Path, output_path: Path, mcp_url: str = "http://127.0.0.1:8000", concurrency: Optional[int] = None
+) -> None:
+    """Answer every question in ``questions_path`` and write one JSON record per question to ``output_path``.
+
+    Questions run ``concurrency`` at a time through one shared agent, bridge,
+    credential and client. Questions the guardrails block are recorded
+    without reaching the agent.
+    """
+    await batch_runner.run_batch(
+        questions_path, output_path, lambda: _agent_session(mcp_url), _run_guardrails, concurrency
+    )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Copilot usage analytics console agent")
+    parser.add_argument("--mcp-url", default="http://127.0.0.1:8000", help="Base URL of the MCP analytics server")
+    parser.add_argument("--stream", action="store_true", help="Print answers token by token as they are generated")
+    parser.add_argument("--batch", type=Path, help="Answer the questions in this file (.txt or .jsonl) and exit")
+    parser.add_argument("--output", type=Path, help="JSONL output for --batch (default: <questions>.answers.jsonl)")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help=f"Questions run at once with --batch (default: {batch_runner.BATCH_CONCURRENCY_ENV} or 4)",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    asyncio.run(run_console_agent())
+    args = _parse_args()
+    if args.batch:
+        output = args.output or args.batch.with_name(f"{args.batch.stem}.answers.jsonl")
+        asyncio.run(run_batch(args.batch, output, args.mcp_url, args.concurrency))
+    else:
+        asyncio.run(run_console_agent(args.mcp_url, stream=args.stream))
@@ -0,0 +1,99 @@
+"""Compare the legacy per-cell CSV normalisation with the vectorised pipeline.
+
+Usage::
+
+    python -m benchmarks.csv_load --rows 500000
+    python -m benchmarks.csv_load --csv data/copilot/premium_requests_db.csv
+
+Without ``--csv`` a synthetic premium requests export is generated in a
+temporary directory. The legacy timing reproduces the previous ``_load``
+behaviour (``applymap`` with the per-cell cleaner and inferred date parsing);
+the new timing runs ``PremiumRequestsAnalytics._load``. Both results are
+compared before the timings are printed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+from pandas import DataFrame
+
+from services.csv_cleaning import clean_cell, clean_frame, normalise_headers
+from services.premium_requests import PremiumRequestsAnalytics
+
+from .synthetic import write_premium_requests_csv
+
+
+def _legacy_clean(df: DataFrame) -> DataFrame:
+    # ``DataFrame.applymap`` was renamed to ``DataFrame.map`` in pandas 2.1.
+    mapper = getattr(df, "map", None) or df.applymap
+    return mapper(clean_cell)
+
+
+def _legacy_load(csv_path: Path) -> DataFrame:
+    """The premium requests ``_load`` as it was before the vectorised pipeline."""
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    df = _legacy_clean(df).astype(object)
+    df.columns = normalise_headers(df.columns)
+    df["request_date"] = pd.to_datetime(df["request_date"], errors="coerce")
+    df.dropna(subset=["request_date"], inplace=True)
+    df["month"] = df["request_date"].dt.to_period("M")
+    for col in ["quantity", "gross_amount", "discount_amount", "net_amount"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+    df["is_employee"] = df["is_employee"].str.upper().isin(["TRUE", "T", "1", "YES"])
+    df["exceeds_quota"] = df["exceeds_quota"].str.upper().isin(["TRUE", "T", "1", "YES"])
+    df["segment"] = df["segment"].fillna("Unassigned")
+    df["enterprise"] = df["enterprise"].fillna("unknown")
+    return df
+
+
+def _comparable(df: DataFrame) -> DataFrame:
+    # Depending on the pandas version the per-cell path yields NaN or pd.NA
+    # for missing cells; compare on a single missing marker.
+    return df.astype(object).where(df.notna(), None)
+
+
+def _time(label: str, func, *args) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed:8.2f}s")
+    return elapsed, result
+
+
+def run(csv_path: Path) -> None:
+    raw = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    print(f"{csv_path} — {len(raw):,} rows x {raw.shape[1]} columns")
+
+    _, legacy_cells = _time("clean (per-cell applymap)", _legacy_clean, raw)
+    _, vector_cells = _time("clean (vectorised)", clean_frame, raw)
+    pd.testing.assert_frame_equal(_comparable(legacy_cells), _comparable(vector_cells))
+
+    legacy_seconds, legacy = _time("full load (legacy)", _legacy_load, csv_path)
+    analytics = PremiumRequestsAnalytics.__new__(PremiumRequestsAnalytics)
+    vector_seconds, current = _time("full load (vectorised)", analytics._load, csv_path)
+    for column in ["month", "quantity", "net_amount", "is_employee", "segment"]:
+        assert _comparable(legacy[[column]]).equals(_comparable(current[[column]])), column
+    if vector_seconds:
+        print(f"speed-up: {legacy_seconds / vector_seconds:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", type=Path, help="Existing premium requests export to benchmark")
+    parser.add_argument("--rows", type=int, default=200_000, help="Synthetic rows when --csv is omitted")
+    args = parser.parse_args()
+
+    if args.csv:
+        run(args.csv)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        run(write_premium_requests_csv(Path(tmp) / "premium_requests.csv", args.rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Time the premium request query methods.
+
+Usage::
+
+    python -m benchmarks.premium_queries --rows 1000000
+    python -m benchmarks.premium_queries --csv data/copilot/premium_requests_db.csv
+
+Each query shape is run ``--repeat`` times against one loaded analytics
+instance and the mean latency is printed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from services.premium_requests import PremiumRequestsAnalytics
+
+from .synthetic import write_premium_requests_csv
+
+QUERIES = {
+    "summary (all)": lambda a: a.summary(),
+    "summary (segment, fte, 1 month)": lambda a: a.summary("Asia", "fte", "2025-06", "2025-06"),
+    "trend requests": lambda a: a.trend(metric="requests"),
+    "trend users": lambda a: a.trend(metric="users"),
+    "trend users (segment)": lambda a: a.trend("Canada", "contractor", "users"),
+    "top_segments cost": lambda a: a.top_segments(metric="cost"),
+    "top_segments users": lambda a: a.top_segments(metric="users"),
+    "top_models": lambda a: a.top_models(),
+    "enterprise_breakdown": lambda a: a.enterprise_breakdown(start_month="2025-03", end_month="2025-05"),
+}
+
+
+def run(csv_path: Path, repeat: int) -> None:
+    started = time.perf_counter()
+    analytics = PremiumRequestsAnalytics(csv_path)
+    print(f"{csv_path} — {len(analytics.data):,} rows loaded in {time.perf_counter() - started:.2f}s")
+    for label, query in QUERIES.items():
+        started = time.perf_counter()
+        for _ in range(repeat):
+            query(analytics)
+        elapsed_ms = (time.perf_counter() - started) / repeat * 1000
+        print(f"{label:<36} {elapsed_ms:9.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", type=Path, help="Existing premium requests export to benchmark")
+    parser.add_argument("--rows", type=int, default=500_000, help="Synthetic rows when --csv is omitted")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per query")
+    args = parser.parse_args()
+
+    if args.csv:
+        run(args.csv, args.repeat)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        run(write_premium_requests_csv(Path(tmp) / "premium_requests.csv", args.rows), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Synthetic premium request exports for benchmarks.
+
+The real exports are not checked in, so the benchmarks generate a CSV with the
+same schema and the same formatting quirks (quoted numbers, thousands
+separators, NA sentinels) as the GitHub billing export.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SEGMENTS = ["Asia", "Canada", "Corp", "ETS", "GA", "GWAM", "US"]
+MODELS = [
+    "claude-3.7-sonnet",
+    "claude-sonnet-4",
+    "gpt-4.1",
+    "gpt-4o",
+    "o3-mini",
+    "gemini-2.0-flash",
+    "Code Review model",
+]
+ENTERPRISES = ["manulife", "manulife-financial"]
+
+
+def write_premium_requests_csv(
+    path: Path,
+    rows: int,
+    *,
+    users: int = 6000,
+    months: int = 12,
+    seed: int = 7,
+) -> Path:
+    """Write ``rows`` synthetic premium request records to ``path``."""
+    rng = np.random.default_rng(seed)
+    user_ids = rng.integers(0, users, rows)
+    days = rng.integers(0, months * 30, rows)
+    request_date = pd.Timestamp("2025-01-01") + pd.to_timedelta(days, unit="D")
+    quantity = rng.integers(1, 40, rows)
+    gross = np.round(quantity * 0.04, 2)
+    discount = np.where(rng.random(rows) < 0.7, gross, 0.0)
+    net = np.round(gross - discount, 2)
+    frame = pd.DataFrame(
+        {
+            "collection_date": (request_date + pd.Timedelta(days=1)).strftime("%Y-%m-%d"),
+            "enterprise": np.asarray(ENTERPRISES)[rng.integers(0, 2, rows)],
+            "request_date": request_date.strftime("%Y-%m-%d"),
+            "gh_id": [f"gh-user-{uid}" for uid in user_ids],
+            "model": np.asarray(MODELS)[rng.integers(0, len(MODELS), rows)],
+            "quantity": quantity.astype(str),
+            "gross_amount": [f"{value:,.2f}" for value in gross],
+            "discount_amount": discount.astype(str),
+            "net_amount": net.astype(str),
+            "mfcgd_id": [f"user{uid:05d}" for uid in user_ids],
+            "is_employee": np.where(user_ids % 5 == 0, "FALSE", "TRUE"),
+            "segment": np.asarray(SEGMENTS)[user_ids % len(SEGMENTS)],
+            "exceeds_quota": np.where(net > 0, "TRUE", "FALSE"),
+        }
+    )
+    frame.loc[frame.index % 97 == 0, "segment"] = "NA"
+    frame.to_csv(path, index=False)
+    return path
+
+
+__all__ = ["write_premium_requests_csv"]
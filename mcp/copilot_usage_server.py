@@ -1,62 +1,114 @@
 from __future__ import annotations
 
+import atexit
+import hashlib
+import shutil
+from contextlib import asynccontextmanager, contextmanager
 from typing import Any, Dict, List, Optional
 
-from fastapi import Depends, FastAPI, HTTPException
+import pandas as pd
+from fastapi import Depends, FastAPI, Header, HTTPException, Response
 from pydantic import BaseModel, Field
 
-from services.metrics_registry import MetricsRegistry, MetricsRegistryError
+from mcp.result_cache import ResultCache
+from mcp.worker_pool import LaneSaturated, WorkerLane, analytics_lane_from_env
+
+from services.hot_reload import DatasetSlot, DatasetState, SourceWatcher, dataset_wait_from_env
+from services.metrics_registry import MetricsRegistry, resolve_metrics_registry_path
+from services.predicate_index import shared_selections
 from services.segment_adoption_loader import (
     SegmentAdoptionAnalytics,
     SegmentAdoptionConfigError,
-    get_segment_adoption_analytics_safe,
+    export_shared as export_shared_segment_adoption,
+    load_segment_adoption_analytics,
+    resolve_segment_adoption_path,
 )
 from services.premium_requests_loader import (
     PremiumRequestsAnalytics,
     PremiumRequestsConfigError,
-    get_premium_requests_analytics_safe,
+    export_shared as export_shared_premium_requests,
+    load_premium_requests_analytics,
+    refresh_premium_requests_analytics,
+    resolve_premium_requests_path,
 )
+from services.partitions import shared_partition_cache
+from services.shared_frames import prepare_shared_data_dir, shared_data_dir
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    """Load every dataset in the background, then poll the sources for changes while the server runs.
+
+    Workers attached to datasets exported by a parent process do not poll:
+    each reload would build a private copy of the data, and the export
+    would stay on the old version. Hot reload is single-process only.
+    """
+    for slot in _SLOTS:
+        slot.ensure_loading()
+    watcher = SourceWatcher.from_env(_SLOTS) if shared_data_dir() is None else None
+    if watcher is not None:
+        watcher.start()
+    try:
+        yield
+    finally:
+        if watcher is not None:
+            watcher.stop()
+
+
+app = FastAPI(title="Copilot Usage MCP Server", version="1.0.0", lifespan=_lifespan)
+
+# Each dataset's current generation; a reload swaps the slot's state while
+# requests already running keep the analytics object they started with. The
+# first loads start with the server (see ``_lifespan``), all at once, so the
+# port is bound before any dataset is ready.
+_SEGMENT_SLOT: DatasetSlot[SegmentAdoptionAnalytics] = DatasetSlot(
+    "segment adoption", resolve_segment_adoption_path, load_segment_adoption_analytics
+)
+_PREMIUM_SLOT: DatasetSlot[PremiumRequestsAnalytics] = DatasetSlot(
+    "premium requests",
+    resolve_premium_requests_path,
+    load_premium_requests_analytics,
+    refresher=refresh_premium_requests_analytics,
+)
+_METRICS_SLOT: DatasetSlot[MetricsRegistry] = DatasetSlot(
+    "metrics registry", resolve_metrics_registry_path, MetricsRegistry
+)
+_SLOTS = [_SEGMENT_SLOT, _PREMIUM_SLOT, _METRICS_SLOT]
+
+# How long a tool call waits for a dataset that is still loading before answering 503.
+_DATASET_WAIT_SECONDS = dataset_wait_from_env()
+_LOADING_RETRY_AFTER = 5
 
-app = FastAPI(title="Copilot Usage MCP Server", version="1.0.0")
 
-_SEGMENT_ANALYTICS: Optional[SegmentAdoptionAnalytics]
-_SEGMENT_ERROR: Optional[Exception]
-_SEGMENT_ANALYTICS, _SEGMENT_ERROR = get_segment_adoption_analytics_safe()
+def _ready(slot: DatasetSlot, label: str) -> Any:
+    """The slot's analytics, waiting up to the deadline for a first load; 503 otherwise."""
+    return _ready_state(slot, label).analytics
 
-_PREMIUM_ANALYTICS: Optional[PremiumRequestsAnalytics]
-_PREMIUM_ERROR: Optional[Exception]
-_PREMIUM_ANALYTICS, _PREMIUM_ERROR = get_premium_requests_analytics_safe()
 
-try:
-    _METRICS_REGISTRY = MetricsRegistry()
-    _METRICS_ERROR: Optional[Exception] = None
-except Exception as exc:  # pragma: no cover - configuration stage
-    _METRICS_REGISTRY = None
-    _METRICS_ERROR = exc
+def _ready_state(slot: DatasetSlot, label: str) -> DatasetState:
+    """The slot's loaded state, waiting up to the deadline for a first load; 503 otherwise."""
+    state = slot.wait(_DATASET_WAIT_SECONDS)
+    if state.analytics is not None:
+        return state
+    if state.error is not None:
+        raise HTTPException(status_code=503, detail=f"{label} unavailable: {state.error}")
+    raise HTTPException(
+        status_code=503,
+        detail=f"{label} is still loading; retry shortly.",
+        headers={"Retry-After": str(_LOADING_RETRY_AFTER)},
+    )
 
 
 def _ensure_registry() -> MetricsRegistry:
-    if _METRICS_ERROR is not None:
-        raise HTTPException(status_code=503, detail=f"Metrics registry unavailable: {_METRICS_ERROR}")
-    if _METRICS_REGISTRY is None:
-        raise HTTPException(status_code=503, detail="Metrics registry not loaded.")
-    return _METRICS_REGISTRY
+    return _ready(_METRICS_SLOT, "Metrics registry")
 
 
 def _ensure_segment_analytics() -> SegmentAdoptionAnalytics:
-    if _SEGMENT_ERROR is not None:
-        raise HTTPException(status_code=503, detail=f"Segment adoption analytics unavailable: {_SEGMENT_ERROR}")
-    if _SEGMENT_ANALYTICS is None:
-        raise HTTPException(status_code=503, detail="Segment adoption analytics not initialised.")
-    return _SEGMENT_ANALYTICS
+    return _ready(_SEGMENT_SLOT, "Segment adoption analytics")
 
 
 def _ensure_premium_analytics() -> PremiumRequestsAnalytics:
-    if _PREMIUM_ERROR is not None:
-        raise HTTPException(status_code=503, detail=f"Premium requests analytics unavailable: {_PREMIUM_ERROR}")
-    if _PREMIUM_ANALYTICS is None:
-        raise HTTPException(status_code=503, detail="Premium requests analytics not initialised.")
-    return _PREMIUM_ANALYTICS
+    return _ready(_PREMIUM_SLOT, "Premium requests analytics")
 
 
 class ToolDescription(BaseModel):
@@ -73,6 +125,9 @@ class ToolInvocation(BaseModel):
 class ToolResult(BaseModel):
     tool_name: str
     result: str
+    error: Optional[str] = Field(default=None, description="Set instead of a result when a batched call fails")
+    etag: Optional[str] = Field(default=None, description="Validator to send back as If-None-Match")
+    data_version: Optional[str] = Field(default=None, description="Version of the dataset the result was computed from")
 
 
 _TOOL_METADATA: Dict[str, ToolDescription] = {
@@ -123,6 +178,7 @@ _TOOL_METADATA: Dict[str, ToolDescription] = {
             "user_type": "fte | contractor | all (default: all)",
             "start_month": "Start month (YYYY-MM)",
             "end_month": "End month (YYYY-MM)",
+            "approximate": "true to estimate unique users from HyperLogLog sketches (default: false)",
         },
     ),
     "premium_requests_trend": ToolDescription(
@@ -135,6 +191,7 @@ _TOOL_METADATA: Dict[str, ToolDescription] = {
             "start_month": "Start month (YYYY-MM)",
             "end_month": "End month (YYYY-MM)",
             "limit": "Number of recent months to return",
+            "approximate": "true to estimate unique users from HyperLogLog sketches (default: false)",
         },
     ),
     "premium_requests_top_segments": ToolDescription(
@@ -146,6 +203,7 @@ _TOOL_METADATA: Dict[str, ToolDescription] = {
             "start_month": "Start month (YYYY-MM)",
             "end_month": "End month (YYYY-MM)",
             "limit": "Top N segments",
+            "approximate": "true to estimate unique users from HyperLogLog sketches (default: false)",
         },
     ),
     "premium_requests_top_models": ToolDescription(
@@ -173,149 +231,305 @@ _TOOL_METADATA: Dict[str, ToolDescription] = {
 
 
 @app.get("/health", response_model=Dict[str, str])
-def healthcheck() -> Dict[str, str]:
+async def healthcheck() -> Dict[str, str]:
     base = {"status": "ok"}
-    if _SEGMENT_ERROR is not None:
-        base["segmentAnalytics"] = "error"
-    else:
-        base["segmentAnalytics"] = "ready" if _SEGMENT_ANALYTICS is not None else "pending"
-    if _PREMIUM_ERROR is not None:
-        base["premiumAnalytics"] = "error"
-    else:
-        base["premiumAnalytics"] = "ready" if _PREMIUM_ANALYTICS is not None else "pending"
-    if _METRICS_ERROR is not None:
-        base["metrics"] = "error"
-    else:
-        base["metrics"] = "ready" if _METRICS_REGISTRY is not None else "missing"
+    base.update(_dataset_health("segment", _SEGMENT_SLOT.state))
+    base.update(_dataset_health("premium", _PREMIUM_SLOT.state))
+    base["metrics"] = _METRICS_SLOT.state.status
+    base["analyticsQueue"] = _ANALYTICS_LANE.status()
+    base["cheapQueue"] = _CHEAP_LANE.status()
+    base["partitionCache"] = shared_partition_cache().status()
     return base
 
 
+def _dataset_health(prefix: str, state: DatasetState) -> Dict[str, str]:
+    """Readiness, data version and load time of one dataset for /health."""
+    if state.analytics is not None:
+        health = {
+            f"{prefix}Analytics": "ready",
+            f"{prefix}DataVersion": str(state.version),
+            f"{prefix}LoadedAt": state.loaded_at.isoformat() if state.loaded_at else "",
+        }
+        if state.error is not None:
+            health[f"{prefix}ReloadError"] = str(state.error)
+        return health
+    health = {f"{prefix}Analytics": state.status}
+    if state.error is not None:
+        health[f"{prefix}Error"] = str(state.error)
+    return health
+
+
 @app.get("/mcp/tools", response_model=List[ToolDescription])
-def list_tools() -> List[ToolDescription]:
+async def list_tools() -> List[ToolDescription]:
     return list(_TOOL_METADATA.values())
 
 
+_USER_TYPES = {"fte", "contractor", "all"}
+_SEGMENT_METRICS = {"fte_adoption", "non_fte_adoption", "fte_active", "non_fte_active"}
+_PREMIUM_METRICS = {"requests", "cost", "users"}
+_MONTH_ARGUMENTS = ("start_month", "end_month", "month")
+
+_RESULT_CACHE = ResultCache.from_env()
+_MAX_BATCH_SIZE = 32
+
+# Pandas work runs on a bounded pool of its own; lookups that never touch the
+# data get a separate small lane so heavy queries cannot starve them.
+_ANALYTICS_LANE = analytics_lane_from_env()
+_CHEAP_LANE = WorkerLane("cheap", workers=2, queue_size=16)
+_CHEAP_TOOLS = {"segment_adoption_segments", "describe_metrics"}
+
+
+def _as_bool(value: Any) -> bool:
+    """Interpret JSON booleans as well as "true"/"false" strings sent by agents."""
+    if isinstance(value, str):
+        return value.strip().lower() in {"true", "1", "yes"}
+    return bool(value)
+
+
+def _normalise_month(value: Any) -> Any:
+    """Canonical YYYY-MM text for parseable months; anything else is left for the tool to reject."""
+    if not value:
+        return None
+    try:
+        return pd.Period(str(value).strip(), freq="M").strftime("%Y-%m")
+    except Exception:
+        return value
+
+
+def _normalise_arguments(tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply each tool's defaults and validation so equivalent calls look identical."""
+    normalised = {key: value for key, value in arguments.items() if key in _TOOL_METADATA[tool_name].arguments}
+    for key in _MONTH_ARGUMENTS:
+        if key in _TOOL_METADATA[tool_name].arguments:
+            normalised[key] = _normalise_month(normalised.get(key))
+    if "segment" in _TOOL_METADATA[tool_name].arguments:
+        segment = normalised.get("segment")
+        if segment is not None and not isinstance(segment, str):
+            raise SegmentAdoptionConfigError("segment must be a segment name")
+        normalised["segment"] = segment.strip() if segment and segment.strip() else None
+    if "user_type" in _TOOL_METADATA[tool_name].arguments:
+        if normalised.get("user_type", "all") not in _USER_TYPES:
+            normalised["user_type"] = "all"
+        normalised.setdefault("user_type", "all")
+    if "approximate" in _TOOL_METADATA[tool_name].arguments:
+        normalised["approximate"] = _as_bool(normalised.get("approximate"))
+    if tool_name in {"segment_adoption_trend", "segment_adoption_leaders"}:
+        metric = normalised.get("metric") or "fte_adoption"
+        normalised["metric"] = metric if metric in _SEGMENT_METRICS else "fte_adoption"
+    default_metric = {"premium_requests_trend": "requests", "premium_requests_top_segments": "cost"}.get(tool_name)
+    if default_metric:
+        metric = normalised.get("metric", default_metric)
+        normalised["metric"] = metric if metric in _PREMIUM_METRICS else default_metric
+    default_limit = {
+        "segment_adoption_trend": 6,
+        "segment_adoption_leaders": 5,
+        "premium_requests_trend": 6,
+        "premium_requests_top_segments": 5,
+        "premium_requests_top_models": 5,
+    }.get(tool_name)
+    if default_limit is not None:
+        normalised["limit"] = int(normalised.get("limit", default_limit))
+    if tool_name == "describe_metrics":
+        metric_ids = normalised.get("metric_ids")
+        if metric_ids is not None and not isinstance(metric_ids, list):
+            raise SegmentAdoptionConfigError("metric_ids must be a list of metric identifiers")
+    return normalised
+
+
+def _tool_analytics(tool_name: str) -> tuple[Any, str]:
+    """The analytics a tool reads and its version, both from a single read of the dataset's slot.
+
+    Reloading a dataset changes the version, so cached results and ETags of the
+    previous generation stop matching.
+    """
+    if tool_name.startswith("segment_adoption_"):
+        analytics = _ensure_segment_analytics()
+        return analytics, f"segment:{analytics.version}"
+    if tool_name.startswith("premium_requests_"):
+        analytics = _ensure_premium_analytics()
+        return analytics, f"premium:{analytics.version}"
+    # The registry object carries no version of its own; its slot's state does.
+    state = _ready_state(_METRICS_SLOT, "Metrics registry")
+    return state.analytics, f"registry:{state.version}"
+
+
+def _cache_key(tool_name: str, version: str, arguments: Dict[str, Any]) -> tuple:
+    frozen = tuple(
+        sorted((key, tuple(value) if isinstance(value, list) else value) for key, value in arguments.items())
+    )
+    return (tool_name, version, frozen)
+
+
 def _execute_tool(tool_name: str, arguments: Dict[str, Any]) -> str:
+    return _execute_conditional(tool_name, arguments).result
+
+
+def _execute_conditional(tool_name: str, arguments: Dict[str, Any], if_none_match: Optional[str] = None) -> ToolResult:
+    """Run a tool, or skip it when ``if_none_match`` already names the current result (``result`` is then empty)."""
+    with _tool_errors(tool_name):
+        normalised = _normalise_arguments(tool_name, arguments)
+        analytics, version = _tool_analytics(tool_name)
+        key = _cache_key(tool_name, version, normalised)
+        etag = '"' + hashlib.sha256(repr(key).encode()).hexdigest()[:32] + '"'
+        if if_none_match and _etag_matches(etag, if_none_match):
+            return ToolResult(tool_name=tool_name, result="", etag=etag, data_version=key[1])
+        result = _RESULT_CACHE.get_or_compute(key, lambda: _run_tool(tool_name, normalised, analytics))
+        return ToolResult(tool_name=tool_name, result=result, etag=etag, data_version=key[1])
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in tags or "*" in tags
+
+
+@contextmanager
+def _tool_errors(tool_name: str):
+    """Map analytics failures inside the block to HTTP errors."""
     try:
-        if tool_name == "segment_adoption_summary":
-            segment_analytics = _ensure_segment_analytics()
-            return segment_analytics.summary(
-                segment=arguments.get("segment"),
-                start_month=arguments.get("start_month"),
-                end_month=arguments.get("end_month"),
-            )
-        if tool_name == "segment_adoption_segments":
-            segment_analytics = _ensure_segment_analytics()
-            segments = segment_analytics.available_segments()
-            if not segments:
-                return "No segments found in the dataset."
-            return "Available segments:\n" + "\n".join(f"- {segment}" for segment in segments)
-        if tool_name == "segment_adoption_trend":
-            segment_analytics = _ensure_segment_analytics()
-            metric = arguments.get("metric") or "fte_adoption"
-            if metric not in {"fte_adoption", "non_fte_adoption", "fte_active", "non_fte_active"}:
-                metric = "fte_adoption"
-            return segment_analytics.trend(
-                segment=arguments.get("segment"),
-                metric=metric,
-                start_month=arguments.get("start_month"),
-                end_month=arguments.get("end_month"),
-                limit=int(arguments.get("limit", 6)),
-            )
-        if tool_name == "segment_adoption_leaders":
-            segment_analytics = _ensure_segment_analytics()
-            metric = arguments.get("metric") or "fte_adoption"
-            if metric not in {"fte_adoption", "non_fte_adoption", "fte_active", "non_fte_active"}:
-                metric = "fte_adoption"
-            return segment_analytics.leaders(
-                month=arguments.get("month"),
-                metric=metric,
-                limit=int(arguments.get("limit", 5)),
-            )
-        if tool_name == "describe_metrics":
-            registry = _ensure_registry()
-            metric_ids = arguments.get("metric_ids")
-            if metric_ids is not None and not isinstance(metric_ids, list):
-                raise SegmentAdoptionConfigError("metric_ids must be a list of metric identifiers")
-            return registry.as_markdown(metric_ids)
-        if tool_name == "premium_requests_summary":
-            premium_analytics = _ensure_premium_analytics()
-            user_type = arguments.get("user_type", "all")
-            if user_type not in {"fte", "contractor", "all"}:
-                user_type = "all"
-            return premium_analytics.summary(
-                segment=arguments.get("segment"),
-                user_type=user_type,
-                start_month=arguments.get("start_month"),
-                end_month=arguments.get("end_month"),
-            )
-        if tool_name == "premium_requests_trend":
-            premium_analytics = _ensure_premium_analytics()
-            user_type = arguments.get("user_type", "all")
-            if user_type not in {"fte", "contractor", "all"}:
-                user_type = "all"
-            metric = arguments.get("metric", "requests")
-            if metric not in {"requests", "cost", "users"}:
-                metric = "requests"
-            return premium_analytics.trend(
-                segment=arguments.get("segment"),
-                user_type=user_type,
-                metric=metric,
-                start_month=arguments.get("start_month"),
-                end_month=arguments.get("end_month"),
-                limit=int(arguments.get("limit", 6)),
-            )
-        if tool_name == "premium_requests_top_segments":
-            premium_analytics = _ensure_premium_analytics()
-            user_type = arguments.get("user_type", "all")
-            if user_type not in {"fte", "contractor", "all"}:
-                user_type = "all"
-            metric = arguments.get("metric", "cost")
-            if metric not in {"requests", "cost", "users"}:
-                metric = "cost"
-            return premium_analytics.top_segments(
-                user_type=user_type,
-                metric=metric,
-                start_month=arguments.get("start_month"),
-                end_month=arguments.get("end_month"),
-                limit=int(arguments.get("limit", 5)),
-            )
-        if tool_name == "premium_requests_top_models":
-            premium_analytics = _ensure_premium_analytics()
-            user_type = arguments.get("user_type", "all")
-            if user_type not in {"fte", "contractor", "all"}:
-                user_type = "all"
-            return premium_analytics.top_models(
-                segment=arguments.get("segment"),
-                user_type=user_type,
-                start_month=arguments.get("start_month"),
-                end_month=arguments.get("end_month"),
-                limit=int(arguments.get("limit", 5)),
-            )
-        if tool_name == "premium_requests_enterprise_breakdown":
-            premium_analytics = _ensure_premium_analytics()
-            user_type = arguments.get("user_type", "all")
-            if user_type not in {"fte", "contractor", "all"}:
-                user_type = "all"
-            return premium_analytics.enterprise_breakdown(
-                segment=arguments.get("segment"),
-                user_type=user_type,
-                start_month=arguments.get("start_month"),
-                end_month=arguments.get("end_month"),
-            )
+        yield
+    except HTTPException:
+        raise
     except SegmentAdoptionConfigError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=f"Unknown tool '{tool_name}'") from exc
     except Exception as exc:  # pragma: no cover - defensive path
         raise HTTPException(status_code=500, detail=f"Tool execution failed: {exc}") from exc
-    raise HTTPException(status_code=404, detail=f"Unknown tool '{tool_name}'")
+
+
+def _run_tool(tool_name: str, arguments: Dict[str, Any], analytics: Any) -> str:
+    """Compute a tool result from arguments already passed through ``_normalise_arguments``.
+
+    ``analytics`` is the object ``_tool_analytics`` resolved for the call's cache key.
+    """
+    if tool_name == "segment_adoption_summary":
+        return analytics.summary(
+            segment=arguments["segment"],
+            start_month=arguments["start_month"],
+            end_month=arguments["end_month"],
+        )
+    if tool_name == "segment_adoption_segments":
+        segments = analytics.available_segments()
+        if not segments:
+            return "No segments found in the dataset."
+        return "Available segments:\n" + "\n".join(f"- {segment}" for segment in segments)
+    if tool_name == "segment_adoption_trend":
+        return analytics.trend(
+            segment=arguments["segment"],
+            metric=arguments["metric"],
+            start_month=arguments["start_month"],
+            end_month=arguments["end_month"],
+            limit=arguments["limit"],
+        )
+    if tool_name == "segment_adoption_leaders":
+        return analytics.leaders(
+            month=arguments["month"],
+            metric=arguments["metric"],
+            limit=arguments["limit"],
+        )
+    if tool_name == "describe_metrics":
+        return analytics.as_markdown(arguments.get("metric_ids"))
+    if tool_name == "premium_requests_summary":
+        return analytics.summary(
+            segment=arguments["segment"],
+            user_type=arguments["user_type"],
+            start_month=arguments["start_month"],
+            end_month=arguments["end_month"],
+            approximate=arguments["approximate"],
+        )
+    if tool_name == "premium_requests_trend":
+        return analytics.trend(
+            segment=arguments["segment"],
+            user_type=arguments["user_type"],
+            metric=arguments["metric"],
+            start_month=arguments["start_month"],
+            end_month=arguments["end_month"],
+            limit=arguments["limit"],
+            approximate=arguments["approximate"],
+        )
+    if tool_name == "premium_requests_top_segments":
+        return analytics.top_segments(
+            user_type=arguments["user_type"],
+            metric=arguments["metric"],
+            start_month=arguments["start_month"],
+            end_month=arguments["end_month"],
+            limit=arguments["limit"],
+            approximate=arguments["approximate"],
+        )
+    if tool_name == "premium_requests_top_models":
+        return analytics.top_models(
+            segment=arguments["segment"],
+            user_type=arguments["user_type"],
+            start_month=arguments["start_month"],
+            end_month=arguments["end_month"],
+            limit=arguments["limit"],
+        )
+    if tool_name == "premium_requests_enterprise_breakdown":
+        return analytics.enterprise_breakdown(
+            segment=arguments["segment"],
+            user_type=arguments["user_type"],
+            start_month=arguments["start_month"],
+            end_month=arguments["end_month"],
+        )
+    raise LookupError(tool_name)
+
+
+async def _run_on_lane(lane: WorkerLane, func, *args):
+    """Run ``func`` on ``lane``, turning a full queue into 429 with Retry-After."""
+    try:
+        return await lane.run(func, *args)
+    except LaneSaturated as exc:
+        raise HTTPException(
+            status_code=429, detail=str(exc), headers={"Retry-After": str(exc.retry_after)}
+        ) from exc
 
 
 @app.post("/mcp/execute", response_model=ToolResult)
-def execute_tool(payload: ToolInvocation) -> ToolResult:
+async def execute_tool(
+    payload: ToolInvocation, response: Response, if_none_match: Optional[str] = Header(default=None)
+) -> Any:
+    """Run one tool. The ``ETag`` header validates the result; sending it back as
+    ``If-None-Match`` answers ``304 Not Modified`` while arguments and data are unchanged.
+    """
     if payload.tool_name not in _TOOL_METADATA:
         raise HTTPException(status_code=404, detail=f"Tool '{payload.tool_name}' is not registered")
-    result = _execute_tool(payload.tool_name, payload.arguments)
-    return ToolResult(tool_name=payload.tool_name, result=result)
+    lane = _CHEAP_LANE if payload.tool_name in _CHEAP_TOOLS else _ANALYTICS_LANE
+    result = await _run_on_lane(lane, _execute_conditional, payload.tool_name, payload.arguments, if_none_match)
+    if if_none_match and _etag_matches(result.etag, if_none_match):
+        return Response(status_code=304, headers={"ETag": result.etag})
+    response.headers["ETag"] = result.etag
+    return result
+
+
+@app.post("/mcp/execute_batch", response_model=List[ToolResult])
+async def execute_batch(payload: List[ToolInvocation]) -> List[ToolResult]:
+    """Run several tool calls in one request, filtering each shared scope only once.
+
+    A failing call does not fail the batch; its ``error`` is set instead. The
+    whole batch occupies a single analytics worker.
+    """
+    if len(payload) > _MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"A batch may contain at most {_MAX_BATCH_SIZE} calls")
+    return await _run_on_lane(_ANALYTICS_LANE, _execute_batch, payload)
+
+
+def _execute_batch(payload: List[ToolInvocation]) -> List[ToolResult]:
+    results = []
+    with shared_selections():
+        for invocation in payload:
+            try:
+                if invocation.tool_name not in _TOOL_METADATA:
+                    raise HTTPException(status_code=404, detail=f"Tool '{invocation.tool_name}' is not registered")
+                results.append(_execute_conditional(invocation.tool_name, invocation.arguments))
+            except HTTPException as exc:
+                results.append(ToolResult(tool_name=invocation.tool_name, result="", error=str(exc.detail)))
+    return results
+
+
+@app.get("/mcp/cache", response_model=Dict[str, float])
+async def cache_stats() -> Dict[str, float]:
+    """Hit/miss counters and occupancy of the tool result cache."""
+    return _RESULT_CACHE.stats().as_dict()
 
 
 @app.get("/mcp/metrics", response_model=Dict[str, str])
@@ -325,13 +539,46 @@ def metrics_catalog(registry: MetricsRegistry = Depends(_ensure_registry)) -> Di
 
 # Convenience entry point ----------------------------------------------------
 
-def run(host: str = "127.0.0.1", port: int = 8000) -> None:
-    """Run the MCP server using uvicorn."""
+def _export_shared_datasets() -> None:
+    """Write the datasets loaded in this process where worker processes can map them."""
+    temporary = shared_data_dir() is None
+    directory = prepare_shared_data_dir()
+    if temporary:
+        atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    for slot in (_SEGMENT_SLOT, _PREMIUM_SLOT):
+        slot.wait(None)
+    segment_analytics = _SEGMENT_SLOT.state.analytics
+    if segment_analytics is not None:
+        export_shared_segment_adoption(segment_analytics, directory)
+    premium_analytics = _PREMIUM_SLOT.state.analytics
+    if premium_analytics is not None:
+        export_shared_premium_requests(premium_analytics, directory)
+    # The workers load their own slots; the supervising process keeps no copy.
+    del segment_analytics, premium_analytics
+    for slot in (_SEGMENT_SLOT, _PREMIUM_SLOT):
+        slot.reset()
+
+
+def run(host: str = "127.0.0.1", port: int = 8000, workers: int = 1) -> None:
+    """Run the MCP server using uvicorn.
+
+    With several ``workers`` the datasets loaded here are exported once as
+    memory-mapped column files and every worker process attaches to them.
+    """
 
     import uvicorn
 
-    uvicorn.run("mcp.copilot_usage_server:app", host=host, port=port, reload=False)
+    if workers > 1:
+        _export_shared_datasets()
+    uvicorn.run("mcp.copilot_usage_server:app", host=host, port=port, reload=False, workers=workers)
 
 
 if __name__ == "__main__":
-    run()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the Copilot usage MCP server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes sharing one copy of the data")
+    options = parser.parse_args()
+    run(host=options.host, port=options.port, workers=options.workers)
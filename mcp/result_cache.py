@@ -0,0 +1,131 @@
+"""Bounded LRU cache for MCP tool results.
+
+Tool results are plain strings computed from immutable analytics snapshots,
+so a result can be reused for as long as the dataset it came from is loaded.
+Keys therefore include a dataset version: when a dataset is reloaded its
+version changes and earlier entries stop matching (and age out of the LRU).
+Entries also expire after a fixed time-to-live.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Callable, Hashable, Optional
+
+_CACHE_SIZE_ENV = "COPILOT_MCP_CACHE_SIZE"
+_CACHE_TTL_ENV = "COPILOT_MCP_CACHE_TTL_SECONDS"
+_DEFAULT_SIZE = 256
+_DEFAULT_TTL_SECONDS = 900.0
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters reported by ``ResultCache.stats``."""
+
+    size: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class ResultCache:
+    """Thread-safe LRU mapping of hashable keys to tool result strings.
+
+    ``max_entries`` of 0 disables caching; every lookup is then a miss.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = _DEFAULT_SIZE,
+        ttl_seconds: float = _DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @classmethod
+    def from_env(cls) -> "ResultCache":
+        """Build a cache sized by COPILOT_MCP_CACHE_SIZE and COPILOT_MCP_CACHE_TTL_SECONDS."""
+        size = os.getenv(_CACHE_SIZE_ENV)
+        ttl = os.getenv(_CACHE_TTL_ENV)
+        try:
+            return cls(
+                max_entries=int(size) if size else _DEFAULT_SIZE,
+                ttl_seconds=float(ttl) if ttl else _DEFAULT_TTL_SECONDS,
+            )
+        except ValueError as exc:
+            raise ValueError(f"{_CACHE_SIZE_ENV} and {_CACHE_TTL_ENV} must be numeric") from exc
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return the cached result for ``key`` or ``None`` when absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            stored_at, value = entry
+            if self._clock() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: str) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entries."""
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], str]) -> str:
+        """Return the cached result for ``key``, computing and storing it on a miss."""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                ttl_seconds=self.ttl_seconds,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+
+__all__ = ["CacheStats", "ResultCache"]
@@ -0,0 +1,100 @@
+"""Bounded executors that keep pandas work off the server's event loop.
+
+Each ``WorkerLane`` owns a dedicated thread pool and admits at most
+``workers + queue_size`` calls at a time. When every slot is taken the lane
+refuses new work immediately with ``LaneSaturated`` instead of queueing
+without bound, so the server can answer 429 and clients can back off. Cheap
+lookups run on their own small lane so heavy analytics cannot starve them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+_WORKERS_ENV = "COPILOT_MCP_WORKERS"
+_QUEUE_SIZE_ENV = "COPILOT_MCP_QUEUE_SIZE"
+_DEFAULT_QUEUE_SIZE = 32
+
+T = TypeVar("T")
+
+
+class LaneSaturated(RuntimeError):
+    """Raised when a lane has no free worker or queue slot."""
+
+    def __init__(self, lane: str, retry_after: int) -> None:
+        super().__init__(f"The {lane} worker queue is full; retry in {retry_after}s.")
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class WorkerLane:
+    """A named thread pool with a bounded number of admitted calls."""
+
+    def __init__(self, name: str, workers: int, queue_size: int, retry_after: int = 1) -> None:
+        if workers < 1 or queue_size < 0:
+            raise ValueError("A worker lane needs at least one worker and a non-negative queue size")
+        self.name = name
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"mcp-{name}")
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self._admitted = 0
+
+    @property
+    def admitted(self) -> int:
+        """Calls currently running or waiting on this lane."""
+        return self._admitted
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run ``func(*args)`` on the lane, raising ``LaneSaturated`` when it is full.
+
+        The slot is released when the call finishes, even if the awaiting
+        request was cancelled in the meantime.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise LaneSaturated(self.name, self.retry_after)
+        with self._lock:
+            self._admitted += 1
+        context = contextvars.copy_context()
+        try:
+            future = self._executor.submit(context.run, func, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def status(self) -> str:
+        return f"{self._admitted}/{self.capacity}"
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, _future: Any) -> None:
+        with self._lock:
+            self._admitted -= 1
+        self._slots.release()
+
+
+def analytics_lane_from_env() -> WorkerLane:
+    """Analytics lane sized by COPILOT_MCP_WORKERS and COPILOT_MCP_QUEUE_SIZE."""
+    workers = os.getenv(_WORKERS_ENV)
+    queue_size = os.getenv(_QUEUE_SIZE_ENV)
+    try:
+        return WorkerLane(
+            "analytics",
+            workers=int(workers) if workers else min(4, os.cpu_count() or 1),
+            queue_size=int(queue_size) if queue_size else _DEFAULT_QUEUE_SIZE,
+        )
+    except ValueError as exc:
+        raise ValueError(f"{_WORKERS_ENV} and {_QUEUE_SIZE_ENV} must be positive integers") from exc
+
+
+__all__ = ["LaneSaturated", "WorkerLane", "analytics_lane_from_env"]
@@ -0,0 +1,126 @@
+"""Column-wise normalisation of raw CSV exports.
+
+The analytics loaders read every column as text and then normalise the cells
+before typing them. ``clean_cell`` documents the per-cell semantics;
+``clean_frame`` applies exactly the same rules with pandas string operations so
+the cost scales with the number of columns rather than the number of cells.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+from pandas import DataFrame, Series
+
+NA_SENTINELS = frozenset({"", "NA", "N/A", "None"})
+
+
+def clean_cell(value: object, *, strip_percent: bool = False, blank_dashes: bool = False) -> object:
+    """Normalise a single CSV cell (reference semantics for ``clean_frame``)."""
+    if not isinstance(value, str):
+        return value
+    cleaned = value.replace("\u00a0", " ").strip().strip('"')
+    cleaned = cleaned.replace(",", "")
+    if strip_percent:
+        cleaned = cleaned.replace("%", "")
+    if blank_dashes and cleaned.replace("-", "").strip() == "":
+        cleaned = cleaned.replace("-", "")
+    cleaned = cleaned.strip()
+    if cleaned in NA_SENTINELS:
+        return pd.NA
+    return cleaned
+
+
+def clean_series(series: Series, *, strip_percent: bool = False, blank_dashes: bool = False) -> Series:
+    """Vectorised equivalent of applying ``clean_cell`` to every value of ``series``.
+
+    The result is a ``string`` series whose missing values are ``pd.NA``, so the
+    downstream numeric and boolean conversions stay vectorised as well.
+    """
+    values = series.astype("string")
+    values = values.str.replace("\u00a0", " ", regex=False).str.strip().str.strip('"')
+    values = values.str.replace(",", "", regex=False)
+    if strip_percent:
+        values = values.str.replace("%", "", regex=False)
+    if blank_dashes:
+        dashes_only = values.str.replace("-", "", regex=False).str.strip() == ""
+        values = values.mask(dashes_only.fillna(False), values.str.replace("-", "", regex=False))
+    values = values.str.strip()
+    return values.mask(values.isin(NA_SENTINELS).fillna(False))
+
+
+def to_number(series: Series) -> Series:
+    """Coerce cleaned text to numbers, yielding int64 or float64 like object input would."""
+    numbers = pd.to_numeric(series, errors="coerce")
+    if isinstance(numbers.dtype, pd.api.extensions.ExtensionDtype):
+        if pd.api.types.is_integer_dtype(numbers.dtype) and not numbers.isna().any():
+            return numbers.astype("int64")
+        return numbers.astype("float64")
+    return numbers
+
+
+def clean_frame(
+    df: DataFrame,
+    *,
+    strip_percent: bool = False,
+    blank_dashes: bool = False,
+    columns: Optional[Iterable[str]] = None,
+) -> DataFrame:
+    """Return a copy of ``df`` with ``clean_series`` applied column by column."""
+    targets = list(df.columns) if columns is None else [col for col in columns if col in df.columns]
+    cleaned = df.copy()
+    for column in targets:
+        cleaned[column] = clean_series(
+            df[column], strip_percent=strip_percent, blank_dashes=blank_dashes
+        )
+    return cleaned
+
+
+def read_text_frame(path: Path) -> DataFrame:
+    """Read a CSV or Parquet export with every column as text, as the loaders expect.
+
+    Parquet columns are rendered as strings (missing values as empty cells) so
+    both formats go through the same cleaning rules.
+    """
+    if path.suffix.lower() == ".parquet":
+        frame = pd.read_parquet(path)
+        return DataFrame({column: frame[column].astype("string").fillna("").astype(str) for column in frame.columns})
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def normalise_headers(columns: Iterable[str]) -> list[str]:
+    """Lower-case and snake-case CSV headers."""
+    return [col.strip().lower().replace(" ", "_") for col in columns]
+
+
+def parse_dates(values: Series, fmt: str) -> Series:
+    """Parse ``values`` with an explicit ``fmt``, falling back to inference for stragglers.
+
+    Nearly every export uses a single layout, so the explicit format handles the
+    bulk of the column without per-value format inference. Values that do not
+    match are re-parsed the way ``pd.to_datetime`` always has so odd rows keep
+    their previous meaning; anything still unparseable becomes ``NaT``.
+    """
+    parsed = pd.to_datetime(values, format=fmt, errors="coerce")
+    leftover = parsed.isna() & values.notna()
+    if leftover.any():
+        fallback = pd.to_datetime(values[leftover], errors="coerce")
+        if getattr(fallback.dt, "tz", None) is not None:
+            fallback = fallback.dt.tz_localize(None)
+        parsed = parsed.copy()
+        parsed[leftover] = fallback
+    return parsed
+
+
+__all__ = [
+    "NA_SENTINELS",
+    "clean_cell",
+    "clean_frame",
+    "clean_series",
+    "normalise_headers",
+    "parse_dates",
+    "read_text_frame",
+    "to_number",
+]
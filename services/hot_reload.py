@@ -0,0 +1,209 @@
+"""Reloadable dataset slots and a polling watcher for the source exports.
+
+Each dataset lives in a ``DatasetSlot`` whose ``state`` is an immutable
+``DatasetState``. Request handlers read ``slot.state`` once and keep using
+that analytics object, so a reload never changes data under a running query.
+``SourceWatcher`` polls the source files; once a file's size and modification
+time have changed and then stayed put for one polling interval it builds the
+new analytics object in the background and replaces the slot's state in one
+reference assignment. A failed reload keeps serving the previous data. Slots
+with a ``refresher`` first try to extend the loaded analytics with just the
+new rows and fall back to a full load.
+
+The first load can run in the background (``ensure_loading``) so the server
+accepts connections straight away; callers that need the data ``wait`` for it
+with a deadline.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Generic, Iterable, Optional, TypeVar
+
+from .snapshot_cache import source_version
+
+logger = logging.getLogger(__name__)
+
+_RELOAD_INTERVAL_ENV = "COPILOT_RELOAD_INTERVAL_SECONDS"
+_DEFAULT_RELOAD_INTERVAL = 60.0
+_DATASET_WAIT_ENV = "COPILOT_DATASET_WAIT_SECONDS"
+_DEFAULT_DATASET_WAIT = 5.0
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class DatasetState(Generic[T]):
+    """One loaded generation of a dataset (or the error that prevented loading it)."""
+
+    analytics: Optional[T] = None
+    error: Optional[Exception] = None
+    version: Optional[str] = None
+    loaded_at: Optional[datetime] = None
+    loading: bool = False
+
+    @property
+    def status(self) -> str:
+        """``ready``, ``loading``, ``error`` or ``pending`` (no load started yet)."""
+        if self.analytics is not None:
+            return "ready"
+        if self.loading:
+            return "loading"
+        return "error" if self.error is not None else "pending"
+
+
+class DatasetSlot(Generic[T]):
+    """Holds the current generation of one dataset and knows how to rebuild it."""
+
+    def __init__(
+        self,
+        name: str,
+        source: Callable[[], Path],
+        loader: Callable[[Path], T],
+        refresher: Optional[Callable[[T], Optional[T]]] = None,
+    ) -> None:
+        self.name = name
+        self._source = source
+        self._loader = loader
+        self._refresher = refresher
+        self._reload_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._started = False
+        self._attempted = threading.Event()
+        self._attempted_version: Optional[str] = None
+        self._observed_version: Optional[str] = None
+        self.state: DatasetState[T] = DatasetState()
+
+    def load(self, incremental: bool = False) -> DatasetState[T]:
+        """(Re)build the analytics from the source; on failure keep any previous analytics.
+
+        With ``incremental`` the refresher (if any) is tried on the current
+        analytics first; it returns ``None`` when only a full load will do.
+        """
+        self._started = True
+        with self._reload_lock:
+            try:
+                return self._load(incremental)
+            finally:
+                self._attempted.set()
+
+    def ensure_loading(self) -> None:
+        """Start the first load on a background thread unless a load already started."""
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+            self.state = DatasetState(loading=True)
+        threading.Thread(target=self.load, name=f"load-{self.name}", daemon=True).start()
+
+    def reset(self) -> None:
+        """Drop the loaded generation, so the next ``ensure_loading`` or ``wait`` loads again."""
+        with self._start_lock, self._reload_lock:
+            self._started = False
+            self._attempted.clear()
+            self._attempted_version = None
+            self._observed_version = None
+            self.state = DatasetState()
+
+    def wait(self, timeout: Optional[float]) -> DatasetState[T]:
+        """Current state once the first load attempt finished, or after ``timeout`` seconds."""
+        self.ensure_loading()
+        self._attempted.wait(timeout)
+        return self.state
+
+    def _load(self, incremental: bool) -> DatasetState[T]:
+        path = self._source()
+        self._attempted_version = _current_version(path)
+        try:
+            analytics = None
+            if incremental and self._refresher is not None and self.state.analytics is not None:
+                analytics = self._refresher(self.state.analytics)
+            if analytics is None:
+                analytics = self._loader(path)
+        except Exception as exc:
+            previous = self.state
+            self.state = DatasetState(previous.analytics, exc, previous.version, previous.loaded_at)
+            if previous.analytics is not None:
+                logger.warning("Reloading %s from %s failed; serving previous data: %s", self.name, path, exc)
+            return self.state
+        version = getattr(analytics, "version", None) or self._attempted_version
+        self.state = DatasetState(analytics, None, version, datetime.now(timezone.utc))
+        logger.info("Loaded %s version %s from %s", self.name, version, path)
+        return self.state
+
+    def reload_if_changed(self) -> bool:
+        """Reload when the source changed since the last load attempt; True if a reload ran.
+
+        A changed version must be seen on two consecutive checks before it is
+        loaded, so an export that is still being written is not picked up.
+        """
+        current = _current_version(self._source())
+        if current is None or current == self._attempted_version:
+            return False
+        if current != self._observed_version:
+            self._observed_version = current
+            return False
+        self.load(incremental=True)
+        return True
+
+
+class SourceWatcher:
+    """Daemon thread that polls dataset slots for source changes."""
+
+    def __init__(self, slots: Iterable[DatasetSlot], interval_seconds: float) -> None:
+        self.slots = list(slots)
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dataset-watcher", daemon=True)
+
+    @classmethod
+    def from_env(cls, slots: Iterable[DatasetSlot]) -> Optional["SourceWatcher"]:
+        """Watcher polling every COPILOT_RELOAD_INTERVAL_SECONDS, or ``None`` when set to 0."""
+        configured = os.getenv(_RELOAD_INTERVAL_ENV)
+        try:
+            interval = float(configured) if configured else _DEFAULT_RELOAD_INTERVAL
+        except ValueError as exc:
+            raise ValueError(f"{_RELOAD_INTERVAL_ENV} must be a number of seconds") from exc
+        return cls(slots, interval) if interval > 0 else None
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def poll(self) -> None:
+        """Check every slot once."""
+        for slot in self.slots:
+            try:
+                slot.reload_if_changed()
+            except Exception as exc:  # pragma: no cover - never let the watcher die
+                logger.warning("Checking %s for changes failed: %s", slot.name, exc)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.poll()
+
+
+def dataset_wait_from_env() -> float:
+    """Seconds a request waits for a dataset that is still loading (COPILOT_DATASET_WAIT_SECONDS)."""
+    configured = os.getenv(_DATASET_WAIT_ENV)
+    try:
+        return max(0.0, float(configured)) if configured else _DEFAULT_DATASET_WAIT
+    except ValueError as exc:
+        raise ValueError(f"{_DATASET_WAIT_ENV} must be a number of seconds") from exc
+
+
+def _current_version(path: Path) -> Optional[str]:
+    try:
+        return source_version(path)
+    except OSError:
+        return None
+
+
+__all__ = ["DatasetSlot", "DatasetState", "SourceWatcher", "dataset_wait_from_env"]
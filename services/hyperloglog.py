@@ -0,0 +1,141 @@
+"""HyperLogLog sketches for approximate unique-user counts.
+
+Dashboards that scan every month and segment do not need an exact distinct
+count. ``UserSketches`` keeps one HyperLogLog register array per
+(month, segment, is_employee) group, built once at load time. Any filter on
+those dimensions is answered by merging the selected register arrays
+(element-wise max) and estimating the cardinality of the union.
+
+Users are hashed from their Entra ID text rather than their categorical code,
+so sketches built from different loads or partitions stay mergeable
+(``UserSketches.merge``).
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+from .predicate_index import PredicateIndex
+from .premium_cube import stack_groups
+
+SKETCH_DIMENSIONS = ("month", "segment", "is_employee")
+DEFAULT_PRECISION = 12
+
+
+def relative_error(precision: int = DEFAULT_PRECISION) -> float:
+    """Standard error of a HyperLogLog estimate with ``2 ** precision`` registers."""
+    return 1.04 / np.sqrt(2 ** precision)
+
+
+def hash_users(user_ids: pd.Series) -> np.ndarray:
+    """64-bit hash per row, computed once per distinct Entra ID and skipping missing IDs."""
+    codes = user_ids.cat.codes.to_numpy()
+    category_hashes = pd.util.hash_array(user_ids.cat.categories.to_numpy(dtype=object))
+    return category_hashes[codes[codes >= 0]]
+
+
+def _leading_zeros(values: np.ndarray) -> np.ndarray:
+    """Count leading zero bits of uint64 values (exact; each half fits a float64)."""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    with np.errstate(divide="ignore"):
+        high_zeros = 31 - np.floor(np.log2(high))
+        low_zeros = 31 - np.floor(np.log2(low))
+    zeros = np.where(high > 0, high_zeros, 32 + np.where(low > 0, low_zeros, 32))
+    return zeros.astype(np.int64)
+
+
+def _estimate(registers: np.ndarray) -> float:
+    """Cardinality estimate for one register array, with small-range correction."""
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.sum(np.power(2.0, -registers.astype(np.float64)))
+    empty = int(np.count_nonzero(registers == 0))
+    if raw <= 2.5 * m and empty:
+        return m * np.log(m / empty)
+    return float(raw)
+
+
+class UserSketches:
+    """One HyperLogLog register array per (month, segment, is_employee) group."""
+
+    def __init__(self, groups: DataFrame, registers: np.ndarray, precision: int) -> None:
+        self.groups = groups
+        self.registers = registers
+        self.precision = precision
+        self.index = PredicateIndex(groups)
+
+    @classmethod
+    def build(cls, data: DataFrame, precision: int = DEFAULT_PRECISION) -> "UserSketches":
+        grouped = data.groupby(list(SKETCH_DIMENSIONS), observed=True, sort=True)
+        groups = grouped.size().reset_index()[list(SKETCH_DIMENSIONS)]
+        known = data["mfcgd_id"].cat.codes.to_numpy() >= 0
+        group_ids = grouped.ngroup().to_numpy()[known]
+        hashes = hash_users(data["mfcgd_id"])
+        shift = np.uint64(64 - precision)
+        buckets = (hashes >> shift).astype(np.int64)
+        ranks = np.minimum(_leading_zeros(hashes << np.uint64(precision)) + 1, 64 - precision + 1)
+        registers = np.zeros((len(groups), 2 ** precision), dtype=np.uint8)
+        np.maximum.at(registers, (group_ids, buckets), ranks.astype(np.uint8))
+        return cls(groups, registers, precision)
+
+    def merge(self, other: "UserSketches") -> "UserSketches":
+        """Sketches over the users of both inputs; shared groups take the element-wise max."""
+        if other.precision != self.precision:
+            raise ValueError("Only sketches with the same precision can be merged")
+        grouped, group_ids, other_group_ids = stack_groups(self.groups, other.groups, SKETCH_DIMENSIONS)
+        groups = grouped.size().reset_index()[list(SKETCH_DIMENSIONS)]
+        registers = np.zeros((len(groups), self.registers.shape[1]), dtype=np.uint8)
+        registers[group_ids] = self.registers
+        registers[other_group_ids] = np.maximum(registers[other_group_ids], other.registers)
+        return UserSketches(groups, registers, self.precision)
+
+    @property
+    def relative_error(self) -> float:
+        return relative_error(self.precision)
+
+    def union(self, group_positions: Sequence[int]) -> np.ndarray:
+        """Registers of the union of the selected groups."""
+        positions = np.asarray(group_positions)
+        if positions.size == 0:
+            return np.zeros(self.registers.shape[1], dtype=np.uint8)
+        return self.registers[positions].max(axis=0)
+
+    def union_by(self, group_positions: Sequence[int], labels: Series) -> tuple[np.ndarray, pd.Index]:
+        """Union registers per label (one row each, labels sorted), where ``labels`` tags each selected group."""
+        codes, uniques = pd.factorize(labels, sort=True)
+        positions = np.asarray(group_positions)
+        merged = np.zeros((len(uniques), self.registers.shape[1]), dtype=np.uint8)
+        np.maximum.at(merged, codes, self.registers[positions])
+        return merged, pd.Index(uniques)
+
+    def estimate(self, group_positions: Sequence[int]) -> float:
+        """Approximate distinct users across the selected groups."""
+        if np.asarray(group_positions).size == 0:
+            return 0.0
+        return estimate_registers(self.union(group_positions))
+
+    def estimate_by(self, group_positions: Sequence[int], labels: Series) -> Series:
+        """Approximate distinct users per label, where ``labels`` tags each selected group."""
+        merged, uniques = self.union_by(group_positions, labels)
+        estimates = [estimate_registers(row) for row in merged]
+        return Series(estimates, index=uniques, name=labels.name)
+
+
+def estimate_registers(registers: np.ndarray) -> float:
+    """Distinct-count estimate for one register array (e.g. a union of several sketches)."""
+    return _estimate(registers)
+
+
+__all__ = [
+    "DEFAULT_PRECISION",
+    "SKETCH_DIMENSIONS",
+    "UserSketches",
+    "estimate_registers",
+    "hash_users",
+    "relative_error",
+]
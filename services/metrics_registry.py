@@ -9,6 +9,11 @@ import yaml
 _DEFAULT_PATH = Path("config/metrics.yaml")
 
 
+def resolve_metrics_registry_path() -> Path:
+    """Metric catalogue file the registry reads by default."""
+    return _DEFAULT_PATH
+
+
 class MetricsRegistryError(RuntimeError):
     """Raised when the metrics registry cannot be loaded."""
 
@@ -81,4 +86,4 @@ class MetricsRegistry:
         return parsed
 
 
-__all__ = ["MetricsRegistry", "MetricsRegistryError", "MetricDefinition"]
+__all__ = ["MetricsRegistry", "MetricsRegistryError", "MetricDefinition", "resolve_metrics_registry_path"]
@@ -0,0 +1,65 @@
+"""Month offsets over frames kept physically sorted by month.
+
+Both analytics datasets are sorted by ``month`` once at load time, as are the
+cube cells and sketch groups derived from them. ``MonthIndex`` records where
+each month's rows start, so a date-range filter becomes two binary searches
+and a positional slice (a view) instead of boolean masks over every row.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+
+def sort_by_month(frame: DataFrame) -> DataFrame:
+    """Return ``frame`` stably sorted by ``month`` with a fresh positional index."""
+    if frame["month"].is_monotonic_increasing and isinstance(frame.index, pd.RangeIndex):
+        if frame.index.start == 0 and frame.index.step == 1:
+            return frame
+    return frame.sort_values("month", kind="stable").reset_index(drop=True)
+
+
+class MonthIndex:
+    """Row offsets of each distinct month in a month-sorted frame.
+
+    Rows ``offsets[i]:offsets[i + 1]`` hold month ``months[i]`` (a period
+    ordinal), so the rows between two months are found in O(log months).
+    """
+
+    def __init__(self, months: np.ndarray, offsets: np.ndarray) -> None:
+        self.months = months
+        self.offsets = offsets
+
+    @classmethod
+    def build(cls, month: Series) -> "MonthIndex":
+        """Index a month column that is already sorted ascending."""
+        ordinals = np.asarray(month.array.asi8, dtype=np.int64)
+        if len(ordinals) and np.any(ordinals[1:] < ordinals[:-1]):
+            raise ValueError("MonthIndex requires rows sorted by month")
+        months, starts = np.unique(ordinals, return_index=True)
+        offsets = np.append(starts, len(ordinals)).astype(np.int64)
+        return cls(months, offsets)
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def bounds(self, start: Optional[pd.Period], end: Optional[pd.Period]) -> slice:
+        """Positional slice of the rows whose month lies in ``[start, end]``."""
+        first = 0 if start is None else int(np.searchsorted(self.months, start.ordinal, side="left"))
+        last = len(self.months) if end is None else int(np.searchsorted(self.months, end.ordinal, side="right"))
+        if last <= first:
+            return slice(0, 0)
+        return slice(int(self.offsets[first]), int(self.offsets[last]))
+
+    def select(self, frame: DataFrame, start: Optional[pd.Period], end: Optional[pd.Period]) -> DataFrame:
+        """Rows of ``frame`` (the frame this index was built from) within the month range."""
+        if start is None and end is None:
+            return frame
+        return frame.iloc[self.bounds(start, end)]
+
+
+__all__ = ["MonthIndex", "sort_by_month"]
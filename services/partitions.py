@@ -0,0 +1,330 @@
+"""Month-partitioned dataset directories with partition pruning and a bounded cache.
+
+A loader path may name a directory laid out one sub-directory per month::
+
+    premium_requests/
+        month=2025-07/part-0000.csv
+        month=2025-08/part-0000.parquet
+        month=2025-08/part-0001.csv
+
+Each partition holds the rows of its month. A query only opens the partitions
+inside its ``start_month``/``end_month`` range. A partition is loaded (cleaned
+and aggregated) the first time a query needs it and kept in a shared
+``PartitionCache``. Once the loaded partitions exceed the cache's memory
+budget (COPILOT_PARTITION_MEMORY_MB) the least recently used ones are dropped
+and reloaded on demand, so serving recent months never requires holding the
+whole history.
+
+Premium request partitions keep only their cube, user sketches and user
+labels; results spanning several partitions are combined here, with distinct
+users unioned across months by Entra ID.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Hashable, Optional, TypeVar
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+from pandas.api.types import union_categoricals
+
+from .csv_cleaning import read_text_frame
+from .hyperloglog import estimate_registers, relative_error
+from .premium_requests import PremiumRequestsAnalytics
+from .segment_adoption import SegmentAdoptionAnalytics
+from .snapshot_cache import source_version
+from .storage_backend import FramePremiumStore, FrameSegmentStore, PremiumRequestsStore, Scope, SegmentAdoptionStore
+
+logger = logging.getLogger(__name__)
+
+_MEMORY_ENV = "COPILOT_PARTITION_MEMORY_MB"
+_DEFAULT_MEMORY_MB = 1024.0
+_PARTITION_NAME = re.compile(r"^month=(\d{4}-\d{2})$")
+_PART_SUFFIXES = {".csv", ".parquet"}
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Partition:
+    """One month's directory and its part files, identified by their combined version."""
+
+    month: pd.Period
+    path: Path
+    files: tuple[Path, ...]
+    version: str
+
+
+def discover_partitions(directory: Path) -> list[Partition]:
+    """``month=YYYY-MM`` partitions below ``directory`` in month order (empty ones are skipped)."""
+    partitions = []
+    for child in sorted(directory.iterdir()):
+        match = _PARTITION_NAME.match(child.name)
+        if not child.is_dir() or match is None:
+            if not child.name.startswith("."):
+                logger.warning("Ignoring %s: partitions are named month=YYYY-MM", child)
+            continue
+        files = tuple(
+            path for path in sorted(child.iterdir())
+            if path.suffix.lower() in _PART_SUFFIXES and not path.name.startswith(".")
+        )
+        if files:
+            partitions.append(Partition(pd.Period(match.group(1), freq="M"), child, files, source_version(child)))
+    return partitions
+
+
+class PartitionCache:
+    """Loaded partitions, least recently used first, held within a memory budget."""
+
+    def __init__(self, budget_bytes: Optional[int]) -> None:
+        self.budget_bytes = budget_bytes
+        self.held_bytes = 0
+        self.loads = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[object, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: dict[Hashable, threading.Lock] = {}
+
+    def get(self, key: Hashable, load: Callable[[], T], size: Callable[[T], int]) -> T:
+        """The cached value for ``key``, loading it (once, even under concurrency) on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]  # type: ignore[return-value]
+            loading = self._loading.setdefault(key, threading.Lock())
+        with loading:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    return self._entries[key][0]  # type: ignore[return-value]
+            value = load()
+            nbytes = size(value)
+            with self._lock:
+                self._entries[key] = (value, nbytes)
+                self.held_bytes += nbytes
+                self.loads += 1
+                self._loading.pop(key, None)
+                self._evict(keep=key)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def status(self) -> str:
+        return f"{len(self._entries)} partitions, {self.held_bytes / 1024 ** 2:,.1f} MB"
+
+    def _evict(self, keep: Hashable) -> None:
+        # The partition just loaded stays even when it alone exceeds the budget.
+        while self.budget_bytes is not None and self.held_bytes > self.budget_bytes and len(self._entries) > 1:
+            key, (_, nbytes) = next(iter(self._entries.items()))
+            if key == keep:
+                break
+            del self._entries[key]
+            self.held_bytes -= nbytes
+            self.evictions += 1
+
+
+_SHARED_CACHE: Optional[PartitionCache] = None
+_SHARED_CACHE_LOCK = threading.Lock()
+
+
+def shared_partition_cache() -> PartitionCache:
+    """Process-wide cache sized by COPILOT_PARTITION_MEMORY_MB (0 means unbounded)."""
+    global _SHARED_CACHE
+    with _SHARED_CACHE_LOCK:
+        if _SHARED_CACHE is None:
+            configured = os.getenv(_MEMORY_ENV)
+            try:
+                limit_mb = float(configured) if configured else _DEFAULT_MEMORY_MB
+            except ValueError as exc:
+                raise ValueError(f"{_MEMORY_ENV} must be a number of megabytes") from exc
+            _SHARED_CACHE = PartitionCache(int(limit_mb * 1024 * 1024) if limit_mb > 0 else None)
+        return _SHARED_CACHE
+
+
+def _pruned(partitions: list[Partition], scope: Scope) -> list[Partition]:
+    return [
+        partition for partition in partitions
+        if (scope.start is None or partition.month >= scope.start)
+        and (scope.end is None or partition.month <= scope.end)
+    ]
+
+
+def _require_partitions(directory: Path) -> list[Partition]:
+    partitions = discover_partitions(directory)
+    if not partitions:
+        raise ValueError(f"No month=YYYY-MM partitions with .csv or .parquet files found in {directory}")
+    return partitions
+
+
+def _concat(frames: list[DataFrame]) -> DataFrame:
+    """Stack per-partition results, keeping categorical columns categorical."""
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    columns = {}
+    for column in frames[0].columns:
+        parts = [frame[column] for frame in frames]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            columns[column] = pd.Series(union_categoricals(parts, sort_categories=True))
+        else:
+            columns[column] = pd.concat(parts, ignore_index=True)
+    return DataFrame(columns)
+
+
+class _PremiumPartition:
+    """What a loaded premium request partition keeps: cube, user-month table and sketches."""
+
+    def __init__(self, analytics: PremiumRequestsAnalytics) -> None:
+        self.store = FramePremiumStore(analytics.cube, analytics.user_months, analytics.sketches)
+        self.values = {column: self.store.distinct(column) for column in ("segment", "enterprise", "model")}
+
+    @classmethod
+    def load(cls, partition: Partition) -> "_PremiumPartition":
+        analytics = PremiumRequestsAnalytics.from_raw(partition.path, (read_text_frame(path) for path in partition.files))
+        if (analytics.data["month"] != partition.month).any():
+            logger.warning("Partition %s holds rows of other months; range queries may miss them", partition.path)
+        logger.info("Loaded premium requests partition %s: %s", partition.month, analytics.load_stats.description())
+        return cls(analytics)
+
+    @property
+    def nbytes(self) -> int:
+        cube, user_months, sketches = self.store.cube, self.store.user_months, self.store.sketches
+        return int(
+            cube.cells.memory_usage(deep=True).sum()
+            + user_months.rows.memory_usage(deep=True).sum()
+            + sketches.registers.nbytes
+            + sketches.groups.memory_usage(deep=True).sum()
+        )
+
+    def users(self, scope: Scope) -> np.ndarray:
+        """Entra IDs of the users inside ``scope``."""
+        return self.store.user_rows(scope)["mfcgd_id"].dropna().to_numpy()
+
+    def users_by(self, scope: Scope, column: str) -> DataFrame:
+        """(``column`` value, Entra ID) pairs inside ``scope``; the ID is missing for rows without one."""
+        labels, codes = self.store.user_months.user_pairs(self.store.user_rows(scope), column)
+        categories = self.store.user_months.rows["mfcgd_id"].cat.categories
+        users = pd.Categorical.from_codes(codes, categories=categories)
+        return DataFrame({column: labels.to_numpy(), "user": np.asarray(users, dtype=object)})
+
+
+class PartitionedPremiumStore(PremiumRequestsStore):
+    """Premium request aggregates answered from month partitions loaded on demand."""
+
+    def __init__(self, directory: Path, cache: PartitionCache) -> None:
+        self.directory = directory
+        self.cache = cache
+        self.partitions = _require_partitions(directory)
+        self.relative_error = relative_error()
+        self._values: dict[Partition, dict[str, list[str]]] = {}
+
+    def cells(self, scope: Scope) -> DataFrame:
+        return _concat([partition.store.cells(scope) for partition in self._loaded(scope)])
+
+    def unique_users(self, scope: Scope) -> int:
+        loaded = self._loaded(scope)
+        if len(loaded) == 1:
+            return loaded[0].store.unique_users(scope)
+        return len(pd.unique(np.concatenate([partition.users(scope) for partition in loaded])))
+
+    def unique_users_by(self, scope: Scope, column: str) -> Series:
+        loaded = self._loaded(scope)
+        if len(loaded) == 1 or column == "month":
+            # Partitions hold disjoint months, so per-month counts simply stack.
+            counts = [partition.store.unique_users_by(scope, column) for partition in loaded]
+            return pd.concat(counts) if len(counts) > 1 else counts[0]
+        pairs = pd.concat([partition.users_by(scope, column) for partition in loaded], ignore_index=True)
+        counts = pairs.groupby(column, observed=True, sort=True)["user"].nunique()
+        return counts.rename(column)
+
+    def distinct(self, column: str) -> list[str]:
+        # Values are recorded as partitions load, so only never-loaded partitions are opened.
+        for partition in self.partitions:
+            if partition not in self._values:
+                self._partition(partition)
+        return sorted({value for values in self._values.values() for value in values[column]})
+
+    def estimate_users(self, scope: Scope) -> float:
+        unions = []
+        for partition in self._loaded(scope):
+            groups = _groups(partition, scope)
+            if len(groups):
+                unions.append(partition.store.sketches.union(groups.index))
+        return estimate_registers(np.maximum.reduce(unions)) if unions else 0.0
+
+    def estimate_users_by(self, scope: Scope, column: str) -> Series:
+        registers, labels = [], []
+        for partition in self._loaded(scope):
+            groups = _groups(partition, scope)
+            merged, uniques = partition.store.sketches.union_by(groups.index, groups[column])
+            registers.append(merged)
+            labels.append(pd.Series(uniques, dtype=object))
+        codes, uniques = pd.factorize(pd.concat(labels, ignore_index=True), sort=True)
+        combined = np.zeros((len(uniques), registers[0].shape[1]), dtype=np.uint8)
+        np.maximum.at(combined, codes, np.concatenate(registers))
+        return Series([estimate_registers(row) for row in combined], index=uniques, name=column)
+
+    def _loaded(self, scope: Scope) -> list[_PremiumPartition]:
+        # An empty range is answered from the latest partition so results keep their columns and types.
+        selected = _pruned(self.partitions, scope) or self.partitions[-1:]
+        return [self._partition(partition) for partition in selected]
+
+    def _partition(self, partition: Partition) -> _PremiumPartition:
+        loaded = self.cache.get(
+            ("premium_requests", partition.path, partition.version),
+            lambda: _PremiumPartition.load(partition),
+            lambda value: value.nbytes,
+        )
+        self._values[partition] = loaded.values
+        return loaded
+
+
+def _groups(partition: _PremiumPartition, scope: Scope) -> DataFrame:
+    sketches = partition.store.sketches
+    return sketches.index.select(sketches.groups, scope.segment, scope.employee, scope.start, scope.end)
+
+
+class PartitionedSegmentStore(SegmentAdoptionStore):
+    """Segment adoption rows read from month partitions loaded on demand."""
+
+    def __init__(self, directory: Path, cache: PartitionCache) -> None:
+        self.directory = directory
+        self.cache = cache
+        self.partitions = _require_partitions(directory)
+
+    def rows(self, scope: Scope) -> DataFrame:
+        selected = _pruned(self.partitions, scope) or self.partitions[-1:]
+        return _concat([self._partition(partition).rows(scope) for partition in selected])
+
+    def segments(self) -> list[str]:
+        return sorted({segment for partition in self.partitions for segment in self._partition(partition).segments()})
+
+    def _partition(self, partition: Partition) -> FrameSegmentStore:
+        return self.cache.get(
+            ("segment_adoption", partition.path, partition.version),
+            lambda: _load_segment_partition(partition),
+            lambda store: int(store.data.memory_usage(deep=True).sum()),
+        )
+
+
+def _load_segment_partition(partition: Partition) -> FrameSegmentStore:
+    analytics = SegmentAdoptionAnalytics.from_raw(partition.path, (read_text_frame(path) for path in partition.files))
+    return analytics.store
+
+
+__all__ = [
+    "Partition",
+    "PartitionCache",
+    "PartitionedPremiumStore",
+    "PartitionedSegmentStore",
+    "discover_partitions",
+    "shared_partition_cache",
+]
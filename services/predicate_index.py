@@ -0,0 +1,137 @@
+"""Pre-encoded segment and user-type predicates over month-sorted frames.
+
+Matching a segment used to casefold every row's text on each query.
+``PredicateIndex`` does that once at build time: each casefolded segment gets
+an integer code, and the row positions of every segment and every
+(segment, FTE flag) pair are stored as sorted position lists. A query looks up
+the code, cuts the matching position list down to the month range with two
+binary searches, and takes only those rows.
+
+Inside a ``shared_selections()`` block identical selections are computed once
+and reused, so a batch of queries over the same scope filters only once.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from .month_index import MonthIndex
+
+_SHARED_SELECTIONS: ContextVar[Optional[dict]] = ContextVar("shared_selections", default=None)
+
+
+@contextmanager
+def shared_selections() -> Iterator[None]:
+    """Memoise ``PredicateIndex.select`` results for the duration of the block."""
+    if _SHARED_SELECTIONS.get() is not None:
+        yield
+        return
+    token = _SHARED_SELECTIONS.set({})
+    try:
+        yield
+    finally:
+        _SHARED_SELECTIONS.reset(token)
+
+
+class _PositionLists:
+    """Sorted row positions per integer key, stored as one flat CSR array."""
+
+    def __init__(self, keys: np.ndarray, key_count: int) -> None:
+        self.positions = np.argsort(keys, kind="stable").astype(np.int64)
+        self.offsets = np.searchsorted(keys[self.positions], np.arange(key_count + 1))
+
+    def get(self, key: int) -> np.ndarray:
+        return self.positions[self.offsets[key]:self.offsets[key + 1]]
+
+
+class PredicateIndex:
+    """Segment codes and row position lists for one month-sorted frame.
+
+    ``employee_column`` names the boolean FTE flag; frames without one (the
+    segment adoption dataset) only index segments.
+    """
+
+    def __init__(self, frame: DataFrame, employee_column: Optional[str] = "is_employee") -> None:
+        self.months = MonthIndex.build(frame["month"])
+        codes, uniques = pd.factorize(frame["segment"])
+        self.segment_codes: dict[str, int] = {}
+        merged = np.array(
+            [self.segment_codes.setdefault(str(value).casefold(), len(self.segment_codes)) for value in uniques],
+            dtype=np.int64,
+        )
+        # Rows with a missing segment get a trailing code that no lookup returns.
+        rows = np.full(len(codes), len(self.segment_codes), dtype=np.int64)
+        known = codes >= 0
+        rows[known] = merged[codes[known]]
+        segment_count = len(self.segment_codes) + 1
+        self._by_segment = _PositionLists(rows, segment_count)
+        self._by_employee: Optional[np.ndarray] = None
+        self._by_contractor: Optional[np.ndarray] = None
+        self._by_segment_employee: Optional[_PositionLists] = None
+        if employee_column is not None and employee_column in frame.columns:
+            employee = frame[employee_column].to_numpy(dtype=bool)
+            self._by_employee = np.flatnonzero(employee)
+            self._by_contractor = np.flatnonzero(~employee)
+            self._by_segment_employee = _PositionLists(rows * 2 + employee, segment_count * 2)
+
+    def segment_code(self, segment: str) -> Optional[int]:
+        """Code of ``segment`` compared case-insensitively, or ``None`` when absent."""
+        return self.segment_codes.get(segment.casefold())
+
+    def select(
+        self,
+        frame: DataFrame,
+        segment: Optional[str],
+        employee: Optional[bool],
+        start: Optional[pd.Period],
+        end: Optional[pd.Period],
+    ) -> DataFrame:
+        """Rows of ``frame`` matching the segment, FTE flag and month range."""
+        shared = _SHARED_SELECTIONS.get()
+        if shared is None:
+            return self._select(frame, segment, employee, start, end)
+        key = (id(self), id(frame), segment.casefold() if segment else None, employee, start, end)
+        entry = shared.get(key)
+        # The entry holds the index and frame it was computed for, so neither can be
+        # freed and their ids reused by a reloaded generation while the block runs.
+        if entry is None or entry[0] is not self or entry[1] is not frame:
+            entry = shared[key] = (self, frame, self._select(frame, segment, employee, start, end))
+        return entry[2]
+
+    def _select(
+        self,
+        frame: DataFrame,
+        segment: Optional[str],
+        employee: Optional[bool],
+        start: Optional[pd.Period],
+        end: Optional[pd.Period],
+    ) -> DataFrame:
+        if not segment and employee is None:
+            return self.months.select(frame, start, end)
+        positions = self._positions(segment, employee)
+        if positions is None:
+            return frame.iloc[0:0]
+        bounds = self.months.bounds(start, end)
+        first, last = np.searchsorted(positions, [bounds.start, bounds.stop])
+        return frame.iloc[positions[first:last]]
+
+    def _positions(self, segment: Optional[str], employee: Optional[bool]) -> Optional[np.ndarray]:
+        if employee is not None and self._by_segment_employee is None:
+            raise ValueError("Frame was indexed without an employee column")
+        if not segment:
+            return self._by_employee if employee else self._by_contractor
+        code = self.segment_code(segment)
+        if code is None:
+            return None
+        if employee is None:
+            return self._by_segment.get(code)
+        return self._by_segment_employee.get(code * 2 + int(employee))
+
+
+__all__ = ["PredicateIndex", "shared_selections"]
@@ -0,0 +1,87 @@
+"""Pre-aggregated cube over the premium request log.
+
+Every additive premium request metric (requests, gross/discount/net amounts,
+rows over quota) can be answered from totals at month x segment x
+is_employee x enterprise x model grain. The cube is built once per load and is
+orders of magnitude smaller than the raw log, so queries filter and group the
+cube cells instead of the request rows.
+
+Unique users are not additive; they are counted from the per-user monthly
+table in ``services.user_months`` instead.
+
+The cube can absorb a cube built from newly ingested rows (``merge``), so an
+incremental load only aggregates the new rows.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pandas.api.types import union_categoricals
+from pandas.api.typing import DataFrameGroupBy
+
+from .predicate_index import PredicateIndex
+
+CUBE_DIMENSIONS = ("month", "segment", "is_employee", "enterprise", "model")
+CUBE_MEASURES = ("quantity", "gross_amount", "discount_amount", "net_amount", "exceeding_rows")
+
+
+def stack_groups(
+    left: DataFrame, right: DataFrame, dimensions: Sequence[str]
+) -> tuple[DataFrameGroupBy, np.ndarray, np.ndarray]:
+    """Group two group tables together on ``dimensions``.
+
+    Returns the grouping of the stacked rows plus the merged group id of every
+    ``left`` row and every ``right`` row. Categorical dimensions are unified
+    first so stacking never decays them to text.
+    """
+    left, right = left.copy(deep=False), right.copy(deep=False)
+    for column in dimensions:
+        if isinstance(left[column].dtype, pd.CategoricalDtype) and not left[column].dtype == right[column].dtype:
+            categories = union_categoricals([left[column], right[column]], ignore_order=True).categories
+            left[column] = left[column].cat.set_categories(categories)
+            right[column] = right[column].cat.set_categories(categories)
+    stacked = pd.concat([left, right], ignore_index=True)
+    grouped = stacked.groupby(list(dimensions), observed=True, sort=True, dropna=False)
+    ids = grouped.ngroup().to_numpy()
+    return grouped, ids[:len(left)], ids[len(left):]
+
+
+class RequestCube:
+    """Summed premium request measures per (month, segment, is_employee, enterprise, model) cell."""
+
+    def __init__(self, cells: DataFrame) -> None:
+        self.cells = cells
+        self.index = PredicateIndex(cells)
+
+    @classmethod
+    def build(cls, data: DataFrame) -> "RequestCube":
+        """Aggregate the typed request rows into cube cells sorted by month."""
+        # dropna=False keeps rows with a missing model in the totals, as the raw rows were.
+        grouped = data.groupby(list(CUBE_DIMENSIONS), observed=True, sort=True, dropna=False)
+        cells = (
+            grouped
+            .agg(
+                quantity=("quantity", "sum"),
+                gross_amount=("gross_amount", "sum"),
+                discount_amount=("discount_amount", "sum"),
+                net_amount=("net_amount", "sum"),
+                exceeding_rows=("exceeds_quota", "sum"),
+            )
+            .reset_index()
+        )
+        return cls(cells)
+
+    def merge(self, other: "RequestCube") -> "RequestCube":
+        """Cube over the rows of both cubes (e.g. the loaded history plus an appended delta)."""
+        grouped, _, _ = stack_groups(self.cells, other.cells, CUBE_DIMENSIONS)
+        return RequestCube(grouped[list(CUBE_MEASURES)].sum().reset_index())
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+
+__all__ = ["CUBE_DIMENSIONS", "CUBE_MEASURES", "RequestCube", "stack_groups"]
@@ -24,12 +24,30 @@ Required columns:
 
 from __future__ import annotations
 
+import io
+import os
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal, Optional
+from typing import Iterable, Iterator, Literal, Optional
 
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
+from pandas.api.types import union_categoricals
+
+from .csv_cleaning import clean_frame, clean_series, normalise_headers, parse_dates, to_number
+from .hyperloglog import UserSketches
+from .month_index import sort_by_month
+from .premium_cube import RequestCube
+from .snapshot_cache import source_version
+from .storage_backend import FramePremiumStore, PremiumRequestsStore, Scope
+from .user_months import UserMonthTable
 
 
 class AnalyticsConfigError(RuntimeError):
@@ -59,43 +77,433 @@ class DateRange:
         return "all available months"
 
 
-def _clean_cell(value: object) -> object:
-    """Normalize CSV cell values."""
-    if not isinstance(value, str):
-        return value
-    cleaned = value.replace("\u00a0", " ").strip().strip('"')
-    cleaned = cleaned.replace(",", "")
-    cleaned = cleaned.strip()
-    if cleaned in {"", "NA", "N/A", "None"}:
-        return pd.NA
-    return cleaned
+@dataclass(frozen=True)
+class LoadStats:
+    """Row count and memory footprint recorded while loading the CSV."""
+
+    rows: int
+    chunks: int
+    frame_bytes: int
+    peak_rss_bytes: Optional[int]
+    duplicates_dropped: int = 0
+
+    def description(self) -> str:
+        peak = (
+            f", peak RSS {self.peak_rss_bytes / 1024 ** 2:,.1f} MB"
+            if self.peak_rss_bytes is not None
+            else ""
+        )
+        duplicates = (
+            f", {self.duplicates_dropped:,} re-exported duplicate row(s) dropped"
+            if self.duplicates_dropped
+            else ""
+        )
+        return (
+            f"{self.rows:,} rows in {self.chunks:,} chunk(s), "
+            f"frame {self.frame_bytes / 1024 ** 2:,.1f} MB{peak}{duplicates}"
+        )
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process, where the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
 
 
 _UserType = Literal["fte", "contractor", "all"]
 
+_REQUEST_DATE_FORMAT = "%Y-%m-%d"
+
+# Trailing bytes of the consumed source remembered to detect a rewritten export.
+_ANCHOR_BYTES = 256
+
+# Columns kept after load and how each one is stored. Everything else in the
+# export (gh_id, collection_date, request_date, ...) is dropped once typed.
+#   category - low-cardinality dimension stored as a pandas categorical
+#   user     - Entra ID, integer-encoded as categorical codes over the user list
+#   measure  - additive numeric, downcast to the narrowest lossless dtype
+#   key      - 64-bit hash of the natural key, used to drop re-exported rows
+_SCHEMA: dict[str, str] = {
+    "month": "period",
+    "segment": "category",
+    "enterprise": "category",
+    "model": "category",
+    "is_employee": "bool",
+    "exceeds_quota": "bool",
+    "mfcgd_id": "user",
+    "quantity": "measure",
+    "gross_amount": "measure",
+    "discount_amount": "measure",
+    "net_amount": "measure",
+    "row_key": "key",
+}
+
+# A request row is identified by these columns; overlapping daily exports repeat
+# it with a newer collection_date, and only the latest copy is kept.
+_NATURAL_KEY = ("enterprise", "gh_id", "request_date", "model")
+
+# Parsed collection_date carried by freshly normalised rows until duplicates are dropped.
+_COLLECTED = "_collected"
+
+
+def _apply_schema(df: DataFrame) -> DataFrame:
+    """Project ``df`` onto ``_SCHEMA`` and store each column in its compact dtype."""
+    compact: dict[str, pd.Series] = {}
+    for column, kind in _SCHEMA.items():
+        series = df[column]
+        if kind in {"category", "user"}:
+            series = series.astype("category")
+        elif kind == "measure":
+            series = _downcast(series)
+        compact[column] = series
+    return DataFrame(compact)
+
+
+def _clean_rows(df: DataFrame) -> DataFrame:
+    """Clean and type raw premium request rows read as text.
+
+    The result also carries each row's parsed collection_date in ``_COLLECTED``
+    until ``_drop_superseded`` has used it.
+    """
+    df = clean_frame(df)
+    df.columns = normalise_headers(df.columns)
+    
+    required = {"request_date", "mfcgd_id", "enterprise", "model", "quantity", "gross_amount", "discount_amount", "net_amount", "segment", "is_employee"}
+    missing = required - set(df.columns)
+    if missing:
+        raise PremiumRequestsConfigError(
+            f"Premium requests CSV missing required columns: {', '.join(sorted(missing))}"
+        )
+
+    if "collection_date" in df.columns:
+        collected = parse_dates(df["collection_date"], _REQUEST_DATE_FORMAT)
+    else:
+        collected = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+    
+    # Parse dates and extract month
+    df["request_date"] = parse_dates(df["request_date"], _REQUEST_DATE_FORMAT)
+    df.dropna(subset=["request_date"], inplace=True)
+    df["month"] = df["request_date"].dt.to_period("M")
+    
+    # Numeric conversions
+    for col in ["quantity", "gross_amount", "discount_amount", "net_amount"]:
+        df[col] = to_number(df[col]).fillna(0)
+    
+    # Boolean conversion for is_employee and exceeds_quota
+    df["is_employee"] = df["is_employee"].str.upper().isin(["TRUE", "T", "1", "YES"])
+    if "exceeds_quota" in df.columns:
+        df["exceeds_quota"] = df["exceeds_quota"].str.upper().isin(["TRUE", "T", "1", "YES"])
+    else:
+        df["exceeds_quota"] = False
+    
+    # Clean segment and enterprise
+    df["segment"] = df["segment"].fillna("Unassigned")
+    df["enterprise"] = df["enterprise"].fillna("unknown")
+
+    if "gh_id" not in df.columns:
+        df["gh_id"] = pd.NA
+    df["row_key"] = pd.util.hash_pandas_object(df[list(_NATURAL_KEY)], index=False)
+
+    typed = _apply_schema(df)
+    typed[_COLLECTED] = collected
+    return typed
+
+
+def iter_clean_chunks(csv_path: Path, chunk_rows: int) -> Iterator[tuple[DataFrame, np.ndarray]]:
+    """Cleaned, typed chunks of an export, each with its rows' collection times in ns.
+
+    Used by stores that keep the rows outside this process (see
+    ``services.sqlite_backend``); duplicates are left for the caller to resolve.
+    """
+    with pd.read_csv(csv_path, dtype=str, keep_default_na=False, chunksize=chunk_rows) as reader:
+        for raw in reader:
+            typed = _clean_rows(raw)
+            collected = typed.pop(_COLLECTED).to_numpy(dtype="datetime64[ns]").view(np.int64)
+            yield typed, collected
+
+
+def _drop_superseded(df: DataFrame) -> tuple[DataFrame, int]:
+    """Keep the latest collected row per natural key; return the rows and how many were dropped.
+
+    Keys are compared by their 64-bit hash. Only rows whose key repeats are
+    sorted, so an export without overlap costs a single hash-table pass. Ties
+    on collection_date keep the row that appears last.
+    """
+    collected = df[_COLLECTED].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    df = df.drop(columns=_COLLECTED)
+    keys = df["row_key"].to_numpy()
+    repeated = np.flatnonzero(pd.Series(keys).duplicated(keep=False).to_numpy())
+    if not len(repeated):
+        return df, 0
+    order = repeated[np.lexsort((collected[repeated], keys[repeated]))]
+    ordered_keys = keys[order]
+    superseded = order[:-1][ordered_keys[:-1] == ordered_keys[1:]]
+    keep = np.ones(len(df), dtype=bool)
+    keep[superseded] = False
+    return df[keep], len(superseded)
+
+
+def _downcast(series: pd.Series) -> pd.Series:
+    """Narrow a numeric column only when every value survives the conversion exactly."""
+    if series.empty or not pd.api.types.is_numeric_dtype(series):
+        return series
+    if pd.api.types.is_float_dtype(series):
+        if series.isna().any() or not (series % 1 == 0).all():
+            return series
+    return pd.to_numeric(series, downcast="integer")
+
+
+def _concat_typed(pieces: list[DataFrame]) -> DataFrame:
+    """Concatenate typed chunks, unifying categorical vocabularies instead of decaying to text."""
+    combined: dict[str, object] = {}
+    for column in pieces[0].columns:
+        parts = [piece[column] for piece in pieces]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            # A frame read from a snapshot or shared files can hold its labels in another string dtype.
+            labels = parts[0].cat.categories.dtype
+            parts = [
+                part if part.cat.categories.dtype == labels else part.cat.rename_categories(
+                    part.cat.categories.astype(labels)
+                )
+                for part in parts
+            ]
+            combined[column] = pd.Series(union_categoricals(parts, ignore_order=True))
+        else:
+            combined[column] = pd.concat(parts, ignore_index=True)
+    df = DataFrame(combined)
+    for column, kind in _SCHEMA.items():
+        if kind == "measure":
+            df[column] = _downcast(df[column])
+    return df
+
+
+@dataclass(frozen=True)
+class _SourceMark:
+    """How far into the source CSV a load read, so appended rows can be read alone."""
+
+    offset: int
+    header: bytes
+    anchor: bytes
+
+    @classmethod
+    def of(cls, path: Path) -> "_SourceMark":
+        with path.open("rb") as handle:
+            header = handle.readline()
+            offset = os.fstat(handle.fileno()).st_size
+            handle.seek(max(0, offset - _ANCHOR_BYTES))
+            anchor = handle.read(offset - handle.tell())
+        return cls(offset, header, anchor)
+
+    def continued_by(self, path: Path) -> bool:
+        """True when ``path`` still starts with every byte this mark covers."""
+        if not self.anchor.endswith(b"\n") or path.stat().st_size < self.offset:
+            return False
+        with path.open("rb") as handle:
+            if handle.readline() != self.header:
+                return False
+            handle.seek(self.offset - len(self.anchor))
+            return handle.read(len(self.anchor)) == self.anchor
+
+    def read_appended(self, path: Path) -> tuple[DataFrame, "_SourceMark"]:
+        """Raw text rows after the mark, and the mark past them.
+
+        A partly written last line is left for the next read.
+        """
+        with path.open("rb") as handle:
+            handle.seek(self.offset)
+            tail = handle.read()
+        tail = tail[:tail.rfind(b"\n") + 1]
+        raw = pd.read_csv(io.BytesIO(self.header + tail), dtype=str, keep_default_na=False)
+        mark = _SourceMark(self.offset + len(tail), self.header, (self.anchor + tail)[-_ANCHOR_BYTES:])
+        return raw, mark
+
+
+def _format_bytes(size: int) -> str:
+    if size >= 1024 ** 2:
+        return f"{size / 1024 ** 2:,.1f} MB"
+    return f"{size / 1024:,.1f} KB"
+
 
 class PremiumRequestsAnalytics:
     """Provides analytics over GitHub Copilot Premium Request logs."""
 
-    def __init__(self, csv_path: Path) -> None:
+    def __init__(
+        self,
+        csv_path: Path,
+        chunk_rows: Optional[int] = None,
+        memory_limit_mb: Optional[float] = None,
+    ) -> None:
         if not csv_path.exists():
             raise PremiumRequestsConfigError(
                 f"Premium requests CSV not found at {csv_path}. Set COPILOT_PREMIUM_REQUESTS_CSV."
             )
         self.csv_path = csv_path
-        self.data = self._load(csv_path)
+        self.version = source_version(csv_path)
+        # Marked before reading: rows appended mid-load are read again rather than missed.
+        self._source_mark: Optional[_SourceMark] = _SourceMark.of(csv_path)
+        self.watermark: Optional[pd.Timestamp] = None
+        self.load_stats: Optional[LoadStats] = None
+        self.data = self._load(csv_path, chunk_rows, memory_limit_mb)
+        self._build_derived()
+
+    @staticmethod
+    def mark_source(csv_path: Path) -> tuple[str, Optional[_SourceMark]]:
+        """Version and read position of ``csv_path`` now, for ``from_frame`` when the frame is read afterwards."""
+        return source_version(csv_path), _SourceMark.of(csv_path) if csv_path.exists() else None
+
+    @classmethod
+    def from_frame(
+        cls, csv_path: Path, data: DataFrame, marked: Optional[tuple[str, Optional[_SourceMark]]] = None
+    ) -> "PremiumRequestsAnalytics":
+        """Build analytics from an already cleaned frame (e.g. a snapshot).
+
+        ``marked`` is ``mark_source`` taken before the frame was read; rows
+        appended since are then picked up by ``refresh``. Without it the
+        source is marked now.
+        """
+        analytics = cls.__new__(cls)
+        analytics.csv_path = csv_path
+        analytics.version, analytics._source_mark = marked if marked is not None else cls.mark_source(csv_path)
+        # Cleaned frames do not keep collection_date, so the watermark is unknown.
+        analytics.watermark = None
+        analytics.load_stats = None
+        analytics.data = data
+        analytics._build_derived()
+        return analytics
+
+    @classmethod
+    def from_raw(cls, source_path: Path, raws: Iterable[DataFrame]) -> "PremiumRequestsAnalytics":
+        """Build analytics from raw text frames in the export layout (e.g. the files of one partition)."""
+        analytics = cls.__new__(cls)
+        analytics.csv_path = source_path
+        analytics.version = source_version(source_path)
+        analytics._source_mark = None
+        analytics.watermark = None
+        pieces = [analytics._normalise(raw) for raw in raws]
+        df, dropped = _drop_superseded(_concat_typed(pieces))
+        analytics.load_stats = LoadStats(
+            rows=len(df),
+            chunks=len(pieces),
+            frame_bytes=int(df.memory_usage(deep=True).sum()),
+            peak_rss_bytes=_peak_rss_bytes(),
+            duplicates_dropped=dropped,
+        )
+        analytics.data = df
+        analytics._build_derived()
+        return analytics
+
+    @classmethod
+    def from_store(cls, source_path: Path, store: PremiumRequestsStore) -> "PremiumRequestsAnalytics":
+        """Build analytics that query ``store`` instead of holding the data in memory.
+
+        ``source_path`` is the file whose changes mean the store has new data
+        (the database file for the SQLite backend); there is no frame, cube
+        or incremental ingest on this path.
+        """
+        analytics = cls.__new__(cls)
+        analytics.csv_path = source_path
+        analytics.version = source_version(source_path)
+        analytics._source_mark = None
+        analytics.watermark = None
+        analytics.load_stats = None
+        analytics.data = None
+        analytics.store = store
+        return analytics
+
+    def append(self, delta_path: Path) -> "PremiumRequestsAnalytics":
+        """Return analytics with the rows of a delta CSV (same layout as the export) added.
+
+        Only the delta rows are cleaned and aggregated; ``self`` is left unchanged.
+        """
+        if not delta_path.exists():
+            raise PremiumRequestsConfigError(f"Premium requests delta CSV not found at {delta_path}.")
+        raw = pd.read_csv(delta_path, dtype=str, keep_default_na=False)
+        return self._with_rows(raw, f"{self.version}+{source_version(delta_path)}", self._source_mark)
+
+    def refresh(self) -> Optional["PremiumRequestsAnalytics"]:
+        """Return analytics that include rows added to the source CSV since this load.
+
+        An export that only grew is read from where the last load stopped. One
+        that was rewritten is re-read as text, but only rows collected after
+        ``watermark`` are cleaned and merged. Returns ``self`` when nothing was
+        added and ``None`` when only a full reload can pick up the change (the
+        file shrank, or it was rewritten and no watermark is known).
+        """
+        version = source_version(self.csv_path)
+        if version == self.version:
+            return self
+        mark = self._source_mark
+        if mark is not None and mark.continued_by(self.csv_path):
+            raw, mark = mark.read_appended(self.csv_path)
+        elif self.watermark is not None and mark is not None and self.csv_path.stat().st_size >= mark.offset:
+            mark = _SourceMark.of(self.csv_path)
+            raw = self._rows_after_watermark(pd.read_csv(self.csv_path, dtype=str, keep_default_na=False))
+            if raw is None:
+                return None
+        else:
+            return None
+        return self._with_rows(raw, version, mark)
+
+    def _rows_after_watermark(self, raw: DataFrame) -> Optional[DataFrame]:
+        """Raw rows collected after ``watermark``, or ``None`` without a collection_date column."""
+        headers = normalise_headers(raw.columns)
+        if "collection_date" not in headers:
+            return None
+        column = raw.columns[headers.index("collection_date")]
+        collected = parse_dates(clean_series(raw[column]), _REQUEST_DATE_FORMAT)
+        return raw.loc[(collected > self.watermark).fillna(False).to_numpy(dtype=bool)]
+
+    def _with_rows(
+        self, raw: DataFrame, version: str, mark: Optional[_SourceMark]
+    ) -> "PremiumRequestsAnalytics":
+        """New analytics over ``self.data`` plus the raw ``rows``, merging the derived structures."""
+        merged = self.__class__.__new__(self.__class__)
+        merged.csv_path = self.csv_path
+        merged.version = version
+        merged._source_mark = mark
+        merged.watermark = self.watermark
+        rows, dropped = _drop_superseded(merged._normalise(raw))
+        # Rows ingested later are newer exports, so they replace loaded rows with the same key.
+        replaced = self.data["row_key"].isin(rows["row_key"]).to_numpy()
+        dropped += int(replaced.sum())
+        history = self.data[~replaced] if replaced.any() else self.data
+        combined = _concat_typed([history, rows])
+        merged.data = sort_by_month(combined)
+        if history is self.data:
+            # The new rows re-read from the combined frame, so they share its category codes.
+            delta = combined.iloc[len(self.data):]
+            merged.cube = self.cube.merge(RequestCube.build(delta))
+            merged.user_months = self.user_months.merge(UserMonthTable.build(delta))
+            merged.sketches = self.sketches.merge(UserSketches.build(delta))
+        else:
+            # Replaced rows cannot be subtracted from the user-month totals and sketches.
+            merged.cube = RequestCube.build(merged.data)
+            merged.user_months = UserMonthTable.build(merged.data)
+            merged.sketches = UserSketches.build(merged.data)
+        merged.store = FramePremiumStore(merged.cube, merged.user_months, merged.sketches)
+        merged.load_stats = LoadStats(
+            rows=len(merged.data),
+            chunks=1,
+            frame_bytes=int(merged.data.memory_usage(deep=True).sum()),
+            peak_rss_bytes=_peak_rss_bytes(),
+            duplicates_dropped=dropped,
+        )
+        return merged
 
     def available_segments(self) -> list[str]:
         """Return list of segments present in the dataset."""
-        return sorted(self.data["segment"].dropna().unique().tolist())
+        return self.store.distinct("segment")
 
     def available_enterprises(self) -> list[str]:
         """Return list of enterprises present in the dataset."""
-        return sorted(self.data["enterprise"].dropna().unique().tolist())
+        return self.store.distinct("enterprise")
 
     def available_models(self) -> list[str]:
         """Return list of AI models used in premium requests."""
-        return sorted(self.data["model"].dropna().unique().tolist())
+        return self.store.distinct("model")
 
     def summary(
         self,
@@ -103,26 +511,34 @@ class PremiumRequestsAnalytics:
         user_type: _UserType = "all",
         start_month: Optional[str] = None,
         end_month: Optional[str] = None,
+        approximate: bool = False,
     ) -> str:
-        """Summarise premium request usage, costs, and user counts."""
+        """Summarise premium request usage, costs, and user counts.
+
+        With ``approximate`` the unique user count is a HyperLogLog estimate.
+        """
         period = self._normalize_range(start_month, end_month)
-        scoped = self._filter(segment, user_type, period)
+        scope = self._scope(segment, user_type, period)
+        cells = self.store.cells(scope)
         
-        if scoped.empty:
+        if cells.empty:
             return "No premium request records match the requested scope."
 
         scope_label = self._scope_label(segment, user_type)
-        total_requests = float(scoped["quantity"].sum())
-        unique_users = int(scoped["mfcgd_id"].nunique())
-        gross_cost = float(scoped["gross_amount"].sum())
-        discount = float(scoped["discount_amount"].sum())
-        net_cost = float(scoped["net_amount"].sum())
-        exceeded_quota = int(scoped[scoped["exceeds_quota"] == True].shape[0])
+        total_requests = float(cells["quantity"].sum())
+        if approximate and self.store.relative_error is not None:
+            users_label = f"{self._format_estimate(self.store.estimate_users(scope))}, HyperLogLog estimate"
+        else:
+            users_label = f"{self.store.unique_users(scope):,}"
+        gross_cost = float(cells["gross_amount"].sum())
+        discount = float(cells["discount_amount"].sum())
+        net_cost = float(cells["net_amount"].sum())
+        exceeded_quota = int(cells["exceeding_rows"].sum())
         
         lines = [
             f"Premium request summary for {scope_label} during {period.description()}:",
             f"- Total requests: {total_requests:,.0f}",
-            f"- Unique users (by Entra ID): {unique_users:,}",
+            f"- Unique users (by Entra ID): {users_label}",
             f"- Gross cost: ${gross_cost:,.2f}",
             f"- Discount (free quota): ${discount:,.2f}",
             f"- Net billable cost: ${net_cost:,.2f}",
@@ -132,7 +548,7 @@ class PremiumRequestsAnalytics:
             lines.append(f"- Requests exceeding quota: {exceeded_quota:,}")
         
         # Top models
-        top_models = scoped.groupby("model")["quantity"].sum().sort_values(ascending=False).head(3)
+        top_models = cells.groupby("model", observed=True)["quantity"].sum().sort_values(ascending=False).head(3)
         if not top_models.empty:
             model_list = ", ".join([f"{model} ({int(qty):,})" for model, qty in top_models.items()])
             lines.append(f"- Top models: {model_list}")
@@ -147,26 +563,35 @@ class PremiumRequestsAnalytics:
         start_month: Optional[str] = None,
         end_month: Optional[str] = None,
         limit: int = 6,
+        approximate: bool = False,
     ) -> str:
-        """Show month-by-month trend of requests, cost, or unique users."""
+        """Show month-by-month trend of requests, cost, or unique users.
+
+        With ``approximate`` the users metric merges per-month HyperLogLog sketches.
+        """
         period = self._normalize_range(start_month, end_month)
-        scoped = self._filter(segment, user_type, period)
+        scope = self._scope(segment, user_type, period)
+        cells = self.store.cells(scope)
         
-        if scoped.empty:
+        if cells.empty:
             return "No premium request records match the requested scope."
 
         scope_label = self._scope_label(segment, user_type)
         
         if metric == "requests":
-            monthly = scoped.groupby("month")["quantity"].sum()
+            monthly = cells.groupby("month", observed=True)["quantity"].sum()
             metric_name = "requests"
             format_fn = lambda x: f"{int(x):,}"
         elif metric == "cost":
-            monthly = scoped.groupby("month")["net_amount"].sum()
+            monthly = cells.groupby("month", observed=True)["net_amount"].sum()
             metric_name = "net cost"
             format_fn = lambda x: f"${x:,.2f}"
+        elif approximate and self.store.relative_error is not None:  # users, estimated
+            monthly = self.store.estimate_users_by(scope, "month")
+            metric_name = "unique users"
+            format_fn = self._format_estimate
         else:  # users
-            monthly = scoped.groupby("month")["mfcgd_id"].nunique()
+            monthly = self.store.unique_users_by(scope, "month")
             metric_name = "unique users"
             format_fn = lambda x: f"{int(x):,}"
         
@@ -186,26 +611,35 @@ class PremiumRequestsAnalytics:
         start_month: Optional[str] = None,
         end_month: Optional[str] = None,
         limit: int = 5,
+        approximate: bool = False,
     ) -> str:
-        """Rank segments by requests, cost, or unique user count."""
+        """Rank segments by requests, cost, or unique user count.
+
+        With ``approximate`` the users metric merges per-segment HyperLogLog sketches.
+        """
         period = self._normalize_range(start_month, end_month)
-        scoped = self._filter(None, user_type, period)
+        scope = self._scope(None, user_type, period)
+        cells = self.store.cells(scope)
         
-        if scoped.empty:
+        if cells.empty:
             return "No premium request records match the requested scope."
 
         user_label = self._user_type_label(user_type)
         
         if metric == "requests":
-            grouped = scoped.groupby("segment")["quantity"].sum()
+            grouped = cells.groupby("segment", observed=True)["quantity"].sum()
             metric_name = "requests"
             format_fn = lambda x: f"{int(x):,}"
         elif metric == "cost":
-            grouped = scoped.groupby("segment")["net_amount"].sum()
+            grouped = cells.groupby("segment", observed=True)["net_amount"].sum()
             metric_name = "net cost"
             format_fn = lambda x: f"${x:,.2f}"
+        elif approximate and self.store.relative_error is not None:  # users, estimated
+            grouped = self.store.estimate_users_by(scope, "segment")
+            metric_name = "unique users"
+            format_fn = self._format_estimate
         else:  # users
-            grouped = scoped.groupby("segment")["mfcgd_id"].nunique()
+            grouped = self.store.unique_users_by(scope, "segment")
             metric_name = "unique users"
             format_fn = lambda x: f"{int(x):,}"
         
@@ -227,14 +661,15 @@ class PremiumRequestsAnalytics:
     ) -> str:
         """Rank AI models by request volume and cost."""
         period = self._normalize_range(start_month, end_month)
-        scoped = self._filter(segment, user_type, period)
+        scope = self._scope(segment, user_type, period)
+        cells = self.store.cells(scope)
         
-        if scoped.empty:
+        if cells.empty:
             return "No premium request records match the requested scope."
 
         scope_label = self._scope_label(segment, user_type)
         
-        model_stats = scoped.groupby("model").agg({
+        model_stats = cells.groupby("model", observed=True).agg({
             "quantity": "sum",
             "net_amount": "sum",
         }).sort_values("net_amount", ascending=False).head(limit)
@@ -256,18 +691,19 @@ class PremiumRequestsAnalytics:
     ) -> str:
         """Compare usage across manulife (EMU) vs manulife-financial (legacy)."""
         period = self._normalize_range(start_month, end_month)
-        scoped = self._filter(segment, user_type, period)
+        scope = self._scope(segment, user_type, period)
+        cells = self.store.cells(scope)
         
-        if scoped.empty:
+        if cells.empty:
             return "No premium request records match the requested scope."
 
         scope_label = self._scope_label(segment, user_type)
         
-        enterprise_stats = scoped.groupby("enterprise").agg({
+        enterprise_stats = cells.groupby("enterprise", observed=True).agg({
             "quantity": "sum",
             "net_amount": "sum",
-            "mfcgd_id": "nunique",
         })
+        enterprise_stats["mfcgd_id"] = self.store.unique_users_by(scope, "enterprise")
         
         lines = [f"Enterprise breakdown for {scope_label} ({period.description()}):"]
         for enterprise, row in enterprise_stats.iterrows():
@@ -279,65 +715,99 @@ class PremiumRequestsAnalytics:
         
         return "\n".join(lines)
 
-    def _load(self, csv_path: Path) -> DataFrame:
-        """Load and normalize premium requests CSV."""
-        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
-        df = df.applymap(_clean_cell)
-        df.columns = [col.strip().lower().replace(" ", "_") for col in df.columns]
-        
-        required = {"request_date", "mfcgd_id", "enterprise", "model", "quantity", "gross_amount", "discount_amount", "net_amount", "segment", "is_employee"}
-        missing = required - set(df.columns)
-        if missing:
-            raise PremiumRequestsConfigError(
-                f"Premium requests CSV missing required columns: {', '.join(sorted(missing))}"
-            )
-        
-        # Parse dates and extract month
-        df["request_date"] = pd.to_datetime(df["request_date"], errors="coerce")
-        df.dropna(subset=["request_date"], inplace=True)
-        df["month"] = df["request_date"].dt.to_period("M")
-        
-        # Numeric conversions
-        for col in ["quantity", "gross_amount", "discount_amount", "net_amount"]:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-        
-        # Boolean conversion for is_employee and exceeds_quota
-        df["is_employee"] = df["is_employee"].str.upper().isin(["TRUE", "T", "1", "YES"])
-        if "exceeds_quota" in df.columns:
-            df["exceeds_quota"] = df["exceeds_quota"].str.upper().isin(["TRUE", "T", "1", "YES"])
-        else:
-            df["exceeds_quota"] = False
-        
-        # Clean segment and enterprise
-        df["segment"] = df["segment"].fillna("Unassigned")
-        df["enterprise"] = df["enterprise"].fillna("unknown")
-        
+    def _load(
+        self,
+        csv_path: Path,
+        chunk_rows: Optional[int] = None,
+        memory_limit_mb: Optional[float] = None,
+    ) -> DataFrame:
+        """Load and normalize premium requests CSV, optionally in bounded chunks."""
+        if chunk_rows:
+            return self._load_chunked(csv_path, chunk_rows, memory_limit_mb)
+        df, dropped = _drop_superseded(self._normalise(pd.read_csv(csv_path, dtype=str, keep_default_na=False)))
+        self.load_stats = LoadStats(
+            rows=len(df),
+            chunks=1,
+            frame_bytes=int(df.memory_usage(deep=True).sum()),
+            peak_rss_bytes=_peak_rss_bytes(),
+            duplicates_dropped=dropped,
+        )
         return df
 
-    def _filter(
-        self, 
-        segment: Optional[str], 
-        user_type: _UserType,
-        period: DateRange,
+    def _load_chunked(
+        self, csv_path: Path, chunk_rows: int, memory_limit_mb: Optional[float]
     ) -> DataFrame:
-        """Apply segment, user type, and date filters."""
-        df = self.data
-        
-        if segment:
-            df = df[df["segment"].str.casefold() == segment.casefold()]
-        
-        if user_type == "fte":
-            df = df[df["is_employee"] == True]
-        elif user_type == "contractor":
-            df = df[df["is_employee"] == False]
-        
-        if period.start is not None:
-            df = df[df["month"] >= period.start]
-        if period.end is not None:
-            df = df[df["month"] <= period.end]
-        
+        """Stream the CSV ``chunk_rows`` at a time, keeping only typed chunks in memory.
+
+        Only one raw (all-text) chunk is alive at any time; each is cleaned and
+        typed before the next is read. When ``memory_limit_mb`` is set the load
+        is aborted as soon as the typed chunks exceed that ceiling.
+        """
+        limit_bytes = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        pieces: list[DataFrame] = []
+        held_bytes = 0
+        reader = pd.read_csv(csv_path, dtype=str, keep_default_na=False, chunksize=chunk_rows)
+        with reader:
+            for raw in reader:
+                typed = self._normalise(raw)
+                del raw
+                held_bytes += int(typed.memory_usage(deep=True).sum())
+                if limit_bytes is not None and held_bytes > limit_bytes:
+                    raise PremiumRequestsConfigError(
+                        f"Premium requests data exceeds the {memory_limit_mb:,.0f} MB memory ceiling "
+                        f"after {sum(len(piece) for piece in pieces) + len(typed):,} rows."
+                    )
+                pieces.append(typed)
+        if pieces:
+            df = _concat_typed(pieces)
+        else:
+            df = self._normalise(pd.read_csv(csv_path, dtype=str, keep_default_na=False))
+        # Overlapping exports can repeat a row in any chunk, so duplicates go after concatenation.
+        df, dropped = _drop_superseded(df)
+        self.load_stats = LoadStats(
+            rows=len(df),
+            chunks=len(pieces),
+            frame_bytes=int(df.memory_usage(deep=True).sum()),
+            peak_rss_bytes=_peak_rss_bytes(),
+            duplicates_dropped=dropped,
+        )
         return df
 
+    def _normalise(self, df: DataFrame) -> DataFrame:
+        """Clean and type raw premium request rows read as text, advancing ``watermark``."""
+        typed = _clean_rows(df)
+        latest = typed[_COLLECTED].max()
+        if pd.notna(latest) and (self.watermark is None or latest > self.watermark):
+            self.watermark = latest
+        return typed
+
+    def _build_derived(self) -> None:
+        """Sort ``self.data`` by month and build the query structures derived from it."""
+        self.data = sort_by_month(self.data)
+        self.cube = RequestCube.build(self.data)
+        self.user_months = UserMonthTable.build(self.data)
+        self.sketches = UserSketches.build(self.data)
+        self.store: PremiumRequestsStore = FramePremiumStore(self.cube, self.user_months, self.sketches)
+
+    def memory_usage(self) -> dict[str, int]:
+        """Return the in-memory size of each retained column in bytes."""
+        usage = self.data.memory_usage(deep=True, index=False)
+        return {str(column): int(size) for column, size in usage.items()}
+
+    def memory_report(self) -> str:
+        """Describe per-column dtype and memory use of the loaded frame."""
+        usage = self.memory_usage()
+        total = sum(usage.values())
+        lines = [f"Premium requests frame: {len(self.data):,} rows, {_format_bytes(total)}"]
+        for column, size in sorted(usage.items(), key=lambda item: item[1], reverse=True):
+            lines.append(f"- {column} ({self.data[column].dtype}): {_format_bytes(size)}")
+        return "\n".join(lines)
+
+    def _scope(self, segment: Optional[str], user_type: _UserType, period: DateRange) -> Scope:
+        """Segment, user type, and date filters as a store query scope."""
+        employee = {"fte": True, "contractor": False}.get(user_type)
+        return Scope(segment or None, employee, period.start, period.end)
+
     def _normalize_range(
         self, start_month: Optional[str], end_month: Optional[str]
     ) -> DateRange:
@@ -370,6 +840,10 @@ class PremiumRequestsAnalytics:
             parts.append("contractors")
         return " ".join(parts) if parts else "all users"
 
+    def _format_estimate(self, value: float) -> str:
+        """Format a HyperLogLog estimate with its relative standard error."""
+        return f"~{value:,.0f} (±{self.store.relative_error:.1%})"
+
     def _user_type_label(self, user_type: _UserType) -> str:
         """Generate user type label."""
         if user_type == "fte":
@@ -380,6 +854,8 @@ class PremiumRequestsAnalytics:
 
 
 __all__ = [
+    "LoadStats",
+    "iter_clean_chunks",
     "PremiumRequestsAnalytics",
     "PremiumRequestsConfigError",
 ]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 import os
 from pathlib import Path
 from typing import Optional
@@ -7,29 +8,152 @@ from typing import Optional
 from dotenv import load_dotenv
 
 from .premium_requests import PremiumRequestsAnalytics, PremiumRequestsConfigError
+from .partitions import PartitionedPremiumStore, shared_partition_cache
+from .shared_frames import attach_frame, export_frame
+from .snapshot_cache import read_snapshot, source_fingerprint, source_version, write_snapshot
+from .sqlite_backend import SqliteDatabase, SqlitePremiumStore
+from .storage_backend import sqlite_path, storage_backend
 
 load_dotenv()
 
 _PREMIUM_ENV = "COPILOT_PREMIUM_REQUESTS_CSV"
 _PREMIUM_DEFAULT = Path("data/copilot/premium_requests_db.csv")
+_CHUNK_ROWS_ENV = "COPILOT_PREMIUM_CHUNK_ROWS"
+_MEMORY_LIMIT_ENV = "COPILOT_PREMIUM_MEMORY_LIMIT_MB"
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_DATASET = "premium_requests"
+# Bump whenever the cleaned frame layout produced by ``_load`` changes.
+_SNAPSHOT_SCHEMA = "4"
 
 _PREMIUM_ANALYTICS: Optional[PremiumRequestsAnalytics] = None
 _PREMIUM_ERROR: Optional[Exception] = None
 
 
 def _resolve_path() -> Path:
+    if _use_sqlite():
+        return sqlite_path()
     env_value = os.getenv(_PREMIUM_ENV)
     if env_value:
         return Path(env_value).expanduser().resolve()
     return _PREMIUM_DEFAULT.resolve()
 
 
+def _streaming_options() -> tuple[Optional[int], Optional[float]]:
+    """Chunk size and memory ceiling for streaming ingest (both optional)."""
+    chunk_rows = os.getenv(_CHUNK_ROWS_ENV)
+    memory_limit = os.getenv(_MEMORY_LIMIT_ENV)
+    try:
+        return (
+            int(chunk_rows) if chunk_rows else None,
+            float(memory_limit) if memory_limit else None,
+        )
+    except ValueError as exc:
+        raise PremiumRequestsConfigError(
+            f"{_CHUNK_ROWS_ENV} and {_MEMORY_LIMIT_ENV} must be numeric"
+        ) from exc
+
+
+def _use_sqlite() -> bool:
+    try:
+        return storage_backend() == "sqlite"
+    except ValueError as exc:
+        raise PremiumRequestsConfigError(str(exc)) from exc
+
+
+def _load_analytics(csv_path: Path) -> PremiumRequestsAnalytics:
+    """Attach to data shared by a parent process, else use the snapshot, else parse the CSV.
+
+    With the SQLite backend ``csv_path`` is the database and queries run there.
+    A directory is read as month partitions, each loaded when a query needs it.
+    """
+    if _use_sqlite():
+        return _load_from_sqlite(csv_path)
+    if csv_path.is_dir():
+        return _load_partitioned(csv_path)
+    if csv_path.exists():
+        # Marked before reading: rows appended meanwhile are read again by ``refresh`` rather than missed.
+        marked = PremiumRequestsAnalytics.mark_source(csv_path)
+        shared = attach_frame(_SNAPSHOT_DATASET, _shared_version(csv_path))
+        if shared is not None:
+            return PremiumRequestsAnalytics.from_frame(csv_path, shared, marked)
+        snapshot = read_snapshot(csv_path, _SNAPSHOT_DATASET, _SNAPSHOT_SCHEMA)
+        if snapshot is not None:
+            return PremiumRequestsAnalytics.from_frame(csv_path, snapshot, marked)
+    chunk_rows, memory_limit_mb = _streaming_options()
+    # Taken before parsing, so a snapshot of a file changed mid-load never matches it.
+    fingerprint = source_fingerprint(csv_path)
+    analytics = PremiumRequestsAnalytics(
+        csv_path, chunk_rows=chunk_rows, memory_limit_mb=memory_limit_mb
+    )
+    if analytics.load_stats is not None:
+        logger.info("Loaded premium requests from %s: %s", csv_path, analytics.load_stats.description())
+    write_snapshot(csv_path, _SNAPSHOT_DATASET, _SNAPSHOT_SCHEMA, analytics.data, fingerprint)
+    return analytics
+
+
+def _load_from_sqlite(database_path: Path) -> PremiumRequestsAnalytics:
+    try:
+        store = SqlitePremiumStore(SqliteDatabase(database_path))
+    except (FileNotFoundError, ValueError) as exc:
+        raise PremiumRequestsConfigError(
+            f"{exc}. Set COPILOT_SQLITE_PATH or import the exports with python -m services.sqlite_backend."
+        ) from exc
+    return PremiumRequestsAnalytics.from_store(database_path, store)
+
+
+def _load_partitioned(directory: Path) -> PremiumRequestsAnalytics:
+    try:
+        store = PartitionedPremiumStore(directory, shared_partition_cache())
+    except ValueError as exc:
+        raise PremiumRequestsConfigError(str(exc)) from exc
+    return PremiumRequestsAnalytics.from_store(directory, store)
+
+
+def resolve_premium_requests_path() -> Path:
+    """Source the loader reads: the configured CSV or partition directory, or the default."""
+    return _resolve_path()
+
+
+def load_premium_requests_analytics(csv_path: Path) -> PremiumRequestsAnalytics:
+    """Build a fresh analytics object for ``csv_path`` without touching the cached singleton."""
+    return _load_analytics(csv_path)
+
+
+def refresh_premium_requests_analytics(
+    analytics: PremiumRequestsAnalytics,
+) -> Optional[PremiumRequestsAnalytics]:
+    """Merge rows added to the source since ``analytics`` was loaded; ``None`` if a full reload is needed."""
+    # Taken before reading the new rows, so a snapshot of a file changed meanwhile never matches it.
+    fingerprint = source_fingerprint(analytics.csv_path) if analytics.data is not None else None
+    refreshed = analytics.refresh()
+    if refreshed is not None and refreshed is not analytics:
+        logger.info("Merged new premium request rows from %s: %s", analytics.csv_path, refreshed.load_stats.description())
+        write_snapshot(analytics.csv_path, _SNAPSHOT_DATASET, _SNAPSHOT_SCHEMA, refreshed.data, fingerprint)
+    return refreshed
+
+
+def _shared_version(csv_path: Path) -> str:
+    return f"{_SNAPSHOT_SCHEMA}-{source_version(csv_path)}"
+
+
+def export_shared(analytics: PremiumRequestsAnalytics, directory: Path) -> Optional[Path]:
+    """Export the loaded premium requests frame for worker processes to attach to.
+
+    Returns ``None`` for analytics backed by a database, which workers open themselves.
+    """
+    if analytics.data is None:
+        return None
+    return export_frame(analytics.data, _SNAPSHOT_DATASET, _shared_version(analytics.csv_path), directory)
+
+
 def get_premium_requests_analytics() -> PremiumRequestsAnalytics:
     global _PREMIUM_ANALYTICS, _PREMIUM_ERROR
     if _PREMIUM_ANALYTICS is None and _PREMIUM_ERROR is None:
         csv_path = _resolve_path()
         try:
-            _PREMIUM_ANALYTICS = PremiumRequestsAnalytics(csv_path)
+            _PREMIUM_ANALYTICS = _load_analytics(csv_path)
         except Exception as exc:  # pragma: no cover - configuration stage
             _PREMIUM_ERROR = exc
             raise
@@ -47,6 +171,10 @@ def get_premium_requests_analytics_safe() -> tuple[Optional[PremiumRequestsAnaly
 
 
 __all__ = [
+    "export_shared",
+    "load_premium_requests_analytics",
+    "refresh_premium_requests_analytics",
+    "resolve_premium_requests_path",
     "get_premium_requests_analytics",
     "get_premium_requests_analytics_safe",
     "PremiumRequestsAnalytics",
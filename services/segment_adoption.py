@@ -2,11 +2,17 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal, Optional
+from typing import Iterable, Literal, Optional
 
 import pandas as pd
 from pandas import DataFrame
 
+from .csv_cleaning import clean_frame, normalise_headers, parse_dates, to_number
+from .month_index import sort_by_month
+from .predicate_index import PredicateIndex
+from .snapshot_cache import source_version
+from .storage_backend import FrameSegmentStore, Scope, SegmentAdoptionStore
+
 class AnalyticsConfigError(RuntimeError):
     """Raised when required analytics inputs are missing or malformed."""
 
@@ -29,6 +35,8 @@ class DateRange:
             return f"up to {self.end.strftime('%Y-%m')}"
         return "all available months"
 
+_MONTH_FORMAT = "%Y-%m"
+
 _SegmentMetric = Literal[
     "fte_adoption",
     "non_fte_adoption",
@@ -41,19 +49,6 @@ class SegmentAdoptionConfigError(AnalyticsConfigError):
     """Raised when the segment adoption dataset cannot be loaded."""
 
 
-def _clean_cell(value: object) -> object:
-    if not isinstance(value, str):
-        return value
-    cleaned = value.replace("\u00a0", " ").strip().strip("\"")
-    cleaned = cleaned.replace(",", "")
-    cleaned = cleaned.replace("%", "")
-    cleaned = cleaned.replace("-", "") if cleaned.replace("-", "").strip() == "" else cleaned
-    cleaned = cleaned.strip()
-    if cleaned in {"", "NA", "N/A", "None"}:
-        return pd.NA
-    return cleaned
-
-
 def _safe_percentage(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
     result = (numerator / denominator * 100).where((denominator > 0) & numerator.notna())
     return result.astype(float)
@@ -115,10 +110,39 @@ class SegmentAdoptionAnalytics:
                 f"Segment adoption CSV not found at {csv_path}. Set COPILOT_SEGMENT_ADOPTION_CSV."
             )
         self.csv_path = csv_path
-        self.data = self._load(csv_path)
+        self.version = source_version(csv_path)
+        self.data = sort_by_month(self._load(csv_path))
+        self.index = PredicateIndex(self.data, employee_column=None)
+        self.store: SegmentAdoptionStore = FrameSegmentStore(self.data, self.index)
+
+    @classmethod
+    def from_frame(cls, csv_path: Path, data: DataFrame) -> "SegmentAdoptionAnalytics":
+        """Build analytics from an already cleaned frame (e.g. a snapshot)."""
+        analytics = cls.__new__(cls)
+        analytics.csv_path = csv_path
+        analytics.version = source_version(csv_path)
+        analytics.data = sort_by_month(data)
+        analytics.index = PredicateIndex(analytics.data, employee_column=None)
+        analytics.store = FrameSegmentStore(analytics.data, analytics.index)
+        return analytics
+
+    @classmethod
+    def from_raw(cls, source_path: Path, raws: Iterable[DataFrame]) -> "SegmentAdoptionAnalytics":
+        """Build analytics from raw text frames in the export layout (e.g. the files of one partition)."""
+        return cls.from_frame(source_path, pd.concat([cls._clean(raw) for raw in raws], ignore_index=True))
+
+    @classmethod
+    def from_store(cls, source_path: Path, store: SegmentAdoptionStore) -> "SegmentAdoptionAnalytics":
+        """Build analytics that query ``store`` (e.g. the SQLite backend) instead of a frame."""
+        analytics = cls.__new__(cls)
+        analytics.csv_path = source_path
+        analytics.version = source_version(source_path)
+        analytics.data = None
+        analytics.store = store
+        return analytics
 
     def available_segments(self) -> list[str]:
-        return sorted(self.data["segment"].dropna().unique().tolist())
+        return self.store.segments()
 
     def summary(
         self,
@@ -205,10 +229,10 @@ class SegmentAdoptionAnalytics:
     ) -> str:
         if month:
             target_month = self._parse_month(month)
-            scoped = self.data[self.data["month"] == target_month]
+            scoped = self.store.rows(Scope(start=target_month, end=target_month))
             period_label = target_month.strftime("%Y-%m") if target_month else month
         else:
-            scoped = self.data.copy()
+            scoped = self.store.rows(Scope())
             period_label = "all available months"
         if scoped.empty:
             return "No segment adoption data available for the requested period."
@@ -253,9 +277,13 @@ class SegmentAdoptionAnalytics:
         return "\n".join(lines)
 
     def _load(self, csv_path: Path) -> DataFrame:
-        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
-        df = df.applymap(_clean_cell)
-        df.columns = [col.strip().lower().replace(" ", "_") for col in df.columns]
+        return self._clean(pd.read_csv(csv_path, dtype=str, keep_default_na=False))
+
+    @staticmethod
+    def _clean(df: DataFrame) -> DataFrame:
+        """Clean and type raw segment adoption rows read as text."""
+        df = clean_frame(df, strip_percent=True, blank_dashes=True)
+        df.columns = normalise_headers(df.columns)
         rename_map = {
             "month": "month",
             "segment": "segment",
@@ -274,7 +302,7 @@ class SegmentAdoptionAnalytics:
                 "Segment adoption CSV missing required columns: " + ", ".join(sorted(missing))
             )
 
-        df["month"] = pd.to_datetime(df["month"], errors="coerce").dt.to_period("M")
+        df["month"] = parse_dates(df["month"], _MONTH_FORMAT).dt.to_period("M")
         df.dropna(subset=["month", "segment"], inplace=True)
 
         numeric_columns = [
@@ -287,10 +315,10 @@ class SegmentAdoptionAnalytics:
         ]
         for column in numeric_columns:
             if column in df.columns:
-                df[column] = pd.to_numeric(df[column], errors="coerce")
+                df[column] = to_number(df[column])
 
-        df["active_non_fte"].fillna(0, inplace=True)
-        df["seats_non_fte"].fillna(0, inplace=True)
+        df["active_non_fte"] = df["active_non_fte"].fillna(0)
+        df["seats_non_fte"] = df["seats_non_fte"].fillna(0)
 
         df["fte_utilisation_pct"] = _safe_percentage(df["active_fte"], df["seats_fte"])
         df["non_fte_utilisation_pct"] = _safe_percentage(
@@ -305,14 +333,7 @@ class SegmentAdoptionAnalytics:
         return df
 
     def _filter(self, segment: Optional[str], period: DateRange) -> DataFrame:
-        df = self.data
-        if segment:
-            df = df[df["segment"].str.casefold() == segment.casefold()]
-        if period.start is not None:
-            df = df[df["month"] >= period.start]
-        if period.end is not None:
-            df = df[df["month"] <= period.end]
-        return df
+        return self.store.rows(Scope(segment or None, None, period.start, period.end))
 
     def _group_monthly(self, scoped: DataFrame) -> DataFrame:
         grouped = scoped.groupby("month").agg(
@@ -7,29 +7,113 @@ from typing import Optional
 from dotenv import load_dotenv
 
 from .segment_adoption import SegmentAdoptionAnalytics, SegmentAdoptionConfigError
+from .partitions import PartitionedSegmentStore, shared_partition_cache
+from .shared_frames import attach_frame, export_frame
+from .snapshot_cache import read_snapshot, source_fingerprint, source_version, write_snapshot
+from .sqlite_backend import SqliteDatabase, SqliteSegmentStore
+from .storage_backend import sqlite_path, storage_backend
 
 load_dotenv()
 
 _SEGMENT_ENV = "COPILOT_SEGMENT_ADOPTION_CSV"
 _SEGMENT_DEFAULT = Path("data/copilot/segment_adoption.csv")
 
+_SNAPSHOT_DATASET = "segment_adoption"
+# Bump whenever the cleaned frame layout produced by ``_load`` changes.
+_SNAPSHOT_SCHEMA = "2"
+
 _SEGMENT_ANALYTICS: Optional[SegmentAdoptionAnalytics] = None
 _SEGMENT_ERROR: Optional[Exception] = None
 
 
 def _resolve_path() -> Path:
+    if _use_sqlite():
+        return sqlite_path()
     env_value = os.getenv(_SEGMENT_ENV)
     if env_value:
         return Path(env_value).expanduser().resolve()
     return _SEGMENT_DEFAULT.resolve()
 
 
+def _use_sqlite() -> bool:
+    try:
+        return storage_backend() == "sqlite"
+    except ValueError as exc:
+        raise SegmentAdoptionConfigError(str(exc)) from exc
+
+
+def _load_analytics(csv_path: Path) -> SegmentAdoptionAnalytics:
+    """Attach to data shared by a parent process, else use the snapshot, else parse the CSV.
+
+    With the SQLite backend ``csv_path`` is the database and queries run there.
+    A directory is read as month partitions, each loaded when a query needs it.
+    """
+    if _use_sqlite():
+        return _load_from_sqlite(csv_path)
+    if csv_path.is_dir():
+        return _load_partitioned(csv_path)
+    if csv_path.exists():
+        shared = attach_frame(_SNAPSHOT_DATASET, _shared_version(csv_path))
+        if shared is not None:
+            return SegmentAdoptionAnalytics.from_frame(csv_path, shared)
+    snapshot = read_snapshot(csv_path, _SNAPSHOT_DATASET, _SNAPSHOT_SCHEMA) if csv_path.exists() else None
+    if snapshot is not None:
+        return SegmentAdoptionAnalytics.from_frame(csv_path, snapshot)
+    # Taken before parsing, so a snapshot of a file changed mid-load never matches it.
+    fingerprint = source_fingerprint(csv_path)
+    analytics = SegmentAdoptionAnalytics(csv_path)
+    write_snapshot(csv_path, _SNAPSHOT_DATASET, _SNAPSHOT_SCHEMA, analytics.data, fingerprint)
+    return analytics
+
+
+def _load_from_sqlite(database_path: Path) -> SegmentAdoptionAnalytics:
+    try:
+        store = SqliteSegmentStore(SqliteDatabase(database_path))
+    except (FileNotFoundError, ValueError) as exc:
+        raise SegmentAdoptionConfigError(
+            f"{exc}. Set COPILOT_SQLITE_PATH or import the exports with python -m services.sqlite_backend."
+        ) from exc
+    return SegmentAdoptionAnalytics.from_store(database_path, store)
+
+
+def _load_partitioned(directory: Path) -> SegmentAdoptionAnalytics:
+    try:
+        store = PartitionedSegmentStore(directory, shared_partition_cache())
+    except ValueError as exc:
+        raise SegmentAdoptionConfigError(str(exc)) from exc
+    return SegmentAdoptionAnalytics.from_store(directory, store)
+
+
+def resolve_segment_adoption_path() -> Path:
+    """Source the loader reads: the configured CSV or partition directory, or the default."""
+    return _resolve_path()
+
+
+def load_segment_adoption_analytics(csv_path: Path) -> SegmentAdoptionAnalytics:
+    """Build a fresh analytics object for ``csv_path`` without touching the cached singleton."""
+    return _load_analytics(csv_path)
+
+
+def _shared_version(csv_path: Path) -> str:
+    return f"{_SNAPSHOT_SCHEMA}-{source_version(csv_path)}"
+
+
+def export_shared(analytics: SegmentAdoptionAnalytics, directory: Path) -> Optional[Path]:
+    """Export the loaded segment adoption frame for worker processes to attach to.
+
+    Returns ``None`` for analytics backed by a database, which workers open themselves.
+    """
+    if analytics.data is None:
+        return None
+    return export_frame(analytics.data, _SNAPSHOT_DATASET, _shared_version(analytics.csv_path), directory)
+
+
 def get_segment_adoption_analytics() -> SegmentAdoptionAnalytics:
     global _SEGMENT_ANALYTICS, _SEGMENT_ERROR
     if _SEGMENT_ANALYTICS is None and _SEGMENT_ERROR is None:
         csv_path = _resolve_path()
         try:
-            _SEGMENT_ANALYTICS = SegmentAdoptionAnalytics(csv_path)
+            _SEGMENT_ANALYTICS = _load_analytics(csv_path)
         except Exception as exc:  # pragma: no cover - configuration stage
             _SEGMENT_ERROR = exc
             raise
@@ -47,6 +131,9 @@ def get_segment_adoption_analytics_safe() -> tuple[Optional[SegmentAdoptionAnaly
 
 
 __all__ = [
+    "export_shared",
+    "load_segment_adoption_analytics",
+    "resolve_segment_adoption_path",
     "get_segment_adoption_analytics",
     "get_segment_adoption_analytics_safe",
     "SegmentAdoptionAnalytics",
@@ -0,0 +1,127 @@
+"""Memory-mapped column files shared by several server processes.
+
+A multi-worker deployment loads each dataset once in the parent process and
+exports the typed frame with ``export_frame``: one ``.npy`` file per column
+(categorical codes, period ordinals and plain numeric arrays) plus a JSON
+manifest holding the category labels. Workers call ``attach_frame`` to map
+those files read-only, so every process shares the same page-cache copy of
+the data instead of parsing and holding its own.
+
+Only the small derived structures (cube, sketches, indexes) are rebuilt per
+worker.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+_SHARED_DIR_ENV = "COPILOT_SHARED_DATA_DIR"
+_MANIFEST = "manifest.json"
+
+
+def shared_data_dir() -> Optional[Path]:
+    """Directory the parent exported datasets to, taken from COPILOT_SHARED_DATA_DIR."""
+    configured = os.getenv(_SHARED_DIR_ENV)
+    return Path(configured).expanduser() if configured else None
+
+
+def prepare_shared_data_dir() -> Path:
+    """Return the shared directory, creating a temporary one (and exporting its path) if unset."""
+    directory = shared_data_dir()
+    if directory is None:
+        directory = Path(tempfile.mkdtemp(prefix="copilot-shared-"))
+        os.environ[_SHARED_DIR_ENV] = str(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def export_frame(frame: DataFrame, dataset: str, version: str, directory: Path) -> Path:
+    """Write ``frame`` as memory-mappable column files under ``directory/dataset``."""
+    target = directory / dataset
+    staging = directory / f".{dataset}.{os.getpid()}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    columns = []
+    for position, name in enumerate(frame.columns):
+        series = frame[name]
+        entry: dict = {"name": name, "file": f"{position}.npy"}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            entry["kind"] = "category"
+            entry["categories"] = series.cat.categories.tolist()
+            entry["dtype"] = str(series.cat.categories.dtype)
+            values = series.cat.codes.to_numpy()
+        elif isinstance(series.dtype, pd.PeriodDtype):
+            entry["kind"] = "period"
+            entry["dtype"] = str(series.dtype)
+            values = np.asarray(series.array.asi8)
+        elif series.dtype.kind in "biufM" and not isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+            entry["kind"] = "numpy"
+            values = series.to_numpy()
+        else:
+            # Text and other extension columns are stored as codes and rebuilt
+            # with their original dtype (a copy, so keep them to small frames).
+            entry["kind"] = "labels"
+            entry["dtype"] = str(series.dtype)
+            codes, labels = pd.factorize(series)
+            entry["categories"] = [str(label) for label in labels]
+            values = codes
+        np.save(staging / entry["file"], values, allow_pickle=False)
+        columns.append(entry)
+    manifest = {"dataset": dataset, "version": version, "rows": len(frame), "columns": columns}
+    (staging / _MANIFEST).write_text(json.dumps(manifest))
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+    return target
+
+
+def attach_frame(dataset: str, version: str, directory: Optional[Path] = None) -> Optional[DataFrame]:
+    """Map an exported dataset read-only, or return ``None`` when absent or for another version."""
+    directory = directory if directory is not None else shared_data_dir()
+    if directory is None:
+        return None
+    source = directory / dataset
+    manifest_path = source / _MANIFEST
+    if not manifest_path.exists():
+        return None
+    try:
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("version") != version:
+            logger.info("Shared %s data is for version %s, not %s", dataset, manifest.get("version"), version)
+            return None
+        columns = {}
+        for entry in manifest["columns"]:
+            # A plain ndarray view of the read-only map, so derived arrays are not memmaps.
+            values = np.load(source / entry["file"], mmap_mode="r", allow_pickle=False).view(np.ndarray)
+            columns[entry["name"]] = _column(entry, values)
+        return DataFrame(columns, copy=False)
+    except Exception as exc:  # pragma: no cover - partial or corrupt export
+        logger.warning("Ignoring unreadable shared dataset %s: %s", source, exc)
+        return None
+
+
+def _column(entry: dict, values: np.ndarray) -> pd.Series:
+    kind = entry["kind"]
+    if kind == "category":
+        categories = pd.Index(entry["categories"], dtype=entry["dtype"])
+        return pd.Series(pd.Categorical.from_codes(values, categories=categories, validate=False), copy=False)
+    if kind == "period":
+        return pd.Series(pd.arrays.PeriodArray(values, dtype=pd.api.types.pandas_dtype(entry["dtype"])), copy=False)
+    if kind == "numpy":
+        return pd.Series(values, copy=False)
+    labels = pd.Categorical.from_codes(np.asarray(values), categories=pd.Index(entry["categories"], dtype=object))
+    return pd.Series(labels).astype(entry["dtype"])
+
+
+__all__ = ["attach_frame", "export_frame", "prepare_shared_data_dir", "shared_data_dir"]
@@ -0,0 +1,184 @@
+"""Typed columnar snapshots of cleaned analytics frames.
+
+Parsing and cleaning a large CSV export dominates server start-up. After the
+first clean load the loaders persist the typed frame as an uncompressed Arrow
+IPC (Feather v2) file next to the export; later starts memory-map that file
+instead of re-parsing the CSV.
+
+A snapshot is only reused when it was written from the same source file. The
+key recorded with every snapshot is the source's size, modification time and
+SHA-256 digest, plus the loader's schema version. Size and mtime are checked
+first; the digest is only recomputed when they differ, so a merely touched file
+keeps its snapshot while any content change forces a rebuild.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from pandas import DataFrame
+
+try:  # pragma: no cover - exercised implicitly when pyarrow is installed
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pa_ipc = None
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_DIR_ENV = "COPILOT_SNAPSHOT_DIR"
+_SNAPSHOT_DISABLE_ENV = "COPILOT_DISABLE_SNAPSHOTS"
+_METADATA_KEY = b"copilot_snapshot"
+_HASH_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class SourceFingerprint:
+    """Identity of a source export at the time a snapshot was written."""
+
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    @classmethod
+    def of(cls, path: Path) -> "SourceFingerprint":
+        stat = path.stat()
+        return cls(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=file_digest(path))
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of ``path``."""
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_version(path: Path) -> str:
+    """Cheap identifier of a source's current contents (size and mtime).
+
+    For a directory (a partitioned dataset) it covers every visible file below
+    it, so adding, rewriting or removing any of them changes the version.
+    """
+    if path.is_dir():
+        digest = hashlib.sha256()
+        for file in _visible_files(path):
+            stat = file.stat()
+            digest.update(f"{file.relative_to(path)}:{stat.st_size:x}-{stat.st_mtime_ns:x}\n".encode())
+        return digest.hexdigest()[:16]
+    stat = path.stat()
+    return f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+
+def _visible_files(directory: Path) -> list[Path]:
+    """Files below ``directory`` in sorted order, skipping hidden files and directories (e.g. ``.snapshots``)."""
+    found = []
+    for root, directories, files in os.walk(directory):
+        directories[:] = sorted(name for name in directories if not name.startswith("."))
+        found.extend(Path(root) / name for name in sorted(files) if not name.startswith("."))
+    return found
+
+
+def snapshots_enabled() -> bool:
+    """Snapshots need pyarrow and can be switched off with COPILOT_DISABLE_SNAPSHOTS."""
+    if pa is None:
+        return False
+    return os.getenv(_SNAPSHOT_DISABLE_ENV, "").strip().lower() not in {"1", "true", "yes"}
+
+
+def snapshot_path(source: Path, dataset: str) -> Path:
+    """Location of the snapshot for ``source`` (COPILOT_SNAPSHOT_DIR or ``<source dir>/.snapshots``)."""
+    configured = os.getenv(_SNAPSHOT_DIR_ENV)
+    directory = Path(configured).expanduser() if configured else source.parent / ".snapshots"
+    return directory / f"{dataset}-{source.stem}.arrow"
+
+
+def read_snapshot(source: Path, dataset: str, schema_version: str) -> Optional[DataFrame]:
+    """Return the memory-mapped snapshot for ``source`` or ``None`` when absent or stale.
+
+    Numeric columns without nulls stay zero-copy views onto the mapped file.
+    String, categorical and nullable columns are converted into pandas memory,
+    each Arrow buffer being released as soon as its column is converted.
+    """
+    if not snapshots_enabled():
+        return None
+    target = snapshot_path(source, dataset)
+    if not target.exists():
+        return None
+    try:
+        reader = pa_ipc.open_file(pa.memory_map(str(target), "r"))
+        recorded = json.loads((reader.schema.metadata or {}).get(_METADATA_KEY, b"{}"))
+        if recorded.get("schema_version") != schema_version:
+            return None
+        if not _matches_source(source, recorded.get("source") or {}):
+            return None
+        return reader.read_all().to_pandas(self_destruct=True, split_blocks=True)
+    except Exception as exc:  # pragma: no cover - corrupt snapshot, rebuild from CSV
+        logger.warning("Ignoring unreadable snapshot %s: %s", target, exc)
+        return None
+
+
+def source_fingerprint(source: Path) -> Optional[SourceFingerprint]:
+    """Fingerprint for ``write_snapshot``; ``None`` when snapshots are off or ``source`` is missing.
+
+    Take it before reading the source: a source changed during the load then
+    no longer matches it, so the snapshot written from that load is never reused.
+    """
+    if not snapshots_enabled() or not source.is_file():
+        return None
+    return SourceFingerprint.of(source)
+
+
+def write_snapshot(
+    source: Path, dataset: str, schema_version: str, frame: DataFrame, fingerprint: Optional[SourceFingerprint]
+) -> Optional[Path]:
+    """Persist ``frame`` as the snapshot for ``source`` read at ``fingerprint``; failures only log a warning."""
+    if not snapshots_enabled() or fingerprint is None:
+        return None
+    target = snapshot_path(source, dataset)
+    try:
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_METADATA_KEY] = json.dumps(
+            {"schema_version": schema_version, "source": asdict(fingerprint)}
+        ).encode()
+        table = table.replace_schema_metadata(metadata)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = target.with_suffix(f".{os.getpid()}.tmp")
+        with pa.OSFile(str(staging), "wb") as sink:
+            with pa_ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(staging, target)
+        return target
+    except Exception as exc:  # pragma: no cover - read-only data directories
+        logger.warning("Unable to write snapshot %s: %s", target, exc)
+        return None
+
+
+def _matches_source(source: Path, recorded: dict) -> bool:
+    stat = source.stat()
+    if stat.st_size != recorded.get("size"):
+        return False
+    if stat.st_mtime_ns == recorded.get("mtime_ns"):
+        return True
+    return file_digest(source) == recorded.get("sha256")
+
+
+__all__ = [
+    "SourceFingerprint",
+    "file_digest",
+    "read_snapshot",
+    "snapshot_path",
+    "snapshots_enabled",
+    "source_fingerprint",
+    "source_version",
+    "write_snapshot",
+]
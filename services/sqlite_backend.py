@@ -0,0 +1,337 @@
+"""SQLite storage backend with filters and GROUP BYs pushed down into SQL.
+
+The premium request rows live in an indexed ``premium_requests`` table, so a
+query reads only the rows of its segment / FTE flag / month range through
+the ``(segment_key, is_employee, month)`` index and returns cube cells that
+are already grouped. Distinct users are counted with ``COUNT(DISTINCT)`` in
+the database. Only those small results reach pandas, where the analytics
+classes format them exactly as they format the in-memory cube, so the data
+can be far larger than memory.
+
+Each thread gets its own read-only connection (``SqliteDatabase``), which the
+server's worker threads keep for their lifetime.
+
+Populate or update a database from the CSV exports with::
+
+    python -m services.sqlite_backend --database copilot.db \\
+        --premium-csv premium_requests_db.csv --segment-csv segment_adoption.csv
+
+Re-importing an export upserts its rows: per natural key the row with the
+latest collection_date is kept, as in the pandas load.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+from .premium_requests import iter_clean_chunks
+from .segment_adoption import SegmentAdoptionAnalytics
+from .storage_backend import PremiumRequestsStore, Scope, SegmentAdoptionStore
+
+logger = logging.getLogger(__name__)
+
+_PREMIUM_TABLE = "premium_requests"
+_SEGMENT_TABLE = "segment_adoption"
+_DEFAULT_CHUNK_ROWS = 200_000
+
+# Months are stored as YYYY-MM text, so text order is month order.
+_PREMIUM_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {_PREMIUM_TABLE} (
+    month TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    segment_key TEXT NOT NULL,
+    is_employee INTEGER NOT NULL,
+    enterprise TEXT NOT NULL,
+    model TEXT,
+    exceeds_quota INTEGER NOT NULL,
+    mfcgd_id TEXT,
+    quantity NUMERIC NOT NULL,
+    gross_amount REAL NOT NULL,
+    discount_amount REAL NOT NULL,
+    net_amount REAL NOT NULL,
+    row_key INTEGER NOT NULL UNIQUE,
+    collected INTEGER NOT NULL
+)
+"""
+_PREMIUM_INDEXES = (
+    f"CREATE INDEX IF NOT EXISTS {_PREMIUM_TABLE}_scope ON {_PREMIUM_TABLE} (segment_key, is_employee, month)",
+    f"CREATE INDEX IF NOT EXISTS {_PREMIUM_TABLE}_employee ON {_PREMIUM_TABLE} (is_employee, month)",
+    f"CREATE INDEX IF NOT EXISTS {_PREMIUM_TABLE}_month ON {_PREMIUM_TABLE} (month)",
+)
+_PREMIUM_COLUMNS = (
+    "month",
+    "segment",
+    "segment_key",
+    "is_employee",
+    "enterprise",
+    "model",
+    "exceeds_quota",
+    "mfcgd_id",
+    "quantity",
+    "gross_amount",
+    "discount_amount",
+    "net_amount",
+    "row_key",
+    "collected",
+)
+# Later collections replace earlier copies of a row; ties go to the row imported last.
+_PREMIUM_UPSERT = (
+    f"INSERT INTO {_PREMIUM_TABLE} ({', '.join(_PREMIUM_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _PREMIUM_COLUMNS)}) "
+    "ON CONFLICT(row_key) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in _PREMIUM_COLUMNS if column != "row_key")
+    + f" WHERE excluded.collected >= {_PREMIUM_TABLE}.collected"
+)
+_CELL_QUERY = f"""
+SELECT month, segment, is_employee, enterprise, model,
+       SUM(quantity) AS quantity,
+       SUM(gross_amount) AS gross_amount,
+       SUM(discount_amount) AS discount_amount,
+       SUM(net_amount) AS net_amount,
+       SUM(exceeds_quota) AS exceeding_rows
+FROM {_PREMIUM_TABLE}{{where}}
+GROUP BY month, segment, is_employee, enterprise, model
+ORDER BY month, segment, is_employee, enterprise, model
+"""
+_USER_GROUP_COLUMNS = {"month", "segment", "enterprise"}
+_DIMENSION_COLUMNS = {"segment", "enterprise", "model"}
+
+_SEGMENT_COLUMNS = (
+    "month",
+    "segment",
+    "active_fte",
+    "active_non_fte",
+    "seats_fte",
+    "seats_non_fte",
+    "billing_adoption_fte",
+    "billing_adoption_non_fte",
+    "fte_utilisation_pct",
+    "non_fte_utilisation_pct",
+)
+
+
+class SqliteDatabase:
+    """Read-only connections to one SQLite file, one per thread and reused by it."""
+
+    def __init__(self, path: Path) -> None:
+        if not path.exists():
+            raise FileNotFoundError(f"SQLite database not found at {path}")
+        self.path = path
+        self._uri = f"{path.resolve().as_uri()}?mode=ro"
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[sqlite3.Connection] = []
+
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def query(self, sql: str, params: Sequence[object] = ()) -> DataFrame:
+        return pd.read_sql_query(sql, self.connection(), params=list(params))
+
+    def has_table(self, name: str) -> bool:
+        found = self.connection().execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone()
+        return found is not None
+
+    def close(self) -> None:
+        """Close every thread's connection; later queries open new ones."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+
+class SqlitePremiumStore(PremiumRequestsStore):
+    """Premium request cells and distinct users computed by SQLite."""
+
+    def __init__(self, database: SqliteDatabase) -> None:
+        if not database.has_table(_PREMIUM_TABLE):
+            raise ValueError(f"{database.path} has no {_PREMIUM_TABLE} table; import the export first")
+        self.database = database
+
+    def cells(self, scope: Scope) -> DataFrame:
+        where, params = _where(scope, employee=True)
+        cells = self.database.query(_CELL_QUERY.format(where=where), params)
+        cells["month"] = _months(cells["month"])
+        cells["is_employee"] = cells["is_employee"].astype(bool)
+        return cells
+
+    def unique_users(self, scope: Scope) -> int:
+        where, params = _where(scope, employee=True)
+        sql = f"SELECT COUNT(DISTINCT mfcgd_id) FROM {_PREMIUM_TABLE}{where}"
+        return int(self.database.connection().execute(sql, params).fetchone()[0])
+
+    def unique_users_by(self, scope: Scope, column: str) -> Series:
+        if column not in _USER_GROUP_COLUMNS:
+            raise ValueError(f"Cannot count users by {column}")
+        where, params = _where(scope, employee=True)
+        counts = self.database.query(
+            f"SELECT {column}, COUNT(DISTINCT mfcgd_id) AS users FROM {_PREMIUM_TABLE}{where} GROUP BY {column}",
+            params,
+        )
+        labels = _months(counts[column]) if column == "month" else counts[column]
+        return Series(counts["users"].to_numpy(), index=pd.Index(labels), name=column)
+
+    def distinct(self, column: str) -> list[str]:
+        if column not in _DIMENSION_COLUMNS:
+            raise ValueError(f"{column} is not a dimension column")
+        rows = self.database.connection().execute(
+            f"SELECT DISTINCT {column} FROM {_PREMIUM_TABLE} WHERE {column} IS NOT NULL ORDER BY {column}"
+        )
+        return [value for (value,) in rows]
+
+
+class SqliteSegmentStore(SegmentAdoptionStore):
+    """Segment adoption rows filtered by SQLite."""
+
+    def __init__(self, database: SqliteDatabase) -> None:
+        if not database.has_table(_SEGMENT_TABLE):
+            raise ValueError(f"{database.path} has no {_SEGMENT_TABLE} table; import the export first")
+        self.database = database
+
+    def rows(self, scope: Scope) -> DataFrame:
+        where, params = _where(scope, employee=False)
+        rows = self.database.query(
+            f"SELECT {', '.join(_SEGMENT_COLUMNS)} FROM {_SEGMENT_TABLE}{where} ORDER BY month, rowid", params
+        )
+        rows["month"] = _months(rows["month"])
+        for column in _SEGMENT_COLUMNS[2:]:
+            rows[column] = pd.to_numeric(rows[column]).astype(float)
+        return rows
+
+    def segments(self) -> list[str]:
+        rows = self.database.connection().execute(
+            f"SELECT DISTINCT segment FROM {_SEGMENT_TABLE} ORDER BY segment"
+        )
+        return [value for (value,) in rows]
+
+
+def _where(scope: Scope, employee: bool) -> tuple[str, list[object]]:
+    """WHERE clause and parameters for ``scope`` (``employee`` False when the table has no FTE flag)."""
+    clauses: list[str] = []
+    params: list[object] = []
+    if scope.segment:
+        clauses.append("segment_key = ?")
+        params.append(scope.segment.casefold())
+    if employee and scope.employee is not None:
+        clauses.append("is_employee = ?")
+        params.append(int(scope.employee))
+    if scope.start is not None:
+        clauses.append("month >= ?")
+        params.append(scope.start.strftime("%Y-%m"))
+    if scope.end is not None:
+        clauses.append("month <= ?")
+        params.append(scope.end.strftime("%Y-%m"))
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def _months(values: Series) -> pd.Series:
+    return pd.Series(pd.PeriodIndex(values, freq="M"), index=values.index, name=values.name)
+
+
+def _text(series: Series) -> list[object]:
+    """Python values for a text column, with ``None`` for missing entries."""
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def import_premium_requests(csv_path: Path, database_path: Path, chunk_rows: int = _DEFAULT_CHUNK_ROWS) -> int:
+    """Upsert a premium requests export into ``database_path``; returns the table's row count.
+
+    The export is cleaned with the same rules as the pandas load, one chunk
+    at a time, so it never has to fit in memory.
+    """
+    connection = sqlite3.connect(database_path)
+    try:
+        connection.execute(_PREMIUM_SCHEMA)
+        imported = 0
+        for typed, collected in iter_clean_chunks(csv_path, chunk_rows):
+            segment = typed["segment"].astype(str)
+            columns = {
+                "month": typed["month"].dt.strftime("%Y-%m").tolist(),
+                "segment": segment.tolist(),
+                "segment_key": segment.str.casefold().tolist(),
+                "is_employee": typed["is_employee"].astype(int).tolist(),
+                "enterprise": _text(typed["enterprise"]),
+                "model": _text(typed["model"]),
+                "exceeds_quota": typed["exceeds_quota"].astype(int).tolist(),
+                "mfcgd_id": _text(typed["mfcgd_id"]),
+                "quantity": typed["quantity"].tolist(),
+                "gross_amount": typed["gross_amount"].astype(float).tolist(),
+                "discount_amount": typed["discount_amount"].astype(float).tolist(),
+                "net_amount": typed["net_amount"].astype(float).tolist(),
+                # SQLite integers are signed, so store the 64-bit key's bit pattern.
+                "row_key": typed["row_key"].to_numpy().view(np.int64).tolist(),
+                "collected": collected.tolist(),
+            }
+            with connection:
+                connection.executemany(_PREMIUM_UPSERT, zip(*(columns[name] for name in _PREMIUM_COLUMNS)))
+            imported += len(typed)
+        with connection:
+            for statement in _PREMIUM_INDEXES:
+                connection.execute(statement)
+            connection.execute(f"ANALYZE {_PREMIUM_TABLE}")
+        total = connection.execute(f"SELECT COUNT(*) FROM {_PREMIUM_TABLE}").fetchone()[0]
+    finally:
+        connection.close()
+    logger.info("Imported %s premium request rows from %s; table holds %s", f"{imported:,}", csv_path, f"{total:,}")
+    return int(total)
+
+
+def import_segment_adoption(csv_path: Path, database_path: Path) -> int:
+    """Replace the segment adoption table with a cleaned export; returns its row count."""
+    data = SegmentAdoptionAnalytics(csv_path).data
+    rows = DataFrame({column: data[column] for column in _SEGMENT_COLUMNS})
+    rows["month"] = rows["month"].dt.strftime("%Y-%m")
+    rows.insert(2, "segment_key", rows["segment"].astype(str).str.casefold())
+    connection = sqlite3.connect(database_path)
+    try:
+        with connection:
+            rows.to_sql(_SEGMENT_TABLE, connection, if_exists="replace", index=False)
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {_SEGMENT_TABLE}_scope ON {_SEGMENT_TABLE} (segment_key, month)"
+            )
+    finally:
+        connection.close()
+    logger.info("Imported %s segment adoption rows from %s", f"{len(rows):,}", csv_path)
+    return len(rows)
+
+
+__all__ = [
+    "SqliteDatabase",
+    "SqlitePremiumStore",
+    "SqliteSegmentStore",
+    "import_premium_requests",
+    "import_segment_adoption",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import the Copilot CSV exports into a SQLite database.")
+    parser.add_argument("--database", type=Path, required=True)
+    parser.add_argument("--premium-csv", type=Path)
+    parser.add_argument("--segment-csv", type=Path)
+    parser.add_argument("--chunk-rows", type=int, default=_DEFAULT_CHUNK_ROWS)
+    options = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if options.premium_csv:
+        import_premium_requests(options.premium_csv, options.database, options.chunk_rows)
+    if options.segment_csv:
+        import_segment_adoption(options.segment_csv, options.database)
@@ -0,0 +1,166 @@
+"""Storage backends the analytics classes read their aggregates from.
+
+``PremiumRequestsAnalytics`` and ``SegmentAdoptionAnalytics`` format reports
+from small, already filtered inputs: premium request cube cells and distinct
+user counts for one scope, or the segment adoption rows for one scope. A
+store produces those inputs. The frame stores answer from the typed pandas
+frames held in memory; ``services.sqlite_backend`` answers with SQL so the
+data can be larger than memory.
+
+``COPILOT_STORAGE_BACKEND`` selects the backend the loaders use: ``pandas``
+(the default, CSV exports) or ``sqlite`` (the database at
+``COPILOT_SQLITE_PATH``).
+"""
+
+from __future__ import annotations
+
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+from pandas import DataFrame, Series
+
+from .hyperloglog import UserSketches
+from .predicate_index import PredicateIndex
+from .premium_cube import RequestCube
+from .user_months import UserMonthTable
+
+_BACKEND_ENV = "COPILOT_STORAGE_BACKEND"
+_SQLITE_PATH_ENV = "COPILOT_SQLITE_PATH"
+_BACKENDS = {"pandas", "sqlite"}
+
+
+def storage_backend() -> str:
+    """Configured backend name, ``pandas`` unless COPILOT_STORAGE_BACKEND says otherwise."""
+    backend = (os.getenv(_BACKEND_ENV) or "pandas").strip().lower()
+    if backend not in _BACKENDS:
+        raise ValueError(f"{_BACKEND_ENV} must be one of: {', '.join(sorted(_BACKENDS))}")
+    return backend
+
+
+def sqlite_path() -> Path:
+    """Database file named by COPILOT_SQLITE_PATH."""
+    configured = os.getenv(_SQLITE_PATH_ENV)
+    if not configured:
+        raise ValueError(f"Set {_SQLITE_PATH_ENV} when {_BACKEND_ENV}=sqlite")
+    return Path(configured).expanduser().resolve()
+
+
+@dataclass(frozen=True)
+class Scope:
+    """Segment, FTE flag and inclusive month range a query is restricted to."""
+
+    segment: Optional[str] = None
+    employee: Optional[bool] = None
+    start: Optional[pd.Period] = None
+    end: Optional[pd.Period] = None
+
+
+class PremiumRequestsStore(ABC):
+    """Source of premium request cube cells and distinct user counts."""
+
+    # Relative standard error of ``estimate_users``; ``None`` when the store
+    # has no sketches and only answers exact counts.
+    relative_error: Optional[float] = None
+
+    @abstractmethod
+    def cells(self, scope: Scope) -> DataFrame:
+        """Cube cells (``CUBE_DIMENSIONS`` plus ``CUBE_MEASURES``) inside ``scope``."""
+
+    @abstractmethod
+    def unique_users(self, scope: Scope) -> int:
+        """Exact number of distinct Entra IDs inside ``scope``."""
+
+    @abstractmethod
+    def unique_users_by(self, scope: Scope, column: str) -> Series:
+        """Exact distinct Entra IDs per value of ``column`` (``month`` or ``segment``)."""
+
+    @abstractmethod
+    def distinct(self, column: str) -> list[str]:
+        """Sorted non-missing values of a dimension column."""
+
+    def estimate_users(self, scope: Scope) -> float:
+        """Approximate distinct Entra IDs inside ``scope``; stores without sketches answer exactly."""
+        return float(self.unique_users(scope))
+
+    def estimate_users_by(self, scope: Scope, column: str) -> Series:
+        """Approximate distinct Entra IDs per value of ``column``; exact for stores without sketches."""
+        return self.unique_users_by(scope, column).astype(float)
+
+
+class FramePremiumStore(PremiumRequestsStore):
+    """Answers from the in-memory request cube, user-month table and HyperLogLog sketches."""
+
+    def __init__(self, cube: RequestCube, user_months: UserMonthTable, sketches: UserSketches) -> None:
+        self.cube = cube
+        self.user_months = user_months
+        self.sketches = sketches
+        self.relative_error = sketches.relative_error
+
+    def cells(self, scope: Scope) -> DataFrame:
+        return _select(self.cube.index, self.cube.cells, scope)
+
+    def unique_users(self, scope: Scope) -> int:
+        return self.user_months.count(self.user_rows(scope))
+
+    def unique_users_by(self, scope: Scope, column: str) -> Series:
+        return self.user_months.count_by(self.user_rows(scope), column)
+
+    def user_rows(self, scope: Scope) -> DataFrame:
+        """User-month rows inside ``scope``."""
+        return _select(self.user_months.index, self.user_months.rows, scope)
+
+    def distinct(self, column: str) -> list[str]:
+        # Every row falls in exactly one cell, so the cells hold every dimension value.
+        return sorted(self.cube.cells[column].dropna().unique().tolist())
+
+    def estimate_users(self, scope: Scope) -> float:
+        return self.sketches.estimate(_select(self.sketches.index, self.sketches.groups, scope).index)
+
+    def estimate_users_by(self, scope: Scope, column: str) -> Series:
+        groups = _select(self.sketches.index, self.sketches.groups, scope)
+        return self.sketches.estimate_by(groups.index, groups[column])
+
+
+class SegmentAdoptionStore(ABC):
+    """Source of segment adoption rows."""
+
+    @abstractmethod
+    def rows(self, scope: Scope) -> DataFrame:
+        """Cleaned rows inside ``scope`` (the FTE flag does not apply), sorted by month."""
+
+    @abstractmethod
+    def segments(self) -> list[str]:
+        """Sorted segment names."""
+
+
+class FrameSegmentStore(SegmentAdoptionStore):
+    """Answers from the month-sorted segment adoption frame."""
+
+    def __init__(self, data: DataFrame, index: PredicateIndex) -> None:
+        self.data = data
+        self.index = index
+
+    def rows(self, scope: Scope) -> DataFrame:
+        return _select(self.index, self.data, scope)
+
+    def segments(self) -> list[str]:
+        return sorted(self.data["segment"].dropna().unique().tolist())
+
+
+def _select(index: PredicateIndex, frame: DataFrame, scope: Scope) -> DataFrame:
+    return index.select(frame, scope.segment, scope.employee, scope.start, scope.end)
+
+
+__all__ = [
+    "FramePremiumStore",
+    "FrameSegmentStore",
+    "PremiumRequestsStore",
+    "Scope",
+    "SegmentAdoptionStore",
+    "sqlite_path",
+    "storage_backend",
+]
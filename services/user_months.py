@@ -0,0 +1,142 @@
+"""Premium request totals per user and month.
+
+Unique users, heavy users and quota overruns only need one row per engineer
+per month, not one per request. ``UserMonthTable`` folds the request rows of
+both enterprises into a row per (mfcgd_id, month), holding the user's segment
+and FTE flag plus their request rows, quantity, gross, discount and net
+amounts and rows over quota in each enterprise. A user whose rows disagree on
+segment or FTE flag in a month (e.g. some rows without a segment) gets a row
+per combination, so segment and user-type filters stay exact. Rows without an
+Entra ID are kept under a missing ``mfcgd_id`` so their months, segments and
+enterprises still appear in grouped results; they are never counted as users.
+
+The table is built once per load, absorbs newly ingested rows with ``merge``
+and is typically one to two orders of magnitude smaller than the request log.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+from .predicate_index import PredicateIndex
+from .premium_cube import stack_groups
+
+USER_MONTH_DIMENSIONS = ("month", "segment", "is_employee", "mfcgd_id")
+ENTERPRISE_MEASURES = ("rows", "quantity", "gross_amount", "discount_amount", "net_amount", "exceeding_rows")
+
+# Largest groups x users boolean matrix used for grouped distinct counts before
+# falling back to sorting the (group, user) pairs.
+_BITMAP_LIMIT = 64 * 1024 * 1024
+
+
+def measure_column(measure: str, enterprise: str) -> str:
+    """Name of the table column holding ``measure`` for one enterprise."""
+    return f"{measure}[{enterprise}]"
+
+
+class UserMonthTable:
+    """One row per user, month, segment and FTE flag with per-enterprise totals."""
+
+    def __init__(self, rows: DataFrame, enterprises: Sequence[str]) -> None:
+        self.rows = rows
+        self.enterprises = tuple(enterprises)
+        self.index = PredicateIndex(rows)
+
+    @classmethod
+    def build(cls, data: DataFrame) -> "UserMonthTable":
+        """Fold the typed request rows into user-month rows sorted by month."""
+        grouped = data.groupby(list(USER_MONTH_DIMENSIONS), observed=True, sort=True, dropna=False)
+        keys = grouped.size().reset_index()[list(USER_MONTH_DIMENSIONS)]
+        row_ids = grouped.ngroup().to_numpy()
+        enterprise_codes, enterprises = pd.factorize(data["enterprise"], sort=True)
+        slots = row_ids.astype(np.int64) * len(enterprises) + enterprise_codes
+        columns = {}
+        for measure in ENTERPRISE_MEASURES:
+            weights = _measure_values(data, measure)
+            totals = np.bincount(slots, weights=weights, minlength=len(keys) * len(enterprises))
+            totals = totals.reshape(len(keys), len(enterprises))
+            if weights is None or weights.dtype.kind in "biu":
+                totals = totals.astype(np.int64)
+            for position, enterprise in enumerate(enterprises):
+                columns[measure_column(measure, str(enterprise))] = totals[:, position]
+        rows = pd.concat([keys, DataFrame(columns)], axis=1)
+        return cls(rows, [str(enterprise) for enterprise in enterprises])
+
+    def merge(self, other: "UserMonthTable") -> "UserMonthTable":
+        """Table over the rows of both tables (e.g. the loaded history plus an appended delta)."""
+        enterprises = sorted(set(self.enterprises) | set(other.enterprises))
+        measures = [measure_column(measure, enterprise) for measure in ENTERPRISE_MEASURES for enterprise in enterprises]
+        left = self.rows.reindex(columns=[*USER_MONTH_DIMENSIONS, *measures], fill_value=0)
+        right = other.rows.reindex(columns=[*USER_MONTH_DIMENSIONS, *measures], fill_value=0)
+        grouped, _, _ = stack_groups(left, right, USER_MONTH_DIMENSIONS)
+        return UserMonthTable(grouped[measures].sum().reset_index(), enterprises)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def count(self, selected: DataFrame) -> int:
+        """Number of distinct users in the selected rows."""
+        codes = selected["mfcgd_id"].cat.codes.to_numpy()
+        seen = np.zeros(len(self.rows["mfcgd_id"].cat.categories), dtype=bool)
+        seen[codes[codes >= 0]] = True
+        return int(seen.sum())
+
+    def count_by(self, selected: DataFrame, column: str) -> Series:
+        """Distinct users per value of ``column`` (a dimension or ``enterprise``) in the selected rows."""
+        if column == "enterprise":
+            codes = selected["mfcgd_id"].cat.codes.to_numpy()
+            counts = {}
+            for enterprise in self.enterprises:
+                active = codes[selected[measure_column("rows", enterprise)].to_numpy() > 0]
+                if len(active):
+                    seen = np.zeros(len(self.rows["mfcgd_id"].cat.categories), dtype=bool)
+                    seen[active[active >= 0]] = True
+                    counts[enterprise] = int(seen.sum())
+            return Series(counts, index=pd.Index(list(counts), dtype=object), dtype=np.int64, name=column)
+        labels, codes = self.user_pairs(selected, column)
+        group_codes, uniques = pd.factorize(labels, sort=True)
+        known = codes >= 0
+        group_codes, codes = group_codes[known], codes[known]
+        user_count = len(self.rows["mfcgd_id"].cat.categories)
+        if len(uniques) * user_count <= _BITMAP_LIMIT:
+            seen = np.zeros((len(uniques), user_count), dtype=bool)
+            seen[group_codes, codes] = True
+            counts = seen.sum(axis=1)
+        else:
+            width = max(user_count, 1)
+            keys = np.unique(group_codes.astype(np.int64) * width + codes)
+            counts = np.bincount(keys // width, minlength=len(uniques))
+        return Series(counts, index=uniques, name=column)
+
+    def user_pairs(self, selected: DataFrame, column: str) -> tuple[Series, np.ndarray]:
+        """Label and user code (-1 when missing) of every (``column`` value, user) in the selected rows.
+
+        For ``enterprise`` a row yields one pair per enterprise the user made
+        requests in.
+        """
+        codes = selected["mfcgd_id"].cat.codes.to_numpy()
+        if column != "enterprise":
+            return selected[column].reset_index(drop=True), codes
+        labels, users = [], []
+        for enterprise in self.enterprises:
+            active = selected[measure_column("rows", enterprise)].to_numpy() > 0
+            labels.append(np.full(int(active.sum()), enterprise, dtype=object))
+            users.append(codes[active])
+        categories = pd.CategoricalDtype(self.enterprises)
+        return Series(np.concatenate(labels), dtype=categories, name=column), np.concatenate(users)
+
+
+def _measure_values(data: DataFrame, measure: str) -> Optional[np.ndarray]:
+    """Per-row weights of ``measure`` (``None`` counts rows)."""
+    if measure == "rows":
+        return None
+    if measure == "exceeding_rows":
+        return data["exceeds_quota"].to_numpy(dtype=np.int64)
+    return data[measure].to_numpy()
+
+
+__all__ = ["ENTERPRISE_MEASURES", "USER_MONTH_DIMENSIONS", "UserMonthTable", "measure_column"]
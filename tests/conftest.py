@@ -0,0 +1,45 @@
+"""Shared fixtures for the analytics unit tests."""
+
+import importlib
+from pathlib import Path
+
+import pytest
+
+
+PREMIUM_REQUESTS_CSV = """collection_date,enterprise,request_date,gh_id,model,quantity,gross_amount,discount_amount,net_amount,mfcgd_id,is_employee,segment,exceeds_quota
+2025-07-31,manulife,2025-07-02,alice-emu,claude-3.7-sonnet,12,0.48,0.48,0,alice,TRUE,Asia,FALSE
+2025-07-31,manulife-financial,2025-07-03,alice-legacy,gpt-4o,5,0.20,0.20,0,alice,TRUE,Asia,FALSE
+2025-07-31,manulife,2025-07-04,bob-emu,o3-mini,"1,200",48.00,12.00,36.00,bob,FALSE,Asia,TRUE
+2025-07-31,manulife,2025-07-09,carol-emu,claude-3.7-sonnet,30,1.20,1.20,0,carol,TRUE,Canada,FALSE
+2025-07-31,manulife-financial,2025-07-21,dave-legacy,Code Review model,8,0.32,0.32,0,dave,FALSE,US,FALSE
+2025-08-31,manulife,2025-08-01,alice-emu,claude-3.7-sonnet,40,1.60,1.60,0,alice,TRUE,Asia,FALSE
+2025-08-31,manulife,2025-08-05,bob-emu,o3-mini,300,12.00,0,12.00,bob,FALSE,Asia,TRUE
+2025-08-31,manulife-financial,2025-08-06,erin-legacy,gpt-4o,7,0.28,0.28,0,erin,TRUE,Canada,FALSE
+2025-08-31,manulife,2025-08-11,carol-emu,gpt-4o,3,0.12,0.12,0,carol,TRUE,Canada,FALSE
+2025-08-31,manulife,2025-08-12,frank-emu,gpt-4o,9,0.36,0.36,0,frank,TRUE,NA,FALSE
+2025-09-30,manulife,2025-09-02,alice-emu,o3-mini,15,0.60,0.60,0,alice,TRUE,Asia,FALSE
+2025-09-30,manulife-financial,2025-09-15,dave-legacy,claude-3.7-sonnet,22,0.88,0.88,0,dave,FALSE,US,FALSE
+"""
+
+
+@pytest.fixture
+def premium_csv(tmp_path, monkeypatch) -> Path:
+    """Write a small premium requests export in the production schema."""
+    monkeypatch.setenv("COPILOT_DISABLE_SNAPSHOTS", "1")
+    csv_file = tmp_path / "premium_requests_db.csv"
+    csv_file.write_text(PREMIUM_REQUESTS_CSV)
+    return csv_file
+
+
+@pytest.fixture
+def mcp_server(premium_csv, monkeypatch):
+    """The MCP server module serving the sample export with an empty result cache."""
+    from mcp.result_cache import ResultCache
+    from services.hot_reload import DatasetSlot
+    from services.premium_requests import PremiumRequestsAnalytics
+
+    module = importlib.import_module("mcp.copilot_usage_server")
+    monkeypatch.setattr(module, "_PREMIUM_SLOT", DatasetSlot("premium requests", lambda: premium_csv, PremiumRequestsAnalytics))
+    module._PREMIUM_SLOT.load()
+    monkeypatch.setattr(module, "_RESULT_CACHE", ResultCache(max_entries=16, ttl_seconds=60))
+    return module
@@ -0,0 +1,123 @@
+"""Unit tests for the orchestrator's batch question runner.
+
+Run with: pytest tests/test_batch_runner.py
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional
+
+import httpx
+import pytest
+
+from agents.batch_runner import QuestionFileError, answer_questions, read_questions, run_batch
+from agents.mcp_bridge import McpBridge, ToolResultCache
+
+
+def _guardrails(question: str) -> Optional[str]:
+    return "PII queries are blocked by policy." if "pii" in question.lower() else None
+
+
+class _FakeAgent:
+    """Answers ``"<n> tools, <delay>s"`` questions by making n tool calls and waiting."""
+
+    def __init__(self, bridge: McpBridge) -> None:
+        self.bridge = bridge
+        self.asked: list[str] = []
+
+    async def run(self, question: str, store: bool) -> str:
+        self.asked.append(question)
+        if "fail" in question:
+            raise RuntimeError("model unavailable")
+        tools, delay = question.split(", ")
+        await asyncio.gather(*[self.bridge.call("premium_summary") for _ in range(int(tools.split()[0]))])
+        await asyncio.sleep(float(delay.rstrip("s")))
+        return f"answer to {question}"
+
+
+def _session(agents: list[_FakeAgent]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"result": "ok"})
+
+    @asynccontextmanager
+    async def session():
+        bridge = McpBridge("http://mcp.test", cache=ToolResultCache(0), transport=httpx.MockTransport(handler))
+        async with bridge:
+            agents.append(_FakeAgent(bridge))
+            yield agents[-1]
+
+    return session
+
+
+def test_records_keep_input_order_with_per_question_tool_counts() -> None:
+    agents: list[_FakeAgent] = []
+    questions = ["3 tools, 0.05s", "1 tools, 0.01s", "0 tools, 0s", "2 tools, 0.03s"]
+
+    records = asyncio.run(answer_questions(questions, _session(agents), _guardrails, concurrency=4))
+
+    assert [record["question"] for record in records] == questions
+    assert [record["answer"] for record in records] == [f"answer to {question}" for question in questions]
+    assert [record["tool_calls"] for record in records] == [3, 1, 0, 2]
+    assert len(agents) == 1
+
+
+def test_guardrails_screen_questions_before_the_agent() -> None:
+    agents: list[_FakeAgent] = []
+    questions = ["Show PII for Asia", "1 tools, 0s"]
+
+    blocked, answered = asyncio.run(answer_questions(questions, _session(agents), _guardrails, concurrency=2))
+
+    assert blocked["answer"] is None
+    assert blocked["error"] == "Governance: PII queries are blocked by policy."
+    assert answered["answer"] == "answer to 1 tools, 0s"
+    assert agents[0].asked == ["1 tools, 0s"]
+
+
+def test_session_is_not_opened_when_every_question_is_blocked() -> None:
+    agents: list[_FakeAgent] = []
+
+    records = asyncio.run(answer_questions(["pii please"], _session(agents), _guardrails, concurrency=2))
+
+    assert records[0]["error"].startswith("Governance:")
+    assert agents == []
+
+
+def test_failing_question_is_recorded_and_the_batch_continues() -> None:
+    agents: list[_FakeAgent] = []
+    questions = ["1 tools, 0s", "please fail", "1 tools, 0s"]
+
+    records = asyncio.run(answer_questions(questions, _session(agents), _guardrails, concurrency=1))
+
+    assert records[1]["answer"] is None
+    assert records[1]["error"] == "RuntimeError: model unavailable"
+    assert [record["error"] for record in (records[0], records[2])] == [None, None]
+
+
+def test_run_batch_writes_one_record_per_line(tmp_path: Path) -> None:
+    questions = tmp_path / "questions.txt"
+    questions.write_text("# weekly pack\n1 tools, 0s\n\nShow PII\n", encoding="utf-8")
+    output = tmp_path / "answers.jsonl"
+
+    asyncio.run(run_batch(questions, output, _session([]), _guardrails, concurrency=2))
+
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [record["question"] for record in records] == ["1 tools, 0s", "Show PII"]
+    assert records[0]["tool_calls"] == 1
+
+
+def test_jsonl_questions_are_read_in_order(tmp_path: Path) -> None:
+    path = tmp_path / "questions.jsonl"
+    path.write_text('{"question": " first "}\n\n{"question": "second", "tag": "x"}\n', encoding="utf-8")
+
+    assert read_questions(path) == ["first", "second"]
+
+
+@pytest.mark.parametrize("line", ['{"prompt": "first"}', '{"question": ""}', '["first"]', "first"])
+def test_unreadable_jsonl_line_names_the_line(tmp_path: Path, line: str) -> None:
+    path = tmp_path / "questions.jsonl"
+    path.write_text(f'{{"question": "ok"}}\n{line}\n', encoding="utf-8")
+
+    with pytest.raises(QuestionFileError, match=r"questions\.jsonl:2:"):
+        read_questions(path)
@@ -0,0 +1,88 @@
+"""Unit tests for the vectorised CSV normalisation helpers.
+
+The vectorised pipeline must produce exactly what the per-cell cleaner
+produces, so every case is checked against ``clean_cell`` directly.
+
+Run with: pytest tests/test_csv_cleaning.py
+"""
+
+import pandas as pd
+import pytest
+
+from services.csv_cleaning import clean_cell, clean_frame, clean_series, parse_dates, to_number
+
+
+RAW_VALUES = [
+    "",
+    " NA ",
+    "N/A",
+    '"None"',
+    '""',
+    '"1,234"',
+    ' "7" ',
+    " 12 ",
+    " 12% ",
+    "1,2,3%",
+    "--",
+    " - ",
+    "-",
+    "a-b",
+    "-5",
+    "\x1c padded \x1f",
+    "ASIA",
+]
+
+
+def _as_reference(series: pd.Series, **options) -> list:
+    return [clean_cell(value, **options) for value in series.tolist()]
+
+
+def _as_values(series: pd.Series) -> list:
+    return [pd.NA if pd.isna(value) else value for value in series.tolist()]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"strip_percent": True, "blank_dashes": True},
+        {"strip_percent": True},
+        {"blank_dashes": True},
+    ],
+)
+def test_clean_series_matches_per_cell_cleaner(options) -> None:
+    """Vectorised cleaning returns the same values as the per-cell cleaner."""
+    raw = pd.Series(RAW_VALUES, dtype=str)
+
+    assert _as_values(clean_series(raw, **options)) == _as_reference(raw, **options)
+
+
+def test_clean_frame_cleans_every_column() -> None:
+    """Every column of the frame is normalised."""
+    frame = pd.DataFrame({"a": ['"1,000"', "NA"], "b": [" 5% ", "x"]}, dtype=str)
+
+    cleaned = clean_frame(frame, strip_percent=True)
+
+    assert cleaned["a"].tolist()[0] == "1000"
+    assert pd.isna(cleaned["a"].tolist()[1])
+    assert cleaned["b"].tolist() == ["5", "x"]
+
+
+def test_to_number_returns_numpy_dtypes() -> None:
+    """Numeric coercion yields int64 when complete and float64 otherwise."""
+    assert to_number(clean_series(pd.Series(["1", "2"], dtype=str))).dtype == "int64"
+    partial = to_number(clean_series(pd.Series(["1", "NA", "x"], dtype=str)))
+    assert partial.dtype == "float64"
+    assert partial.isna().sum() == 2
+
+
+def test_parse_dates_uses_fallback_for_other_layouts() -> None:
+    """Values outside the explicit format are still parsed; garbage becomes NaT."""
+    values = pd.Series(["2025-07-15", "2025/08/01", "not a date", None], dtype=object)
+
+    parsed = parse_dates(values, "%Y-%m-%d")
+
+    assert parsed.iloc[0] == pd.Timestamp("2025-07-15")
+    assert parsed.iloc[1] == pd.Timestamp("2025-08-01")
+    assert pd.isna(parsed.iloc[2])
+    assert pd.isna(parsed.iloc[3])
@@ -0,0 +1,107 @@
+"""Unit tests for reloadable dataset slots.
+
+Run with: pytest tests/test_hot_reload.py
+"""
+
+import threading
+
+from fastapi.testclient import TestClient
+
+from services.hot_reload import DatasetSlot, SourceWatcher
+from services.premium_requests import PremiumRequestsAnalytics
+
+EXTRA_ROW = "2025-10-01,manulife,2025-09-30,zoe,gpt-4o,100,4.00,0.00,4.00,zoe@corp,TRUE,Asia,FALSE\n"
+
+
+def _slot(premium_csv) -> DatasetSlot:
+    slot = DatasetSlot("premium requests", lambda: premium_csv, PremiumRequestsAnalytics)
+    slot.load()
+    return slot
+
+
+def test_changed_source_is_swapped_in_after_it_settles(premium_csv) -> None:
+    slot = _slot(premium_csv)
+    before = slot.state
+    assert not slot.reload_if_changed()
+
+    premium_csv.write_text(premium_csv.read_text() + EXTRA_ROW)
+
+    assert not slot.reload_if_changed()
+    assert slot.reload_if_changed()
+    after = slot.state
+    assert after.version != before.version
+    assert after.loaded_at >= before.loaded_at
+    assert "- Total requests: 1,751" in after.analytics.summary()
+    # A request that captured the previous generation keeps answering from it.
+    assert "- Total requests: 1,651" in before.analytics.summary()
+
+
+def test_failed_reload_keeps_serving_previous_data(premium_csv) -> None:
+    slot = _slot(premium_csv)
+    previous = slot.state.analytics
+
+    premium_csv.write_text("not,a,premium,export\n1,2,3,4\n")
+    watcher = SourceWatcher([slot], interval_seconds=60)
+    watcher.poll()
+    watcher.poll()
+
+    assert slot.state.analytics is previous
+    assert "missing required columns" in str(slot.state.error)
+    assert not slot.reload_if_changed()
+
+
+def test_reset_drops_the_loaded_generation(premium_csv) -> None:
+    slot = _slot(premium_csv)
+
+    slot.reset()
+
+    assert slot.state.analytics is None
+    assert slot.state.status == "pending"
+    assert "- Total requests: 1,651" in slot.wait(None).analytics.summary()
+
+
+def test_health_reports_version_and_load_time(mcp_server) -> None:
+    health = TestClient(mcp_server.app).get("/health").json()
+
+    assert health["premiumAnalytics"] == "ready"
+    assert health["premiumDataVersion"] == mcp_server._PREMIUM_SLOT.state.version
+    assert health["premiumLoadedAt"].endswith("+00:00")
+
+
+def _gated_slot(premium_csv, gate: threading.Event) -> DatasetSlot:
+    def loader(path):
+        gate.wait(5)
+        return PremiumRequestsAnalytics(path)
+
+    return DatasetSlot("premium requests", lambda: premium_csv, loader)
+
+
+def test_background_load_reports_loading_until_ready(premium_csv) -> None:
+    gate = threading.Event()
+    slot = _gated_slot(premium_csv, gate)
+
+    slot.ensure_loading()
+    assert slot.state.status == "loading"
+    assert slot.wait(0.01).status == "loading"
+
+    gate.set()
+    assert slot.wait(5).status == "ready"
+
+
+def test_tool_call_for_loading_dataset_returns_503(mcp_server, premium_csv, monkeypatch) -> None:
+    gate = threading.Event()
+    monkeypatch.setattr(mcp_server, "_PREMIUM_SLOT", _gated_slot(premium_csv, gate))
+    monkeypatch.setattr(mcp_server, "_DATASET_WAIT_SECONDS", 0.05)
+    client = TestClient(mcp_server.app)
+    try:
+        response = client.post("/mcp/execute", json={"tool_name": "premium_requests_summary", "arguments": {}})
+        assert response.status_code == 503
+        assert "still loading" in response.json()["detail"]
+        assert response.headers["Retry-After"]
+        assert client.get("/health").json()["premiumAnalytics"] == "loading"
+    finally:
+        gate.set()
+
+    mcp_server._PREMIUM_SLOT.wait(5)
+    response = client.post("/mcp/execute", json={"tool_name": "premium_requests_summary", "arguments": {}})
+    assert response.status_code == 200
@@ -0,0 +1,79 @@
+"""Unit tests for the HyperLogLog unique-user sketches.
+
+Run with: pytest tests/test_hyperloglog.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.hyperloglog import UserSketches, relative_error
+from services.premium_requests import PremiumRequestsAnalytics
+
+
+def _frame(users_per_group: dict) -> pd.DataFrame:
+    rows = []
+    for (month, segment, is_employee), users in users_per_group.items():
+        rows.extend((month, segment, is_employee, user) for user in users)
+    frame = pd.DataFrame(rows, columns=["month", "segment", "is_employee", "mfcgd_id"])
+    frame["month"] = pd.PeriodIndex(frame["month"], freq="M")
+    frame["mfcgd_id"] = frame["mfcgd_id"].astype("category")
+    return frame
+
+
+def test_estimate_is_within_error_bound_for_large_sets() -> None:
+    users = [f"user-{i}" for i in range(20000)]
+    sketches = UserSketches.build(_frame({("2025-07", "Asia", True): users}))
+
+    estimate = sketches.estimate([0])
+
+    assert abs(estimate - 20000) / 20000 < 4 * relative_error()
+
+
+def test_small_sets_use_linear_counting() -> None:
+    sketches = UserSketches.build(_frame({("2025-07", "Asia", True): ["a", "b", "c", "a"]}))
+
+    assert round(sketches.estimate([0])) == 3
+
+
+def test_merging_groups_counts_shared_users_once() -> None:
+    shared = [f"user-{i}" for i in range(3000)]
+    sketches = UserSketches.build(
+        _frame(
+            {
+                ("2025-07", "Asia", True): shared,
+                ("2025-08", "Asia", True): shared[:1500] + [f"new-{i}" for i in range(1500)],
+            }
+        )
+    )
+
+    estimate = sketches.estimate([0, 1])
+    by_month = sketches.estimate_by([0, 1], pd.Series(["2025-07", "2025-08"], name="month"))
+
+    assert abs(estimate - 4500) / 4500 < 4 * relative_error()
+    assert list(by_month.index) == ["2025-07", "2025-08"]
+    assert np.allclose(by_month.to_numpy(), [3000, 3000], rtol=4 * relative_error())
+
+
+def test_empty_selection_estimates_zero() -> None:
+    sketches = UserSketches.build(_frame({("2025-07", "Asia", True): ["a"]}))
+
+    assert sketches.estimate([]) == 0.0
+
+
+@pytest.fixture
+def analytics(premium_csv) -> PremiumRequestsAnalytics:
+    return PremiumRequestsAnalytics(premium_csv)
+
+
+def test_approximate_summary_marks_estimate(analytics: PremiumRequestsAnalytics) -> None:
+    result = analytics.summary(approximate=True)
+
+    assert "- Unique users (by Entra ID): ~6 (±1.6%), HyperLogLog estimate" in result
+    assert "- Total requests: 1,651" in result
+
+
+def test_approximate_trend_matches_exact_on_small_data(analytics: PremiumRequestsAnalytics) -> None:
+    result = analytics.trend(metric="users", approximate=True)
+
+    assert result.splitlines()[1:] == ["- 2025-07: ~4 (±1.6%)", "- 2025-08: ~5 (±1.6%)", "- 2025-09: ~2 (±1.6%)"]
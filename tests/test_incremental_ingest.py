@@ -0,0 +1,145 @@
+"""Unit tests for incremental (append-only) premium request ingest.
+
+Run with: pytest tests/test_incremental_ingest.py
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from services import premium_requests_loader
+from services.hot_reload import DatasetSlot
+from services.premium_requests import PremiumRequestsAnalytics
+from services.premium_requests_loader import refresh_premium_requests_analytics
+
+from .conftest import PREMIUM_REQUESTS_CSV
+
+LINES = PREMIUM_REQUESTS_CSV.splitlines(keepends=True)
+# Header plus the rows collected on 2025-07-31; the rest were collected later.
+JULY = "".join(LINES[:6])
+LATER = "".join(LINES[6:])
+
+
+def _outputs(analytics: PremiumRequestsAnalytics) -> list[str]:
+    return [
+        analytics.summary(),
+        analytics.summary(segment="asia", user_type="fte"),
+        analytics.trend(metric="users"),
+        analytics.top_segments(metric="requests"),
+        analytics.top_models(),
+        analytics.enterprise_breakdown(),
+        analytics.summary(approximate=True),
+    ]
+
+
+def test_refresh_reads_only_appended_rows(premium_csv: Path) -> None:
+    """Rows appended to the export are merged into data, cube and sketches."""
+    premium_csv.write_text(JULY)
+    analytics = PremiumRequestsAnalytics(premium_csv)
+    assert analytics.refresh() is analytics
+
+    with premium_csv.open("a") as handle:
+        handle.write(LATER)
+    refreshed = analytics.refresh()
+    full = PremiumRequestsAnalytics(premium_csv)
+
+    assert len(analytics.data) == 5
+    assert len(refreshed.data) == 12
+    assert refreshed.version == full.version
+    assert refreshed.watermark == pd.Timestamp("2025-09-30")
+    assert _outputs(refreshed) == _outputs(full)
+    pd.testing.assert_frame_equal(refreshed.cube.cells, full.cube.cells)
+
+
+def test_append_merges_a_delta_file(premium_csv: Path, tmp_path: Path) -> None:
+    """A separate delta file with the export's columns is merged without touching the source."""
+    premium_csv.write_text(JULY)
+    analytics = PremiumRequestsAnalytics(premium_csv)
+    delta = tmp_path / "delta.csv"
+    delta.write_text(LINES[0] + LATER)
+
+    appended = analytics.append(delta)
+
+    premium_csv.write_text(PREMIUM_REQUESTS_CSV)
+    assert _outputs(appended) == _outputs(PremiumRequestsAnalytics(premium_csv))
+    assert "- Total requests: 1,255" in analytics.summary()
+
+
+def test_rewritten_export_merges_rows_after_the_watermark(premium_csv: Path) -> None:
+    """A regenerated export only contributes rows collected after the last watermark."""
+    premium_csv.write_text(JULY)
+    analytics = PremiumRequestsAnalytics(premium_csv)
+    # Same history in a different order, so the previous read position no longer applies.
+    premium_csv.write_text(LINES[0] + "".join(reversed(LINES[1:6])) + LATER)
+
+    refreshed = analytics.refresh()
+
+    assert _outputs(refreshed) == _outputs(PremiumRequestsAnalytics(premium_csv))
+
+
+def test_shrunk_export_needs_a_full_reload(premium_csv: Path) -> None:
+    analytics = PremiumRequestsAnalytics(premium_csv)
+    premium_csv.write_text(JULY)
+
+    assert analytics.refresh() is None
+
+
+def test_slot_prefers_the_refresher(premium_csv: Path) -> None:
+    """The hot-reload slot extends the loaded analytics instead of re-reading the export."""
+    premium_csv.write_text(JULY)
+    loads: list[Path] = []
+
+    def loader(path: Path) -> PremiumRequestsAnalytics:
+        loads.append(path)
+        return PremiumRequestsAnalytics(path)
+
+    slot = DatasetSlot("premium requests", lambda: premium_csv, loader, refresher=refresh_premium_requests_analytics)
+    slot.load()
+    with premium_csv.open("a") as handle:
+        handle.write(LATER)
+    slot.reload_if_changed()
+    assert slot.reload_if_changed()
+
+    assert len(loads) == 1
+    assert len(slot.state.analytics.data) == 12
+    assert slot.state.version == PremiumRequestsAnalytics(premium_csv).version
+
+
+def test_appended_re_export_replaces_loaded_row(premium_csv: Path) -> None:
+    """A later export repeating a loaded row supersedes it in every derived structure."""
+    analytics = PremiumRequestsAnalytics(premium_csv)
+    corrected = LINES[1].replace("2025-07-31", "2025-10-01").replace(",12,0.48,", ",20,0.80,")
+    with premium_csv.open("a") as handle:
+        handle.write(corrected)
+
+    refreshed = analytics.refresh()
+
+    assert refreshed.load_stats.duplicates_dropped == 1
+    assert len(refreshed.data) == 12
+    assert _outputs(refreshed) == _outputs(PremiumRequestsAnalytics(premium_csv))
+    assert "- Total requests: 1,659" in refreshed.summary()
+
+
+def test_rows_appended_while_reading_a_snapshot_are_refreshed(premium_csv: Path, monkeypatch) -> None:
+    """The source is marked before the snapshot is read, so rows appended meanwhile are not skipped."""
+    pytest.importorskip("pyarrow")
+    monkeypatch.delenv("COPILOT_DISABLE_SNAPSHOTS")
+    monkeypatch.delenv("COPILOT_SNAPSHOT_DIR", raising=False)
+    premium_csv.write_text(JULY)
+    premium_requests_loader._load_analytics(premium_csv)
+    read_snapshot = premium_requests_loader.read_snapshot
+
+    def read_then_append(*args):
+        snapshot = read_snapshot(*args)
+        with premium_csv.open("a") as handle:
+            handle.write(LATER)
+        return snapshot
+
+    monkeypatch.setattr(premium_requests_loader, "read_snapshot", read_then_append)
+    analytics = premium_requests_loader._load_analytics(premium_csv)
+    refreshed = analytics.refresh()
+
+    assert len(analytics.data) == 5
+    assert len(refreshed.data) == 12
+    assert _outputs(refreshed) == _outputs(PremiumRequestsAnalytics(premium_csv))
@@ -0,0 +1,68 @@
+"""Unit tests for the batched MCP tool endpoint.
+
+Run with: pytest tests/test_mcp_batch.py
+"""
+
+from fastapi.testclient import TestClient
+
+from services import predicate_index
+
+
+def test_batch_returns_results_in_order(mcp_server) -> None:
+    client = TestClient(mcp_server.app)
+    calls = [
+        {"tool_name": "premium_requests_summary", "arguments": {"segment": "Asia"}},
+        {"tool_name": "premium_requests_top_models", "arguments": {"segment": "Asia"}},
+        {"tool_name": "premium_requests_enterprise_breakdown", "arguments": {"segment": "Asia"}},
+    ]
+
+    response = client.post("/mcp/execute_batch", json=calls)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["tool_name"] for item in body] == [call["tool_name"] for call in calls]
+    for call, item in zip(calls, body):
+        single = client.post("/mcp/execute", json=call).json()
+        assert item["result"] == single["result"]
+        assert item["error"] is None
+
+
+def test_batch_reports_failures_per_call(mcp_server) -> None:
+    client = TestClient(mcp_server.app)
+
+    body = client.post(
+        "/mcp/execute_batch",
+        json=[
+            {"tool_name": "no_such_tool", "arguments": {}},
+            {"tool_name": "premium_requests_trend", "arguments": {"metric": "cost"}},
+        ],
+    ).json()
+
+    assert "not registered" in body[0]["error"]
+    assert body[1]["result"].startswith("Premium request net cost trend")
+
+
+def test_batch_filters_each_scope_once(mcp_server, monkeypatch) -> None:
+    calls = []
+    original = predicate_index.PredicateIndex._select
+
+    def counting_select(self, *args, **kwargs):
+        calls.append((id(args[0]), *args[1:]))
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(predicate_index.PredicateIndex, "_select", counting_select)
+    client = TestClient(mcp_server.app)
+    scope = {"segment": "Asia", "user_type": "fte", "start_month": "2025-07"}
+
+    client.post(
+        "/mcp/execute_batch",
+        json=[
+            {"tool_name": "premium_requests_summary", "arguments": scope},
+            {"tool_name": "premium_requests_top_models", "arguments": scope},
+            {"tool_name": "premium_requests_trend", "arguments": {**scope, "segment": "ASIA"}},
+        ],
+    )
+
+    # One selection per indexed structure: the request cube and the user-month table.
+    assert len(calls) == 2
+    assert len(set(calls)) == 2
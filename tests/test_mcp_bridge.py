@@ -0,0 +1,240 @@
+"""Unit tests for the orchestrator's MCP bridge and its tool result cache.
+
+Run with: pytest tests/test_mcp_bridge.py
+"""
+
+import asyncio
+import json
+from typing import Callable
+
+import httpx
+
+from agents.mcp_bridge import _MAX_BATCH_SIZE, McpBridge, McpToolError, ToolResultCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _result(text: str, etag: str = '"a"', data_version: str = "premium:1") -> dict:
+    return {"result": text, "etag": etag, "data_version": data_version}
+
+
+def _bridge(handler: Callable, cache: ToolResultCache, **options) -> McpBridge:
+    options = {"deadline": 5, "coalesce_ms": 0, "max_concurrency": 4, **options}
+    return McpBridge("http://mcp.test", cache=cache, transport=httpx.MockTransport(handler), **options)
+
+
+def test_entry_is_served_locally_within_the_ttl() -> None:
+    clock = _Clock()
+    cache = ToolResultCache(ttl_seconds=10, clock=clock)
+    key = cache.key("premium_summary", {"segment": "asia"})
+    cache.store(key, _result("summary"))
+
+    clock.now = 9.5
+    assert cache.fresh(key) == "summary"
+    clock.now = 10
+    assert cache.fresh(key) is None
+    assert cache.validator(key) == '"a"'
+
+
+def test_default_ttl_revalidates_every_call() -> None:
+    cache = ToolResultCache(clock=_Clock())
+    key = cache.key("premium_summary", {})
+    cache.store(key, _result("summary"))
+
+    assert cache.fresh(key) is None
+    assert cache.validator(key) == '"a"'
+
+
+def test_key_ignores_argument_order() -> None:
+    assert ToolResultCache.key("t", {"a": 1, "b": 2}) == ToolResultCache.key("t", {"b": 2, "a": 1})
+
+
+def test_results_without_validators_are_not_kept() -> None:
+    cache = ToolResultCache()
+    key = cache.key("premium_summary", {})
+    cache.store(key, {"result": "summary"})
+    cache.store(key, {**_result("summary"), "error": "boom"})
+
+    assert cache.validator(key) is None
+    assert cache.misses == 2
+
+
+def test_new_data_version_drops_that_datasets_entries() -> None:
+    cache = ToolResultCache()
+    old, other = cache.key("premium_summary", {}), cache.key("segment_summary", {})
+    cache.store(old, _result("old", data_version="premium:1"))
+    cache.store(other, _result("segment", data_version="segment:1"))
+
+    cache.store(cache.key("premium_trend", {}), _result("new", data_version="premium:2"))
+
+    assert cache.validator(old) is None
+    assert cache.validator(other) == '"a"'
+
+
+def test_lru_evicts_the_oldest_entry() -> None:
+    cache = ToolResultCache(max_entries=2)
+    keys = [cache.key("premium_summary", {"segment": name}) for name in ("a", "b", "c")]
+    for key in keys:
+        cache.store(key, _result(key[1]))
+
+    assert [cache.validator(key) for key in keys] == [None, '"a"', '"a"']
+
+
+def test_not_modified_answers_from_the_cache() -> None:
+    seen: list[object] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"a"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=_result("summary"))
+
+    async def scenario() -> list[str]:
+        async with _bridge(handler, ToolResultCache()) as bridge:
+            return [await bridge.call("premium_summary", segment="asia") for _ in range(3)]
+
+    assert asyncio.run(scenario()) == ["summary"] * 3
+    assert seen == [None, '"a"', '"a"']
+
+
+def test_reloaded_dataset_is_seen_on_the_next_call() -> None:
+    version = ["premium:1"]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        etag = f'"{version[0]}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, json=_result(version[0], etag=etag, data_version=version[0]))
+
+    async def scenario() -> list[str]:
+        async with _bridge(handler, ToolResultCache()) as bridge:
+            first = await bridge.call("premium_summary")
+            version[0] = "premium:2"
+            return [first, await bridge.call("premium_summary")]
+
+    assert asyncio.run(scenario()) == ["premium:1", "premium:2"]
+
+
+def test_fresh_entry_skips_the_request() -> None:
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json=_result("summary"))
+
+    cache = ToolResultCache(ttl_seconds=60)
+
+    async def scenario() -> list[str]:
+        async with _bridge(handler, cache) as bridge:
+            return [await bridge.call("premium_summary") for _ in range(2)]
+
+    assert asyncio.run(scenario()) == ["summary", "summary"]
+    assert len(calls) == 1
+    assert cache.hits == 1
+
+
+def test_entry_evicted_in_flight_is_fetched_again() -> None:
+    cache = ToolResultCache()
+    seen: list[object] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        etag = request.headers.get("If-None-Match")
+        seen.append(etag)
+        if etag:
+            # Another call evicted the entry while this revalidation was in flight.
+            cache._entries.clear()
+            return httpx.Response(304)
+        return httpx.Response(200, json=_result(json.loads(request.content)["arguments"]["segment"]))
+
+    async def scenario() -> list[str]:
+        async with _bridge(handler, cache) as bridge:
+            return [await bridge.call("premium_summary", segment="asia") for _ in range(2)]
+
+    assert asyncio.run(scenario()) == ["asia", "asia"]
+    assert seen == [None, '"a"', None]
+
+
+def _batch_handler(batches: list[list[dict]], delay: float = 0.0) -> Callable:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        invocations = json.loads(request.content)
+        batches.append(invocations)
+        await asyncio.sleep(delay)
+        results = []
+        for invocation in invocations:
+            if invocation["arguments"].get("segment") == "missing":
+                results.append({"tool_name": invocation["tool_name"], "error": "Unknown segment 'missing'"})
+            else:
+                results.append(_result(f"{invocation['tool_name']}:{invocation['arguments'].get('segment')}"))
+        return httpx.Response(200, json=results)
+
+    return handler
+
+
+def test_full_batch_is_sent_without_waiting_for_the_window() -> None:
+    batches: list[list[dict]] = []
+
+    async def scenario() -> list[str]:
+        async with _bridge(_batch_handler(batches), ToolResultCache(), coalesce_ms=60_000) as bridge:
+            calls = [bridge.call("premium_summary", segment=str(number)) for number in range(_MAX_BATCH_SIZE)]
+            return await asyncio.gather(*calls)
+
+    results = asyncio.run(scenario())
+
+    assert results == [f"premium_summary:{number}" for number in range(_MAX_BATCH_SIZE)]
+    assert [len(batch) for batch in batches] == [_MAX_BATCH_SIZE]
+
+
+def test_calls_within_the_window_share_a_batch() -> None:
+    batches: list[list[dict]] = []
+    cache = ToolResultCache()
+
+    async def scenario() -> list[str]:
+        async with _bridge(_batch_handler(batches), cache, coalesce_ms=20) as bridge:
+            return await asyncio.gather(bridge.call("premium_summary"), bridge.call("premium_trend", segment="asia"))
+
+    assert asyncio.run(scenario()) == ["premium_summary:None", "premium_trend:asia"]
+    assert len(batches) == 1
+    assert cache.validator(cache.key("premium_trend", {"segment": "asia"})) == '"a"'
+
+
+def test_item_error_fails_only_that_call() -> None:
+    batches: list[list[dict]] = []
+
+    async def scenario() -> list[object]:
+        async with _bridge(_batch_handler(batches), ToolResultCache(), coalesce_ms=20) as bridge:
+            return await asyncio.gather(
+                bridge.call("premium_summary", segment="missing"),
+                bridge.call("premium_summary", segment="asia"),
+                return_exceptions=True,
+            )
+
+    failed, answered = asyncio.run(scenario())
+
+    assert isinstance(failed, McpToolError)
+    assert "Unknown segment" in str(failed)
+    assert answered == "premium_summary:asia"
+    assert len(batches) == 1
+
+
+def test_deadline_gives_up_on_a_batch_still_in_flight() -> None:
+    batches: list[list[dict]] = []
+
+    async def scenario() -> tuple[object, list[object]]:
+        bridge = _bridge(_batch_handler(batches, delay=0.2), ToolResultCache(), coalesce_ms=1, deadline=0.05)
+        async with bridge:
+            outcome = await asyncio.gather(bridge.call("premium_summary"), return_exceptions=True)
+            in_flight = set(bridge._batches)
+        return outcome[0], [task.exception() for task in in_flight]
+
+    error, batch_errors = asyncio.run(scenario())
+
+    assert isinstance(error, TimeoutError)
+    assert len(batches) == 1
+    # Closing the bridge waited for the batch, which skipped the abandoned call.
+    assert batch_errors == [None]
@@ -0,0 +1,49 @@
+"""Unit tests for the month offset index.
+
+Run with: pytest tests/test_month_index.py
+"""
+
+import pandas as pd
+import pytest
+
+from services.month_index import MonthIndex, sort_by_month
+
+
+def _frame() -> pd.DataFrame:
+    months = pd.PeriodIndex(["2025-09", "2025-07", "2025-08", "2025-07", "2025-09"], freq="M")
+    return pd.DataFrame({"month": months, "value": [1, 2, 3, 4, 5]})
+
+
+def test_sort_by_month_is_stable() -> None:
+    ordered = sort_by_month(_frame())
+
+    assert ordered["value"].tolist() == [2, 4, 3, 1, 5]
+    assert ordered.index.tolist() == [0, 1, 2, 3, 4]
+
+
+def test_select_matches_boolean_masks() -> None:
+    data = sort_by_month(_frame())
+    index = MonthIndex.build(data["month"])
+
+    for start, end in [("2025-07", "2025-07"), ("2025-08", None), (None, "2025-08"), ("2025-06", "2025-12")]:
+        start_p = pd.Period(start, freq="M") if start else None
+        end_p = pd.Period(end, freq="M") if end else None
+        expected = data
+        if start_p is not None:
+            expected = expected[expected["month"] >= start_p]
+        if end_p is not None:
+            expected = expected[expected["month"] <= end_p]
+        pd.testing.assert_frame_equal(index.select(data, start_p, end_p), expected)
+
+
+def test_select_outside_data_is_empty() -> None:
+    data = sort_by_month(_frame())
+    index = MonthIndex.build(data["month"])
+
+    assert index.select(data, pd.Period("2026-01", freq="M"), None).empty
+    assert index.bounds(pd.Period("2025-01", freq="M"), pd.Period("2025-02", freq="M")) == slice(0, 0)
+
+
+def test_build_rejects_unsorted_months() -> None:
+    with pytest.raises(ValueError):
+        MonthIndex.build(_frame()["month"])
@@ -0,0 +1,160 @@
+"""Unit tests for month-partitioned dataset directories.
+
+Run with: pytest tests/test_partitions.py
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from services import premium_requests_loader
+from services.partitions import (
+    PartitionCache,
+    PartitionedPremiumStore,
+    PartitionedSegmentStore,
+    discover_partitions,
+)
+from services.premium_requests import PremiumRequestsAnalytics, PremiumRequestsConfigError
+from services.segment_adoption import SegmentAdoptionAnalytics
+from services.snapshot_cache import source_version
+
+SEGMENT_CSV = Path(__file__).resolve().parent.parent / "data" / "copilot" / "segment_adoption.csv"
+
+
+def _partition(csv_path: Path, directory: Path, month_column: str) -> Path:
+    """Split an export into month=YYYY-MM partitions, writing odd months as a Parquet and a CSV part."""
+    raw = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    months = pd.to_datetime(raw[month_column]).dt.strftime("%Y-%m")
+    for position, (month, rows) in enumerate(raw.groupby(months, sort=True)):
+        target = directory / f"month={month}"
+        target.mkdir(parents=True)
+        if position % 2:
+            half = len(rows) // 2
+            rows.iloc[:half].to_parquet(target / "part-0000.parquet")
+            rows.iloc[half:].to_csv(target / "part-0001.csv", index=False)
+        else:
+            rows.to_csv(target / "part-0000.csv", index=False)
+    return directory
+
+
+@pytest.fixture
+def premium_dir(premium_csv: Path, tmp_path: Path) -> Path:
+    return _partition(premium_csv, tmp_path / "premium_requests", "request_date")
+
+
+def _premium_outputs(analytics: PremiumRequestsAnalytics) -> list[object]:
+    outputs: list[object] = [
+        analytics.available_segments(),
+        analytics.available_enterprises(),
+        analytics.available_models(),
+    ]
+    for segment in (None, "asia"):
+        for user_type in ("all", "fte", "contractor"):
+            for start, end in ((None, None), ("2025-08", "2025-09"), ("2025-08", "2025-08"), ("2026-01", None)):
+                outputs.append(analytics.summary(segment, user_type, start, end))
+                outputs.append(analytics.summary(segment, user_type, start, end, approximate=True))
+                outputs.append(analytics.top_models(segment, user_type, start, end))
+                outputs.append(analytics.enterprise_breakdown(segment, user_type, start, end))
+                for metric in ("requests", "cost", "users"):
+                    outputs.append(analytics.trend(segment, user_type, metric, start, end))
+                    outputs.append(analytics.top_segments(user_type, metric, start, end))
+                outputs.append(analytics.trend(segment, user_type, "users", start, end, approximate=True))
+                outputs.append(analytics.top_segments(user_type, "users", start, end, approximate=True))
+    return outputs
+
+
+def test_discovers_month_partitions(premium_dir: Path) -> None:
+    (premium_dir / "notes.txt").write_text("ignored")
+    (premium_dir / "month=2025-10").mkdir()
+
+    partitions = discover_partitions(premium_dir)
+
+    assert [str(partition.month) for partition in partitions] == ["2025-07", "2025-08", "2025-09"]
+    assert [path.suffix for path in partitions[1].files] == [".parquet", ".csv"]
+
+
+def test_partitioned_reports_match_single_export(premium_csv: Path, premium_dir: Path) -> None:
+    """Reports over partitions, exact and approximate, read the same as over the single export."""
+    expected = _premium_outputs(PremiumRequestsAnalytics(premium_csv))
+    store = PartitionedPremiumStore(premium_dir, PartitionCache(None))
+    analytics = PremiumRequestsAnalytics.from_store(premium_dir, store)
+
+    assert _premium_outputs(analytics) == expected
+
+
+def test_over_budget_partitions_are_evicted_and_reloaded(premium_csv: Path, premium_dir: Path) -> None:
+    expected = PremiumRequestsAnalytics(premium_csv)
+    cache = PartitionCache(budget_bytes=1)
+    analytics = PremiumRequestsAnalytics.from_store(premium_dir, PartitionedPremiumStore(premium_dir, cache))
+
+    for _ in range(2):
+        assert analytics.summary() == expected.summary()
+        assert analytics.top_segments(metric="users", approximate=True) == expected.top_segments(
+            metric="users", approximate=True
+        )
+    assert len(cache) == 1
+    assert cache.evictions == cache.loads - 1
+    assert cache.loads > 3
+
+
+def test_range_query_opens_only_matching_partitions(premium_dir: Path) -> None:
+    cache = PartitionCache(None)
+    analytics = PremiumRequestsAnalytics.from_store(premium_dir, PartitionedPremiumStore(premium_dir, cache))
+
+    analytics.summary(start_month="2025-09", end_month="2025-09")
+    assert cache.loads == 1
+
+    analytics.summary(start_month="2025-08", end_month="2025-09")
+    assert cache.loads == 2
+
+    analytics.summary(start_month="2025-09", end_month="2025-09")
+    analytics.trend(metric="users", start_month="2025-08")
+    assert cache.loads == 2
+
+
+def test_changed_partition_is_reloaded_alone(premium_dir: Path) -> None:
+    cache = PartitionCache(None)
+    analytics = PremiumRequestsAnalytics.from_store(premium_dir, PartitionedPremiumStore(premium_dir, cache))
+    analytics.summary()
+    version = source_version(premium_dir)
+
+    september = premium_dir / "month=2025-09" / "part-0000.csv"
+    with september.open("a") as handle:
+        handle.write("2025-09-30,manulife,2025-09-20,gina-emu,gpt-4o,4,0.16,0.16,0,gina,TRUE,Asia,FALSE\n")
+    assert source_version(premium_dir) != version
+
+    reloaded = PremiumRequestsAnalytics.from_store(premium_dir, PartitionedPremiumStore(premium_dir, cache))
+    assert "Unique users (by Entra ID): 7" in reloaded.summary()
+    assert cache.loads == 4
+
+
+def test_segment_partitions_match_single_export(tmp_path: Path) -> None:
+    directory = _partition(SEGMENT_CSV, tmp_path / "segment_adoption", "Month")
+    expected = SegmentAdoptionAnalytics(SEGMENT_CSV)
+    cache = PartitionCache(None)
+    analytics = SegmentAdoptionAnalytics.from_store(directory, PartitionedSegmentStore(directory, cache))
+    months = sorted(expected.data["month"].astype(str).unique())
+
+    recent = expected.summary(segment="asia", start_month=months[-3])
+    assert analytics.summary(segment="asia", start_month=months[-3]) == recent
+    assert cache.loads == 3
+    assert analytics.trend(metric="fte_active") == expected.trend(metric="fte_active")
+    assert analytics.leaders(month=months[-1]) == expected.leaders(month=months[-1])
+    assert analytics.available_segments() == expected.available_segments()
+
+
+def test_loader_accepts_a_partition_directory(premium_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("COPILOT_PREMIUM_REQUESTS_CSV", str(premium_dir))
+
+    path = premium_requests_loader.resolve_premium_requests_path()
+    analytics = premium_requests_loader.load_premium_requests_analytics(path)
+
+    assert isinstance(analytics.store, PartitionedPremiumStore)
+    assert premium_requests_loader.export_shared(analytics, premium_dir.parent) is None
+    assert analytics.refresh() is analytics
+
+
+def test_empty_directory_is_a_config_error(tmp_path: Path) -> None:
+    with pytest.raises(PremiumRequestsConfigError, match="month=YYYY-MM"):
+        premium_requests_loader.load_premium_requests_analytics(tmp_path)
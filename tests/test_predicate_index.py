@@ -0,0 +1,78 @@
+"""Unit tests for the segment and user-type predicate index.
+
+Run with: pytest tests/test_predicate_index.py
+"""
+
+import pandas as pd
+import pytest
+
+from services import predicate_index
+from services.predicate_index import PredicateIndex, shared_selections
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "month": pd.PeriodIndex(
+                ["2025-07", "2025-07", "2025-07", "2025-08", "2025-08", "2025-09"], freq="M"
+            ),
+            "segment": pd.Categorical(["Asia", "Canada", "ASIA", "Asia", None, "Canada"]),
+            "is_employee": [True, False, False, True, True, False],
+            "value": [1, 2, 3, 4, 5, 6],
+        }
+    )
+
+
+def _mask(frame, segment, employee, start, end):
+    mask = pd.Series(True, index=frame.index)
+    if segment:
+        mask &= (frame["segment"].astype("string").str.casefold() == segment.casefold()).fillna(False)
+    if employee is not None:
+        mask &= frame["is_employee"] == employee
+    if start is not None:
+        mask &= frame["month"] >= start
+    if end is not None:
+        mask &= frame["month"] <= end
+    return frame[mask]
+
+
+@pytest.mark.parametrize("segment", [None, "asia", "Canada", "Europe"])
+@pytest.mark.parametrize("employee", [None, True, False])
+@pytest.mark.parametrize("months", [(None, None), ("2025-07", "2025-07"), ("2025-08", None)])
+def test_select_matches_boolean_masks(segment, employee, months) -> None:
+    frame = _frame()
+    index = PredicateIndex(frame)
+    start, end = (pd.Period(value, freq="M") if value else None for value in months)
+
+    result = index.select(frame, segment, employee, start, end)
+
+    pd.testing.assert_frame_equal(result, _mask(frame, segment, employee, start, end), check_index_type=False)
+
+
+def test_segment_codes_merge_case_variants() -> None:
+    index = PredicateIndex(_frame())
+
+    assert index.segment_code("ASIA") == index.segment_code("asia") == index.segment_code("Asia")
+    assert index.segment_code("Europe") is None
+
+
+def test_frames_without_employee_column_reject_user_type() -> None:
+    frame = _frame().drop(columns="is_employee")
+    index = PredicateIndex(frame, employee_column=None)
+
+    assert index.select(frame, "canada", None, None, None)["value"].tolist() == [2, 6]
+    with pytest.raises(ValueError):
+        index.select(frame, "canada", True, None, None)
+
+
+def test_shared_selections_reuse_results_only_for_the_same_frame(monkeypatch) -> None:
+    first = _frame()
+    second = _frame().assign(value=lambda frame: frame["value"] * 10)
+    first_index, second_index = PredicateIndex(first), PredicateIndex(second)
+    # Every object gets the same id, as a freed generation's ids can be reused by the next one.
+    monkeypatch.setattr(predicate_index, "id", lambda obj: 0, raising=False)
+
+    with shared_selections():
+        reused = first_index.select(first, "asia", None, None, None)
+        assert first_index.select(first, "asia", None, None, None) is reused
+        assert second_index.select(second, "asia", None, None, None)["value"].tolist() == [10, 30, 40]
@@ -0,0 +1,101 @@
+"""Unit tests for the premium requests load pipeline.
+
+These use the production CSV schema (see ``conftest.PREMIUM_REQUESTS_CSV``)
+and check that every load path yields the same analytics.
+
+Run with: pytest tests/test_premium_requests_pipeline.py
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from services.premium_requests import PremiumRequestsAnalytics, PremiumRequestsConfigError
+
+
+def test_chunked_load_matches_single_read(premium_csv: Path) -> None:
+    """Streaming ingest produces the same analytics as a single read."""
+    whole = PremiumRequestsAnalytics(premium_csv)
+    chunked = PremiumRequestsAnalytics(premium_csv, chunk_rows=4)
+
+    assert chunked.load_stats.chunks == 3
+    assert chunked.load_stats.rows == whole.load_stats.rows == 12
+    assert chunked.summary() == whole.summary()
+    assert chunked.trend(metric="users") == whole.trend(metric="users")
+    assert chunked.top_segments(metric="requests") == whole.top_segments(metric="requests")
+
+
+def test_chunked_load_enforces_memory_ceiling(premium_csv: Path) -> None:
+    """Exceeding the configured ceiling aborts the load with a config error."""
+    with pytest.raises(PremiumRequestsConfigError, match="memory ceiling"):
+        PremiumRequestsAnalytics(premium_csv, chunk_rows=4, memory_limit_mb=0.0001)
+
+
+def test_load_stats_report_peak_rss(premium_csv: Path) -> None:
+    """Load statistics include the frame size and, where available, peak RSS."""
+    stats = PremiumRequestsAnalytics(premium_csv, chunk_rows=5).load_stats
+
+    assert stats.frame_bytes > 0
+    assert "12 rows in 3 chunk(s)" in stats.description()
+
+
+def test_lean_schema_keeps_only_analytics_columns(premium_csv: Path) -> None:
+    """Unused export columns are dropped and dimensions are stored compactly."""
+    data = PremiumRequestsAnalytics(premium_csv).data
+
+    assert "gh_id" not in data.columns
+    assert "collection_date" not in data.columns
+    for column in ["segment", "enterprise", "model", "mfcgd_id"]:
+        assert isinstance(data[column].dtype, pd.CategoricalDtype), column
+    assert pd.api.types.is_integer_dtype(data["quantity"])
+    assert data["quantity"].dtype.itemsize < 8
+    assert data["gross_amount"].dtype == "float64"  # cents are not exact in float32
+
+
+def test_chunked_load_unifies_categories(premium_csv: Path) -> None:
+    """Chunks with different vocabularies still concatenate into categoricals."""
+    data = PremiumRequestsAnalytics(premium_csv, chunk_rows=5).data
+
+    assert isinstance(data["model"].dtype, pd.CategoricalDtype)
+    assert set(data["segment"].astype(str)) == {"Asia", "Canada", "US", "Unassigned"}
+    assert data["mfcgd_id"].nunique() == 6
+
+
+def test_memory_report_lists_every_column(premium_csv: Path) -> None:
+    """The introspection call reports each retained column and the total."""
+    analytics = PremiumRequestsAnalytics(premium_csv)
+    report = analytics.memory_report()
+
+    assert report.startswith("Premium requests frame: 12 rows")
+    assert set(analytics.memory_usage()) == set(analytics.data.columns)
+    assert "- mfcgd_id (category):" in report
+
+
+# The first July row re-exported on a later collection date with a corrected quantity.
+RE_EXPORTED_ROW = "2025-08-31,manulife,2025-07-02,alice-emu,claude-3.7-sonnet,20,0.80,0.80,0,alice,TRUE,Asia,FALSE\n"
+
+
+@pytest.mark.parametrize("chunk_rows", [None, 4])
+def test_overlapping_exports_keep_latest_collection(premium_csv: Path, chunk_rows) -> None:
+    """A row repeated by a later export replaces the earlier copy instead of adding to it."""
+    original = PremiumRequestsAnalytics(premium_csv)
+    premium_csv.write_text(premium_csv.read_text() + RE_EXPORTED_ROW)
+
+    analytics = PremiumRequestsAnalytics(premium_csv, chunk_rows=chunk_rows)
+
+    assert analytics.load_stats.duplicates_dropped == 1
+    assert "1 re-exported duplicate row(s) dropped" in analytics.load_stats.description()
+    assert len(analytics.data) == len(original.data)
+    assert "- Total requests: 1,659" in analytics.summary()
+
+
+def test_older_re_export_does_not_replace_newer_row(premium_csv: Path) -> None:
+    """Order in the file does not matter; the copy with the latest collection_date wins."""
+    header, first, rest = premium_csv.read_text().split("\n", 2)
+    premium_csv.write_text("\n".join([header, RE_EXPORTED_ROW.strip(), first, rest]))
+
+    analytics = PremiumRequestsAnalytics(premium_csv)
+
+    assert analytics.load_stats.duplicates_dropped == 1
+    assert "- Total requests: 1,659" in analytics.summary()
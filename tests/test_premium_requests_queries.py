@@ -0,0 +1,133 @@
+"""Unit tests for premium request query results.
+
+The expected outputs are worked out by hand from ``conftest.PREMIUM_REQUESTS_CSV``
+and pin the text returned by the analytics, whichever internal structure
+(raw rows, cube cells or indexes) answers the query.
+
+Run with: pytest tests/test_premium_requests_queries.py
+"""
+
+from pathlib import Path
+
+import pytest
+
+from services.premium_requests import PremiumRequestsAnalytics
+
+
+@pytest.fixture
+def analytics(premium_csv: Path) -> PremiumRequestsAnalytics:
+    return PremiumRequestsAnalytics(premium_csv)
+
+
+def test_summary_all_users(analytics: PremiumRequestsAnalytics) -> None:
+    assert analytics.summary() == "\n".join(
+        [
+            "Premium request summary for all users during all available months:",
+            "- Total requests: 1,651",
+            "- Unique users (by Entra ID): 6",
+            "- Gross cost: $66.04",
+            "- Discount (free quota): $18.04",
+            "- Net billable cost: $48.00",
+            "- Requests exceeding quota: 2",
+            "- Top models: o3-mini (1,515), claude-3.7-sonnet (104), gpt-4o (24)",
+        ]
+    )
+
+
+def test_summary_segment_is_case_insensitive(analytics: PremiumRequestsAnalytics) -> None:
+    result = analytics.summary(segment="asia", user_type="contractor")
+
+    assert result.startswith("Premium request summary for asia contractors during all available months:")
+    assert "- Total requests: 1,500" in result
+    assert "- Unique users (by Entra ID): 1" in result
+    assert "- Requests exceeding quota: 2" in result
+
+
+def test_trend_users_counts_each_engineer_once_per_month(analytics: PremiumRequestsAnalytics) -> None:
+    # alice has accounts in both enterprises in 2025-07 but is counted once.
+    assert analytics.trend(metric="users") == "\n".join(
+        [
+            "Premium request unique users trend for all users (all available months):",
+            "- 2025-07: 4",
+            "- 2025-08: 5",
+            "- 2025-09: 2",
+        ]
+    )
+
+
+def test_trend_cost_with_range(analytics: PremiumRequestsAnalytics) -> None:
+    assert analytics.trend(metric="cost", start_month="2025-08", end_month="2025-09") == "\n".join(
+        [
+            "Premium request net cost trend for all users (2025-08 to 2025-09):",
+            "- 2025-08: $12.00",
+            "- 2025-09: $0.00",
+        ]
+    )
+
+
+def test_top_segments_by_users(analytics: PremiumRequestsAnalytics) -> None:
+    assert analytics.top_segments(metric="users") == "\n".join(
+        [
+            "Top segments by premium request unique users for all users (all available months):",
+            "- Asia: 2",
+            "- Canada: 2",
+            "- US: 1",
+            "- Unassigned: 1",
+        ]
+    )
+
+
+def test_top_models_from_month(analytics: PremiumRequestsAnalytics) -> None:
+    assert analytics.top_models(start_month="2025-08") == "\n".join(
+        [
+            "Top AI models by cost for all users (from 2025-08):",
+            "- o3-mini: 315 requests, $12.00 net cost",
+            "- claude-3.7-sonnet: 62 requests, $0.00 net cost",
+            "- gpt-4o: 19 requests, $0.00 net cost",
+        ]
+    )
+
+
+def test_enterprise_breakdown_for_fte(analytics: PremiumRequestsAnalytics) -> None:
+    assert analytics.enterprise_breakdown(user_type="fte", end_month="2025-08") == "\n".join(
+        [
+            "Enterprise breakdown for FTE (up to 2025-08):",
+            "- EMU (manulife): 94 requests, $0.00 cost, 3 users",
+            "- Legacy (manulife-financial): 12 requests, $0.00 cost, 2 users",
+        ]
+    )
+
+
+def test_no_matching_rows(analytics: PremiumRequestsAnalytics) -> None:
+    assert analytics.summary(segment="Nowhere") == "No premium request records match the requested scope."
+    assert analytics.trend(start_month="2030-01") == "No premium request records match the requested scope."
+
+
+def test_cube_is_smaller_than_raw_rows(analytics: PremiumRequestsAnalytics) -> None:
+    assert len(analytics.cube) <= len(analytics.data)
+    assert int(analytics.cube.cells["quantity"].sum()) == 1651
+
+
+def test_rows_without_model_or_user_still_count(premium_csv: Path) -> None:
+    """Missing models stay in the totals; missing Entra IDs are not counted as users."""
+    with premium_csv.open("a") as handle:
+        handle.write("2025-09-30,manulife,2025-09-20,ghost,NA,4,0.16,0.16,0,N/A,TRUE,Asia,FALSE\n")
+    analytics = PremiumRequestsAnalytics(premium_csv)
+
+    result = analytics.summary(start_month="2025-09")
+
+    assert "- Total requests: 41" in result
+    assert "- Unique users (by Entra ID): 2" in result
+    assert "- Top models: claude-3.7-sonnet (22), o3-mini (15)" in result
+
+
+def test_user_month_counts_match_raw_nunique(analytics: PremiumRequestsAnalytics) -> None:
+    """Distinct users over the user-month table match scanning the request rows."""
+    rows = analytics.user_months.rows
+    asia = rows[rows["segment"] == "Asia"]
+
+    assert analytics.user_months.count(asia) == analytics.data.loc[
+        analytics.data["segment"] == "Asia", "mfcgd_id"
+    ].nunique()
+    by_month = analytics.user_months.count_by(rows, "month")
+    assert by_month.tolist() == analytics.data.groupby("month")["mfcgd_id"].nunique().tolist()
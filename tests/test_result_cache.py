@@ -0,0 +1,146 @@
+"""Unit tests for the MCP tool result cache.
+
+Run with: pytest tests/test_result_cache.py
+"""
+
+from fastapi.testclient import TestClient
+
+from mcp.result_cache import ResultCache
+from services.hot_reload import DatasetSlot
+from services.metrics_registry import MetricsRegistry, resolve_metrics_registry_path
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    cache = ResultCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+
+    cache.put("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.stats().evictions == 1
+
+
+def test_entries_expire_after_ttl() -> None:
+    clock = FakeClock()
+    cache = ResultCache(max_entries=4, ttl_seconds=10, clock=clock)
+    cache.put("a", "1")
+
+    clock.now = 11
+
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.expirations, stats.size) == (0, 1, 1, 0)
+
+
+def test_zero_size_disables_caching() -> None:
+    cache = ResultCache(max_entries=0)
+    calls = []
+
+    for _ in range(2):
+        cache.get_or_compute("a", lambda: calls.append(1) or "value")
+
+    assert len(calls) == 2
+    assert cache.stats().hits == 0
+
+
+def test_equivalent_calls_share_one_entry(mcp_server) -> None:
+    first = mcp_server._execute_tool("premium_requests_trend", {"metric": "users", "start_month": "2025-7"})
+    second = mcp_server._execute_tool(
+        "premium_requests_trend",
+        {"metric": "users", "start_month": "2025-07", "user_type": "everyone", "limit": "6"},
+    )
+
+    assert first == second
+    stats = mcp_server._RESULT_CACHE.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+
+def test_reloaded_dataset_misses_the_cache(mcp_server, premium_csv) -> None:
+    mcp_server._execute_tool("premium_requests_summary", {})
+    premium_csv.write_text(premium_csv.read_text() + "\n")
+    mcp_server._PREMIUM_SLOT.load()
+
+    mcp_server._execute_tool("premium_requests_summary", {})
+
+    assert mcp_server._RESULT_CACHE.stats().misses == 2
+
+
+def test_current_etag_answers_not_modified(mcp_server, premium_csv) -> None:
+    client = TestClient(mcp_server.app)
+    call = {"tool_name": "premium_requests_summary", "arguments": {"segment": "Asia"}}
+    first = client.post("/mcp/execute", json=call)
+    etag = first.headers["ETag"]
+    assert first.json()["etag"] == etag
+    assert first.json()["data_version"].startswith("premium:")
+
+    unchanged = client.post("/mcp/execute", json=call, headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.headers["ETag"] == etag
+
+    premium_csv.write_text(premium_csv.read_text() + "\n")
+    mcp_server._PREMIUM_SLOT.load()
+    reloaded = client.post("/mcp/execute", json=call, headers={"If-None-Match": etag})
+    assert reloaded.status_code == 200
+    assert reloaded.headers["ETag"] != etag
+    assert reloaded.json()["result"] == first.json()["result"]
+
+
+def test_each_call_reads_the_dataset_slot_once(mcp_server, monkeypatch) -> None:
+    """The cache key's version and the computed result come from the same analytics object."""
+    reads = []
+    original = mcp_server._ensure_premium_analytics
+
+    def counting_ensure():
+        reads.append(1)
+        return original()
+
+    monkeypatch.setattr(mcp_server, "_ensure_premium_analytics", counting_ensure)
+
+    mcp_server._execute_tool("premium_requests_summary", {"segment": "Asia"})
+
+    assert len(reads) == 1
+
+
+def test_reloaded_metrics_registry_changes_the_etag(mcp_server, monkeypatch, tmp_path) -> None:
+    metrics_file = tmp_path / "metrics.yaml"
+    metrics_file.write_text(resolve_metrics_registry_path().read_text())
+    monkeypatch.setattr(
+        mcp_server, "_METRICS_SLOT", DatasetSlot("metrics registry", lambda: metrics_file, MetricsRegistry)
+    )
+    mcp_server._METRICS_SLOT.load()
+    client = TestClient(mcp_server.app)
+    call = {"tool_name": "describe_metrics", "arguments": {}}
+    first = client.post("/mcp/execute", json=call)
+    etag = first.headers["ETag"]
+
+    metrics_file.write_text(metrics_file.read_text().replace("FTE Seat Utilisation", "FTE Seat Usage"))
+    mcp_server._METRICS_SLOT.load()
+    reloaded = client.post("/mcp/execute", json=call, headers={"If-None-Match": etag})
+
+    assert reloaded.status_code == 200
+    assert reloaded.headers["ETag"] != etag
+    assert "FTE Seat Usage" in reloaded.json()["result"]
+
+
+def test_non_text_segment_is_rejected(mcp_server) -> None:
+    client = TestClient(mcp_server.app)
+
+    response = client.post(
+        "/mcp/execute", json={"tool_name": "premium_requests_summary", "arguments": {"segment": ["Asia"]}}
+    )
+
+    assert response.status_code == 400
+    assert "segment" in response.json()["detail"]
+    assert mcp_server._RESULT_CACHE.stats().size == 0
@@ -0,0 +1,93 @@
+"""Unit tests for the memory-mapped column files shared across worker processes.
+
+Run with: pytest tests/test_shared_frames.py
+"""
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from services import premium_requests_loader
+from services.hot_reload import DatasetSlot
+from services.premium_requests import PremiumRequestsAnalytics
+from services.shared_frames import attach_frame, export_frame
+
+
+def _is_mapped(array: np.ndarray) -> bool:
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def test_round_trip_preserves_frame_and_maps_columns(premium_csv, tmp_path) -> None:
+    analytics = PremiumRequestsAnalytics(premium_csv)
+
+    export_frame(analytics.data, "premium_requests", "v1", tmp_path)
+    attached = attach_frame("premium_requests", "v1", tmp_path)
+
+    pd.testing.assert_frame_equal(attached, analytics.data)
+    assert _is_mapped(attached["gross_amount"].to_numpy())
+    assert _is_mapped(attached["segment"].array.codes)
+    assert not attached["quantity"].to_numpy().flags.writeable
+
+
+def test_text_columns_round_trip(tmp_path) -> None:
+    frame = pd.DataFrame(
+        {
+            "month": pd.PeriodIndex(["2025-07", "2025-08", "2025-08"], freq="M"),
+            "segment": pd.array(["Asia", None, "Canada"], dtype="string"),
+            "active": [1.0, np.nan, 3.0],
+        }
+    )
+
+    export_frame(frame, "segment_adoption", "v1", tmp_path)
+
+    pd.testing.assert_frame_equal(attach_frame("segment_adoption", "v1", tmp_path), frame)
+
+
+def test_other_versions_are_not_attached(tmp_path) -> None:
+    export_frame(pd.DataFrame({"value": [1]}), "premium_requests", "v1", tmp_path)
+
+    assert attach_frame("premium_requests", "v2", tmp_path) is None
+    assert attach_frame("segment_adoption", "v1", tmp_path) is None
+
+
+def test_loader_attaches_to_exported_data(premium_csv, tmp_path, monkeypatch) -> None:
+    parent = PremiumRequestsAnalytics(premium_csv)
+    premium_requests_loader.export_shared(parent, tmp_path)
+    monkeypatch.setenv("COPILOT_SHARED_DATA_DIR", str(tmp_path))
+
+    worker = premium_requests_loader._load_analytics(premium_csv)
+
+    assert worker.load_stats is None
+    assert worker.summary() == parent.summary()
+    assert worker.trend(metric="users") == parent.trend(metric="users")
+
+
+def test_export_drops_the_parents_copy(mcp_server, tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("COPILOT_SHARED_DATA_DIR", str(tmp_path))
+    segment_slot = DatasetSlot("segment adoption", lambda: tmp_path / "missing.csv", lambda path: None)
+    monkeypatch.setattr(mcp_server, "_SEGMENT_SLOT", segment_slot)
+    version = premium_requests_loader._shared_version(mcp_server._PREMIUM_SLOT.state.analytics.csv_path)
+
+    mcp_server._export_shared_datasets()
+
+    assert attach_frame("premium_requests", version, tmp_path) is not None
+    assert mcp_server._PREMIUM_SLOT.state.analytics is None
+    assert mcp_server._PREMIUM_SLOT.state.status == "pending"
+
+
+def test_workers_on_shared_data_do_not_watch_the_sources(mcp_server, tmp_path, monkeypatch) -> None:
+    started = []
+    monkeypatch.setattr(mcp_server.SourceWatcher, "start", lambda watcher: started.append(watcher))
+
+    monkeypatch.setenv("COPILOT_SHARED_DATA_DIR", str(tmp_path))
+    with TestClient(mcp_server.app):
+        pass
+    monkeypatch.delenv("COPILOT_SHARED_DATA_DIR")
+    with TestClient(mcp_server.app):
+        pass
+
+    assert len(started) == 1
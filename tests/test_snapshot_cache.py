@@ -0,0 +1,93 @@
+"""Unit tests for the columnar snapshot cache used by the loaders.
+
+Run with: pytest tests/test_snapshot_cache.py
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from services import segment_adoption_loader
+from services.segment_adoption import SegmentAdoptionAnalytics
+from services.snapshot_cache import read_snapshot, snapshot_path, source_fingerprint, write_snapshot
+
+SEGMENT_CSV = Path(__file__).resolve().parent.parent / "data" / "copilot" / "segment_adoption.csv"
+
+
+@pytest.fixture
+def segment_csv(tmp_path, monkeypatch) -> Path:
+    """Copy the segment adoption export into an isolated directory."""
+    monkeypatch.delenv("COPILOT_SNAPSHOT_DIR", raising=False)
+    monkeypatch.delenv("COPILOT_DISABLE_SNAPSHOTS", raising=False)
+    target = tmp_path / "segment_adoption.csv"
+    shutil.copy(SEGMENT_CSV, target)
+    return target
+
+
+def test_first_load_writes_snapshot_and_second_reuses_it(segment_csv: Path) -> None:
+    """The loader writes a snapshot and later loads return an identical frame."""
+    first = segment_adoption_loader._load_analytics(segment_csv)
+    assert snapshot_path(segment_csv, "segment_adoption").exists()
+
+    second = segment_adoption_loader._load_analytics(segment_csv)
+
+    pd.testing.assert_frame_equal(first.data.reset_index(drop=True), second.data)
+    assert second.summary(segment="Asia") == first.summary(segment="Asia")
+
+
+def test_snapshot_is_stale_after_source_change(segment_csv: Path) -> None:
+    """Changing the CSV content invalidates the snapshot."""
+    frame = pd.DataFrame({"value": [1, 2, 3]})
+    write_snapshot(segment_csv, "demo", "1", frame, source_fingerprint(segment_csv))
+    assert read_snapshot(segment_csv, "demo", "1") is not None
+
+    with segment_csv.open("a") as handle:
+        handle.write("2099-01,Asia,1,,1,,1%,\n")
+
+    assert read_snapshot(segment_csv, "demo", "1") is None
+
+
+def test_touched_source_keeps_snapshot(segment_csv: Path) -> None:
+    """A new mtime with unchanged content still matches through the digest."""
+    write_snapshot(segment_csv, "demo", "1", pd.DataFrame({"value": [1]}), source_fingerprint(segment_csv))
+    stat = segment_csv.stat()
+    os.utime(segment_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+
+    assert read_snapshot(segment_csv, "demo", "1") is not None
+
+
+def test_schema_version_mismatch_is_ignored(segment_csv: Path) -> None:
+    """Snapshots written by an older loader layout are rebuilt."""
+    write_snapshot(segment_csv, "demo", "1", pd.DataFrame({"value": [1]}), source_fingerprint(segment_csv))
+
+    assert read_snapshot(segment_csv, "demo", "2") is None
+
+
+def test_snapshots_can_be_disabled(segment_csv: Path, monkeypatch) -> None:
+    """COPILOT_DISABLE_SNAPSHOTS skips both reading and writing."""
+    monkeypatch.setenv("COPILOT_DISABLE_SNAPSHOTS", "1")
+
+    assert source_fingerprint(segment_csv) is None
+    assert write_snapshot(segment_csv, "demo", "1", pd.DataFrame({"value": [1]}), None) is None
+    assert read_snapshot(segment_csv, "demo", "1") is None
+
+
+def test_source_changed_during_load_leaves_snapshot_unused(segment_csv: Path, monkeypatch) -> None:
+    """A snapshot parsed from the old file is not matched to the file as changed mid-load."""
+    parse = SegmentAdoptionAnalytics.__init__
+
+    def parse_then_append(self, csv_path: Path) -> None:
+        parse(self, csv_path)
+        with csv_path.open("a") as handle:
+            handle.write("2099-01,Asia,1,,1,,1%,\n")
+
+    monkeypatch.setattr(SegmentAdoptionAnalytics, "__init__", parse_then_append)
+    segment_adoption_loader._load_analytics(segment_csv)
+
+    assert snapshot_path(segment_csv, "segment_adoption").exists()
+    assert read_snapshot(segment_csv, "segment_adoption", segment_adoption_loader._SNAPSHOT_SCHEMA) is None
@@ -0,0 +1,142 @@
+"""Unit tests for the SQLite storage backend.
+
+Run with: pytest tests/test_sqlite_backend.py
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from services import premium_requests_loader, segment_adoption_loader
+from services.premium_requests import PremiumRequestsAnalytics, PremiumRequestsConfigError
+from services.segment_adoption import SegmentAdoptionAnalytics
+from services.sqlite_backend import (
+    SqliteDatabase,
+    SqlitePremiumStore,
+    SqliteSegmentStore,
+    import_premium_requests,
+    import_segment_adoption,
+)
+from services.storage_backend import Scope
+
+from .conftest import PREMIUM_REQUESTS_CSV
+
+SEGMENT_CSV = Path(__file__).resolve().parent.parent / "data" / "copilot" / "segment_adoption.csv"
+
+
+@pytest.fixture
+def database(premium_csv: Path, tmp_path: Path) -> Path:
+    path = tmp_path / "copilot.db"
+    import_premium_requests(premium_csv, path, chunk_rows=4)
+    import_segment_adoption(SEGMENT_CSV, path)
+    return path
+
+
+def _premium_outputs(analytics: PremiumRequestsAnalytics) -> list[object]:
+    outputs: list[object] = [
+        analytics.available_segments(),
+        analytics.available_enterprises(),
+        analytics.available_models(),
+    ]
+    for segment in (None, "asia", "Unknown"):
+        for user_type in ("all", "fte", "contractor"):
+            for start, end in ((None, None), ("2025-08", "2025-09"), ("2025-07", "2025-07")):
+                outputs.append(analytics.summary(segment, user_type, start, end))
+                outputs.append(analytics.top_models(segment, user_type, start, end))
+                outputs.append(analytics.enterprise_breakdown(segment, user_type, start, end))
+                for metric in ("requests", "cost", "users"):
+                    outputs.append(analytics.trend(segment, user_type, metric, start, end))
+                    outputs.append(analytics.top_segments(user_type, metric, start, end))
+    return outputs
+
+
+def test_premium_reports_match_pandas(premium_csv: Path, database: Path) -> None:
+    """Every premium report reads the same from SQLite as from the CSV."""
+    expected = _premium_outputs(PremiumRequestsAnalytics(premium_csv))
+    analytics = PremiumRequestsAnalytics.from_store(database, SqlitePremiumStore(SqliteDatabase(database)))
+
+    assert _premium_outputs(analytics) == expected
+
+
+def test_approximate_users_fall_back_to_exact_counts(database: Path) -> None:
+    """Without sketches the approximate flag answers with exact distinct users."""
+    analytics = PremiumRequestsAnalytics.from_store(database, SqlitePremiumStore(SqliteDatabase(database)))
+
+    assert analytics.summary(approximate=True) == analytics.summary()
+    assert analytics.trend(metric="users", approximate=True) == analytics.trend(metric="users")
+    store, scope = analytics.store, Scope(segment="Asia")
+    assert store.estimate_users(scope) == store.unique_users(scope)
+    assert store.estimate_users_by(scope, "month").tolist() == store.unique_users_by(scope, "month").tolist()
+
+
+def test_segment_reports_match_pandas(database: Path) -> None:
+    expected = SegmentAdoptionAnalytics(SEGMENT_CSV)
+    analytics = SegmentAdoptionAnalytics.from_store(database, SqliteSegmentStore(SqliteDatabase(database)))
+    month = str(expected.data["month"].iloc[-1])
+
+    assert analytics.available_segments() == expected.available_segments()
+    assert analytics.summary(segment="asia") == expected.summary(segment="asia")
+    assert analytics.trend(metric="fte_active") == expected.trend(metric="fte_active")
+    assert analytics.leaders(month=month) == expected.leaders(month=month)
+    assert analytics.leaders() == expected.leaders()
+
+
+def test_reimport_keeps_latest_collection(premium_csv: Path, database: Path, tmp_path: Path) -> None:
+    """Re-imported rows replace the stored copy only when collected later."""
+    header, first = PREMIUM_REQUESTS_CSV.splitlines()[:2]
+    reexport = tmp_path / "reexport.csv"
+    reexport.write_text(f"{header}\n{first.replace('2025-07-31', '2025-08-31').replace(',12,0.48', ',20,0.80')}\n")
+    stale = tmp_path / "stale.csv"
+    stale.write_text(f"{header}\n{first.replace('2025-07-31', '2025-06-30').replace(',12,0.48', ',99,3.96')}\n")
+
+    assert import_premium_requests(reexport, database) == 12
+    assert import_premium_requests(stale, database) == 12
+
+    store = SqlitePremiumStore(SqliteDatabase(database))
+    assert store.cells(Scope())["quantity"].sum() == 1_651 - 12 + 20
+
+
+def test_each_thread_gets_its_own_connection(database: Path) -> None:
+    db = SqliteDatabase(database)
+    store = SqlitePremiumStore(db)
+    together = threading.Barrier(4)
+
+    def count(segment: str) -> int:
+        together.wait(timeout=5)
+        return store.unique_users(Scope(segment=segment))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        counts = list(pool.map(count, ["Asia", "US", "Asia", "US"]))
+
+    assert counts == [2, 1, 2, 1]
+    # One per worker thread plus the one this thread opened to check the table.
+    assert len(db._connections) == 5
+    db.close()
+    assert store.unique_users(Scope()) == 6
+
+
+def test_loaders_use_sqlite_when_configured(database: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("COPILOT_STORAGE_BACKEND", "sqlite")
+    monkeypatch.setenv("COPILOT_SQLITE_PATH", str(database))
+
+    path = premium_requests_loader.resolve_premium_requests_path()
+    premium = premium_requests_loader.load_premium_requests_analytics(path)
+    segments = segment_adoption_loader.load_segment_adoption_analytics(
+        segment_adoption_loader.resolve_segment_adoption_path()
+    )
+
+    assert path == database.resolve()
+    assert isinstance(premium.store, SqlitePremiumStore)
+    assert premium.refresh() is premium
+    assert premium_requests_loader.export_shared(premium, database.parent) is None
+    assert isinstance(segments.store, SqliteSegmentStore)
+
+
+def test_missing_database_is_a_config_error(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("COPILOT_STORAGE_BACKEND", "sqlite")
+    monkeypatch.setenv("COPILOT_SQLITE_PATH", str(tmp_path / "missing.db"))
+
+    with pytest.raises(PremiumRequestsConfigError, match="COPILOT_SQLITE_PATH"):
+        premium_requests_loader.load_premium_requests_analytics(premium_requests_loader.resolve_premium_requests_path())
@@ -0,0 +1,56 @@
+"""Unit tests for the per-user monthly premium request table.
+
+Run with: pytest tests/test_user_months.py
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from services.premium_requests import PremiumRequestsAnalytics
+from services.user_months import ENTERPRISE_MEASURES, UserMonthTable, measure_column
+
+
+def test_table_folds_rows_per_user_and_month(premium_csv: Path) -> None:
+    analytics = PremiumRequestsAnalytics(premium_csv)
+    table = analytics.user_months
+
+    assert len(table) == analytics.data.groupby(["mfcgd_id", "month"], observed=True).ngroups
+    assert len(table) < len(analytics.data)
+    assert table.enterprises == ("manulife", "manulife-financial")
+
+
+def test_enterprise_totals_match_row_sums(premium_csv: Path) -> None:
+    analytics = PremiumRequestsAnalytics(premium_csv)
+    rows = analytics.user_months.rows
+
+    for enterprise, group in analytics.data.groupby("enterprise", observed=True):
+        assert rows[measure_column("rows", enterprise)].sum() == len(group)
+        assert rows[measure_column("quantity", enterprise)].sum() == group["quantity"].sum()
+        assert rows[measure_column("net_amount", enterprise)].sum() == group["net_amount"].sum()
+        assert rows[measure_column("exceeding_rows", enterprise)].sum() == group["exceeds_quota"].sum()
+
+
+def test_merge_matches_a_rebuild(premium_csv: Path) -> None:
+    data = PremiumRequestsAnalytics(premium_csv).data
+    july = data["month"] == data["month"].min()
+
+    merged = UserMonthTable.build(data[july]).merge(UserMonthTable.build(data[~july]))
+    rebuilt = UserMonthTable.build(data)
+
+    columns = [measure_column(measure, enterprise) for measure in ENTERPRISE_MEASURES for enterprise in rebuilt.enterprises]
+    pd.testing.assert_frame_equal(
+        merged.rows[columns].astype(float), rebuilt.rows[columns].astype(float), check_dtype=False
+    )
+    assert merged.count(merged.rows) == rebuilt.count(rebuilt.rows)
+
+
+def test_groups_without_users_count_zero(premium_csv: Path) -> None:
+    data = PremiumRequestsAnalytics(premium_csv).data.copy()
+    data.loc[data["enterprise"] == "manulife-financial", "mfcgd_id"] = None
+    table = UserMonthTable.build(data)
+
+    counts = table.count_by(table.rows, "enterprise")
+
+    assert counts.to_dict() == {"manulife": 4, "manulife-financial": 0}
+    assert table.count(table.rows) == 4
@@ -0,0 +1,59 @@
+"""Unit tests for the bounded MCP worker lanes.
+
+Run with: pytest tests/test_worker_pool.py
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp.worker_pool import LaneSaturated, WorkerLane
+
+
+def test_lane_runs_work_off_the_event_loop() -> None:
+    lane = WorkerLane("test", workers=1, queue_size=0)
+
+    async def scenario():
+        return await lane.run(lambda: threading.current_thread().name)
+
+    assert asyncio.run(scenario()).startswith("mcp-test")
+    assert lane.admitted == 0
+
+
+def test_full_lane_rejects_new_work() -> None:
+    lane = WorkerLane("test", workers=1, queue_size=1, retry_after=3)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(lane.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(LaneSaturated) as raised:
+            await lane.run(lambda: None)
+        release.set()
+        await asyncio.gather(*running)
+        return raised.value
+
+    error = asyncio.run(scenario())
+
+    assert error.retry_after == 3
+    assert lane.admitted == 0
+
+
+def test_saturated_analytics_lane_returns_429_but_cheap_calls_proceed(mcp_server, monkeypatch) -> None:
+    lane = WorkerLane("analytics", workers=1, queue_size=0, retry_after=2)
+    monkeypatch.setattr(mcp_server, "_ANALYTICS_LANE", lane)
+    assert lane._slots.acquire(blocking=False)
+    client = TestClient(mcp_server.app)
+    try:
+        busy = client.post("/mcp/execute", json={"tool_name": "premium_requests_summary", "arguments": {}})
+        cheap = client.post("/mcp/execute", json={"tool_name": "describe_metrics", "arguments": {}})
+        health = client.get("/health")
+    finally:
+        lane._slots.release()
+
+    assert busy.status_code == 429
+    assert busy.headers["Retry-After"] == "2"
+    assert cheap.status_code == 200
+    assert health.json()["status"] == "ok"